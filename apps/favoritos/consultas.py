@@ -0,0 +1,37 @@
+"""
+Favoritos del usuario de la petición, cargados una vez por petición.
+
+`TiendaProductoType.esFavorito` se resuelve por cada tarjeta de un
+listado. En lugar de un `exists()` por producto, la primera resolución
+carga los ids de todos los favoritos activos del usuario en un set que se
+guarda en `info.context` (la petición) y el resto consulta ese set.
+Las mutaciones de favoritos llaman a `olvidar_favoritos` para que un
+esFavorito resuelto después del cambio en la misma petición lo vea.
+"""
+from apps.usuarios.utils import payload_desde_contexto
+from .models import Favoritos
+
+ATRIBUTO = '_ids_favoritos'
+
+
+def ids_favoritos(info):
+    """Set de tienda_producto_id favoritos del usuario; vacío si no hay un usuario autenticado."""
+    ids = getattr(info.context, ATRIBUTO, None)
+    if ids is None:
+        payload = payload_desde_contexto(info)
+        if payload and payload.get('user_type') == 'usuario':
+            ids = set(
+                Favoritos.objects.filter(
+                    usuario_id=payload.get('user_id'),
+                    fecha_eliminacion__isnull=True
+                ).values_list('tienda_producto_id', flat=True)
+            )
+        else:
+            ids = set()
+        setattr(info.context, ATRIBUTO, ids)
+    return ids
+
+
+def olvidar_favoritos(info):
+    if hasattr(info.context, ATRIBUTO):
+        delattr(info.context, ATRIBUTO)
@@ -0,0 +1,158 @@
+"""
+Alta y baja de favoritos con el contador TiendaProducto.favoritos_count.
+
+Agregar y alternar un favorito son una sola sentencia: un INSERT ... ON
+CONFLICT (usuario_id, tienda_producto_id) DO UPDATE que crea, reactiva o
+elimina la fila, con el ajuste del contador en un CTE de la misma
+sentencia. El conflicto bloquea la fila del favorito, así dos toques
+simultáneos se aplican uno después del otro y el contador no se desvía.
+La baja masiva bloquea los favoritos y descuenta en dos UPDATE. Las
+mutaciones de favoritos deben pasar por estas funciones.
+
+`manage.py benchmark_favoritos` comprueba el contador con toques
+concurrentes sobre el mismo producto.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.productos import tendencias
+from apps.productos.models import TiendaProducto
+from core.models import Estado
+from .models import Favoritos
+
+CREADO = 'creado'
+REACTIVADO = 'reactivado'
+EXISTENTE = 'existente'
+
+# Producto activo; la inserción sale de aquí, así un id inexistente no inserta nada
+_PRODUCTO = """
+    producto AS (
+        SELECT id FROM tienda_producto
+        WHERE id = %(tienda_producto_id)s AND fecha_eliminacion IS NULL
+    )
+"""
+_ESTADO = "(SELECT id FROM estado WHERE nombre = %({})s LIMIT 1)"
+# xmax = 0 solo en filas recién insertadas (no en las que actualizó el ON CONFLICT)
+_INSERTAR = f"""
+    INSERT INTO favoritos (usuario_id, tienda_producto_id, estado_id, fecha_creacion, fecha_modificacion, fecha_eliminacion)
+    SELECT %(usuario_id)s, producto.id, {_ESTADO.format('activo')}, %(ahora)s, %(ahora)s, NULL
+    FROM producto
+    ON CONFLICT (usuario_id, tienda_producto_id) DO UPDATE SET
+"""
+
+SQL_ACTIVAR = f"""
+    WITH {_PRODUCTO},
+    fila AS (
+        {_INSERTAR}
+            fecha_eliminacion = NULL,
+            estado_id = EXCLUDED.estado_id,
+            fecha_modificacion = EXCLUDED.fecha_modificacion
+        WHERE favoritos.fecha_eliminacion IS NOT NULL
+        RETURNING favoritos.*, CASE WHEN favoritos.xmax = 0 THEN '{CREADO}' ELSE '{REACTIVADO}' END AS resultado
+    ),
+    contador AS (
+        UPDATE tienda_producto SET favoritos_count = favoritos_count + 1
+        WHERE id IN (SELECT tienda_producto_id FROM fila)
+    )
+    SELECT * FROM fila
+    UNION ALL
+    SELECT favoritos.*, '{EXISTENTE}' FROM favoritos
+    WHERE favoritos.usuario_id = %(usuario_id)s
+      AND favoritos.tienda_producto_id IN (SELECT id FROM producto)
+      AND NOT EXISTS (SELECT 1 FROM fila)
+"""
+
+SQL_ALTERNAR = f"""
+    WITH {_PRODUCTO},
+    fila AS (
+        {_INSERTAR}
+            fecha_eliminacion = CASE WHEN favoritos.fecha_eliminacion IS NULL THEN EXCLUDED.fecha_modificacion END,
+            estado_id = CASE WHEN favoritos.fecha_eliminacion IS NULL THEN {_ESTADO.format('inactivo')} ELSE EXCLUDED.estado_id END,
+            fecha_modificacion = EXCLUDED.fecha_modificacion
+        RETURNING favoritos.*
+    ),
+    contador AS (
+        UPDATE tienda_producto SET favoritos_count = GREATEST(
+            tienda_producto.favoritos_count + CASE WHEN fila.fecha_eliminacion IS NULL THEN 1 ELSE -1 END, 0
+        )
+        FROM fila WHERE tienda_producto.id = fila.tienda_producto_id
+    )
+    SELECT * FROM fila
+"""
+
+
+def _parametros(usuario_id, tienda_producto_id):
+    return {
+        'usuario_id': int(usuario_id),
+        'tienda_producto_id': int(tienda_producto_id),
+        'ahora': timezone.now(),
+        'activo': Estado.ACTIVO,
+        'inactivo': Estado.INACTIVO,
+    }
+
+
+def activar_favorito(usuario_id, tienda_producto_id):
+    """
+    Agrega el producto a los favoritos del usuario (o reactiva el
+    eliminado) en una sentencia. Retorna (favorito, resultado) con
+    resultado CREADO, REACTIVADO o EXISTENTE; solo los dos primeros suman
+    al contador. Retorna (None, None) si el producto no existe.
+    """
+    with transaction.atomic():
+        fila = next(iter(Favoritos.objects.raw(SQL_ACTIVAR, _parametros(usuario_id, tienda_producto_id))), None)
+
+        if fila is None:
+            # Un favorito que otra transacción confirmó durante la sentencia no está en su snapshot
+            favorito = Favoritos.objects.filter(
+                usuario_id=usuario_id,
+                tienda_producto_id=tienda_producto_id,
+                fecha_eliminacion__isnull=True
+            ).first()
+            return (favorito, EXISTENTE) if favorito else (None, None)
+
+        if fila.resultado != EXISTENTE:
+            tendencias.registrar_favorito(fila.tienda_producto_id, usuario_id)
+    return fila, fila.resultado
+
+
+def alternar_favorito(usuario_id, tienda_producto_id):
+    """
+    Agrega el producto a favoritos si no está activo o lo elimina (soft
+    delete) si lo está, en una sentencia. Retorna el favorito con su estado
+    final (fecha_eliminacion nula si quedó agregado) o None si el producto
+    no existe.
+    """
+    with transaction.atomic():
+        favorito = next(iter(Favoritos.objects.raw(SQL_ALTERNAR, _parametros(usuario_id, tienda_producto_id))), None)
+
+        if favorito is not None and favorito.fecha_eliminacion is None:
+            tendencias.registrar_favorito(favorito.tienda_producto_id, usuario_id)
+    return favorito
+
+
+def desactivar_favoritos(usuario_id, **filtros):
+    """
+    Soft delete de los favoritos activos del usuario que cumplan `filtros`
+    (p. ej. tienda_producto_id=...) y descuento de sus contadores, en dos
+    UPDATE. Retorna cuántos se eliminaron.
+    """
+    with transaction.atomic():
+        activos = list(
+            Favoritos.objects.select_for_update()
+            .filter(usuario_id=usuario_id, fecha_eliminacion__isnull=True, **filtros)
+            .values_list('id', 'tienda_producto_id')
+        )
+        if not activos:
+            return 0
+
+        Favoritos.objects.filter(pk__in=[pk for pk, _ in activos]).update(
+            fecha_eliminacion=timezone.now(),
+            estado=Estado.get_inactivo()
+        )
+        # (usuario, tienda_producto) es único: cada producto se descuenta una vez
+        TiendaProducto.objects.filter(pk__in=[tp_id for _, tp_id in activos]).update(
+            favoritos_count=Greatest(F('favoritos_count') - 1, 0)
+        )
+    return len(activos)
@@ -0,0 +1,108 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.favoritos.contadores import activar_favorito, alternar_favorito
+from apps.favoritos.models import Favoritos
+from apps.productos import tendencias
+from apps.productos.models import TiendaProducto
+from apps.usuarios.models import Usuario
+
+MODOS = ['agregar', 'alternar']
+
+
+class Command(BaseCommand):
+    help = (
+        "Toques simultáneos de favorito sobre el mismo producto: verifica favoritos_count y mide el "
+        "rendimiento. Usar solo con datos desechables (usuarios y producto de prueba): mientras corre, "
+        "los favoritos de esos usuarios cambian a la vista de todos"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tienda_producto_id', type=int, help="Producto usado en la prueba (se restaura al terminar)")
+        parser.add_argument('--usuarios', type=int, default=20, help="Usuarios existentes que tocan a la vez")
+        parser.add_argument('--toques', type=int, default=5, help="Toques simultáneos por usuario (doble toque = 2)")
+        parser.add_argument('--modo', choices=MODOS, action='append',
+                            help="Modo a probar (repetible); por defecto todos")
+
+    def handle(self, *args, **options):
+        try:
+            tp = TiendaProducto.objects.get(pk=options['tienda_producto_id'], fecha_eliminacion__isnull=True)
+        except TiendaProducto.DoesNotExist:
+            raise CommandError("Producto no encontrado")
+
+        usuarios = list(Usuario.objects.order_by('pk').values_list('pk', flat=True)[:options['usuarios']])
+        if not usuarios:
+            raise CommandError("No hay usuarios para la prueba")
+
+        if connection.vendor != 'postgresql':
+            raise CommandError("Las sentencias de favoritos requieren PostgreSQL")
+
+        # Estado previo de los favoritos tocados, para restaurarlo
+        previos = list(Favoritos.objects.filter(tienda_producto=tp, usuario_id__in=usuarios).values(
+            'pk', 'estado_id', 'fecha_eliminacion', 'fecha_modificacion'
+        ))
+        contador_original = tp.favoritos_count
+        funciones = {
+            'agregar': lambda usuario_id: activar_favorito(usuario_id, tp.pk),
+            'alternar': lambda usuario_id: alternar_favorito(usuario_id, tp.pk),
+        }
+
+        # Los toques de la prueba no deben sumar al puntaje de tendencia del producto
+        try:
+            with mock.patch.object(tendencias, 'registrar_favorito'):
+                for modo in options['modo'] or MODOS:
+                    resultado = self.ejecutar(funciones[modo], usuarios, options['toques'])
+                    self.reportar(modo, tp.pk, resultado)
+        finally:
+            Favoritos.objects.filter(tienda_producto=tp, usuario_id__in=usuarios).exclude(
+                pk__in=[p['pk'] for p in previos]
+            ).delete()
+            for previo in previos:
+                Favoritos.objects.filter(pk=previo.pop('pk')).update(**previo)
+            TiendaProducto.objects.filter(pk=tp.pk).update(favoritos_count=contador_original)
+
+    def ejecutar(self, funcion, usuarios, toques):
+        barrera = threading.Barrier(len(usuarios) * toques)
+        errores = []
+        lock = threading.Lock()
+
+        def toque(usuario_id):
+            try:
+                barrera.wait()
+                funcion(usuario_id)
+            except Exception as e:
+                with lock:
+                    errores.append(e)
+            finally:
+                connection.close()
+
+        hilos = [
+            threading.Thread(target=toque, args=(usuario_id,))
+            for usuario_id in usuarios for _ in range(toques)
+        ]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        return {'toques': len(hilos), 'errores': len(errores), 'segundos': time.perf_counter() - inicio}
+
+    def reportar(self, modo, tienda_producto_id, r):
+        contador = TiendaProducto.objects.get(pk=tienda_producto_id).favoritos_count
+        activos = Favoritos.objects.filter(
+            tienda_producto_id=tienda_producto_id, fecha_eliminacion__isnull=True
+        ).count()
+        # Correcto: el contador coincide con los favoritos activos y ningún toque falló
+        correcto = contador == activos and r['errores'] == 0
+
+        estilo = self.style.SUCCESS if correcto else self.style.ERROR
+        self.stdout.write(estilo(
+            f"{modo:<9} toques={r['toques']:<5} errores={r['errores']:<3} "
+            f"contador={contador:<5} activos={activos:<5} "
+            f"{r['toques'] / r['segundos']:.0f} toques/s {'OK' if correcto else 'INCONSISTENTE'}"
+        ))
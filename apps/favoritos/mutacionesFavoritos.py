@@ -1,11 +1,9 @@
 import graphene
 from graphql import GraphQLError
-from django.utils import timezone
-from .models import Favoritos
 from .favoritosType import FavoritoType
+from .contadores import activar_favorito, alternar_favorito, desactivar_favoritos, CREADO, REACTIVADO, EXISTENTE
+from .consultas import olvidar_favoritos
 from apps.usuarios.utils import requiere_autenticacion
-from apps.productos.models import TiendaProducto
-from core.models import Estado
 
 # ============= MUTATIONS =============
 
@@ -25,53 +23,24 @@ class AgregarFavorito(graphene.Mutation):
     def mutate(self, info, tienda_producto_id, **kwargs):
         usuario = kwargs['current_user']
         
-        # Verificar que el producto exista
-        try:
-            tienda_producto = TiendaProducto.objects.get(
-                pk=tienda_producto_id,
-                fecha_eliminacion__isnull=True
-            )
-        except TiendaProducto.DoesNotExist:
+        # Una sentencia: crea, reactiva o deja el favorito existente (y ajusta el contador)
+        favorito, resultado = activar_favorito(usuario.id, tienda_producto_id)
+        if favorito is None:
             raise GraphQLError("Producto no encontrado")
+        olvidar_favoritos(info)
         
-        # Verificar si ya existe en favoritos (incluso si fue eliminado)
-        favorito_existente = Favoritos.objects.filter(
-            usuario=usuario,
-            tienda_producto=tienda_producto
-        ).first()
-        
-        if favorito_existente:
-            # Si fue eliminado anteriormente, reactivarlo
-            if favorito_existente.fecha_eliminacion:
-                favorito_existente.fecha_eliminacion = None
-                favorito_existente.estado = Estado.get_activo()
-                favorito_existente.save()
-                
-                return AgregarFavorito(
-                    favorito=favorito_existente,
-                    mensaje="Producto agregado nuevamente a favoritos",
-                    ya_existia=True
-                )
-            else:
-                # Ya está en favoritos activos
-                return AgregarFavorito(
-                    favorito=favorito_existente,
-                    mensaje="Este producto ya está en tus favoritos",
-                    ya_existia=True
-                )
-        
-        # Crear nuevo favorito
-        favorito = Favoritos(
-            usuario=usuario,
-            tienda_producto=tienda_producto,
-            estado=Estado.get_activo()
-        )
-        favorito.save()
+        if resultado == REACTIVADO:
+            # Si fue eliminado anteriormente, se reactivó
+            mensaje = "Producto agregado nuevamente a favoritos"
+        elif resultado == EXISTENTE:
+            mensaje = "Este producto ya está en tus favoritos"
+        else:
+            mensaje = "Producto agregado a favoritos exitosamente"
         
         return AgregarFavorito(
             favorito=favorito,
-            mensaje="Producto agregado a favoritos exitosamente",
-            ya_existia=False
+            mensaje=mensaje,
+            ya_existia=resultado != CREADO
         )
 
 
@@ -90,20 +59,10 @@ class EliminarFavorito(graphene.Mutation):
     def mutate(self, info, tienda_producto_id, **kwargs):
         usuario = kwargs['current_user']
         
-        # Buscar el favorito
-        try:
-            favorito = Favoritos.objects.get(
-                usuario=usuario,
-                tienda_producto_id=tienda_producto_id,
-                fecha_eliminacion__isnull=True
-            )
-        except Favoritos.DoesNotExist:
+        # Soft delete (descuenta el contador del producto)
+        if not desactivar_favoritos(usuario.id, tienda_producto_id=tienda_producto_id):
             raise GraphQLError("Este producto no está en tus favoritos")
-        
-        # Soft delete
-        favorito.fecha_eliminacion = timezone.now()
-        favorito.estado = Estado.get_inactivo()
-        favorito.save()
+        olvidar_favoritos(info)
         
         return EliminarFavorito(
             ok=True,
@@ -123,13 +82,9 @@ class LimpiarFavoritos(graphene.Mutation):
     def mutate(self, info, **kwargs):
         usuario = kwargs['current_user']
         
-        # Obtener todos los favoritos activos
-        favoritos = Favoritos.objects.filter(
-            usuario=usuario,
-            fecha_eliminacion__isnull=True
-        )
-        
-        cantidad = favoritos.count()
+        # Soft delete en masa
+        cantidad = desactivar_favoritos(usuario.id)
+        olvidar_favoritos(info)
         
         if cantidad == 0:
             return LimpiarFavoritos(
@@ -138,12 +93,6 @@ class LimpiarFavoritos(graphene.Mutation):
                 cantidad_eliminada=0
             )
         
-        # Soft delete en masa
-        favoritos.update(
-            fecha_eliminacion=timezone.now(),
-            estado=Estado.get_inactivo()
-        )
-        
         return LimpiarFavoritos(
             ok=True,
             mensaje=f"Se eliminaron {cantidad} productos de tus favoritos",
@@ -167,59 +116,24 @@ class ToggleFavorito(graphene.Mutation):
     def mutate(self, info, tienda_producto_id, **kwargs):
         usuario = kwargs['current_user']
         
-        # Verificar que el producto exista
-        try:
-            tienda_producto = TiendaProducto.objects.get(
-                pk=tienda_producto_id,
-                fecha_eliminacion__isnull=True
-            )
-        except TiendaProducto.DoesNotExist:
+        # Una sentencia: agrega si no está activo, elimina (soft delete) si lo está
+        favorito = alternar_favorito(usuario.id, tienda_producto_id)
+        if favorito is None:
             raise GraphQLError("Producto no encontrado")
+        olvidar_favoritos(info)
         
-        # Buscar favorito existente
-        favorito = Favoritos.objects.filter(
-            usuario=usuario,
-            tienda_producto=tienda_producto,
-            fecha_eliminacion__isnull=True
-        ).first()
-        
-        if favorito:
-            # Eliminar de favoritos
-            favorito.fecha_eliminacion = timezone.now()
-            favorito.estado = Estado.get_inactivo()
-            favorito.save()
-            
+        if favorito.fecha_eliminacion is not None:
             return ToggleFavorito(
                 favorito=None,
                 accion="eliminado",
                 mensaje="Producto eliminado de favoritos"
             )
-        else:
-            # Agregar a favoritos (o reactivar si fue eliminado)
-            favorito_eliminado = Favoritos.objects.filter(
-                usuario=usuario,
-                tienda_producto=tienda_producto
-            ).first()
-            
-            if favorito_eliminado:
-                # Reactivar
-                favorito_eliminado.fecha_eliminacion = None
-                favorito_eliminado.estado = Estado.get_activo()
-                favorito_eliminado.save()
-                nuevo_favorito = favorito_eliminado
-            else:
-                # Crear nuevo
-                nuevo_favorito = Favoritos.objects.create(
-                    usuario=usuario,
-                    tienda_producto=tienda_producto,
-                    estado=Estado.get_activo()
-                )
-            
-            return ToggleFavorito(
-                favorito=nuevo_favorito,
-                accion="agregado",
-                mensaje="Producto agregado a favoritos"
-            )
+        
+        return ToggleFavorito(
+            favorito=favorito,
+            accion="agregado",
+            mensaje="Producto agregado a favoritos"
+        )
 
 
 # ============= MUTATION CLASS =============
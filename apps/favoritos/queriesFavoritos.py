@@ -2,6 +2,7 @@ import graphene
 from graphql import GraphQLError
 from .favoritosType import FavoritoType, EstadisticasFavoritosType
 from .models import Favoritos
+from .consultas import ids_favoritos
 from apps.usuarios.utils import requiere_autenticacion
 
 class FavoritosQueries(graphene.ObjectType):
@@ -22,6 +23,12 @@ class FavoritosQueries(graphene.ObjectType):
         description="Verifica si un producto está en favoritos del usuario"
     )
     
+    son_favoritos = graphene.List(
+        graphene.Boolean,
+        tienda_producto_ids=graphene.List(graphene.ID, required=True),
+        description="Indica, en el mismo orden que los ids, qué productos están en favoritos del usuario"
+    )
+    
     cantidad_favoritos = graphene.Int(
         description="Retorna la cantidad total de favoritos del usuario"
     )
@@ -101,6 +108,13 @@ class FavoritosQueries(graphene.ObjectType):
             fecha_eliminacion__isnull=True
         ).exists()
     
+    @requiere_autenticacion(user_types=['usuario'])
+    def resolve_son_favoritos(self, info, tienda_producto_ids, **kwargs):
+        """Estado de favorito de varios productos con una sola consulta"""
+        ids = ids_favoritos(info)
+        # Un id no numérico no puede ser favorito
+        return [str(tp_id).isdigit() and int(tp_id) in ids for tp_id in tienda_producto_ids]
+    
     @requiere_autenticacion(user_types=['usuario'])
     def resolve_cantidad_favoritos(self, info, **kwargs):
         """Retorna el conteo total de favoritos activos"""
@@ -148,70 +162,54 @@ class FavoritosQueries(graphene.ObjectType):
         """Retorna estadísticas generales de favoritos del usuario"""
         usuario = kwargs['current_user']
         
-        from django.db.models import Count, Avg, Min, Max
+        from collections import Counter
+        from django.db.models import Count, Min, Max, Q, Sum
         from django.utils import timezone
         from datetime import timedelta
         
-        # Total de favoritos activos
-        total = Favoritos.objects.filter(
-            usuario=usuario,
-            fecha_eliminacion__isnull=True
-        ).count()
-        
-        # Favoritos agregados en los últimos 7 días
+        # Una sola consulta agrupada por (tienda, categoría); el resto se calcula sobre esos grupos
         hace_7_dias = timezone.now() - timedelta(days=7)
-        recientes = Favoritos.objects.filter(
-            usuario=usuario,
-            fecha_eliminacion__isnull=True,
-            fecha_creacion__gte=hace_7_dias
-        ).count()
-        
-        # Tienda con más productos en favoritos
-        tienda_favorita = Favoritos.objects.filter(
+        grupos = list(Favoritos.objects.filter(
             usuario=usuario,
             fecha_eliminacion__isnull=True
         ).values(
-            'tienda_producto__tienda__id',
-            'tienda_producto__tienda__nombre'
-        ).annotate(
-            cantidad=Count('id')
-        ).order_by('-cantidad').first()
-        
-        tienda_favorita_nombre = tienda_favorita['tienda_producto__tienda__nombre'] if tienda_favorita else None
-        tienda_favorita_cantidad = tienda_favorita['cantidad'] if tienda_favorita else 0
-        
-        # Categoría con más productos en favoritos
-        categoria_favorita = Favoritos.objects.filter(
-            usuario=usuario,
-            fecha_eliminacion__isnull=True
-        ).values(
-            'tienda_producto__producto__categoria__id',
+            'tienda_producto__tienda_id',
+            'tienda_producto__tienda__nombre',
+            'tienda_producto__producto__categoria_id',
             'tienda_producto__producto__categoria__nombre'
         ).annotate(
-            cantidad=Count('id')
-        ).order_by('-cantidad').first()
-        
-        categoria_favorita_nombre = categoria_favorita['tienda_producto__producto__categoria__nombre'] if categoria_favorita else None
-        categoria_favorita_cantidad = categoria_favorita['cantidad'] if categoria_favorita else 0
-        
-        # Precio promedio de favoritos
-        precios = Favoritos.objects.filter(
-            usuario=usuario,
-            fecha_eliminacion__isnull=True
-        ).aggregate(
-            promedio=Avg('tienda_producto__precio'),
+            cantidad=Count('id'),
+            recientes=Count('id', filter=Q(fecha_creacion__gte=hace_7_dias)),
+            suma_precios=Sum('tienda_producto__precio'),
             minimo=Min('tienda_producto__precio'),
             maximo=Max('tienda_producto__precio')
-        )
+        ).order_by())
+        
+        total = sum(g['cantidad'] for g in grupos)
+        por_tienda = Counter()
+        por_categoria = Counter()
+        # Se cuenta por id (dos tiendas pueden llamarse igual); el nombre solo es la etiqueta
+        nombres_tienda = {}
+        nombres_categoria = {}
+        for g in grupos:
+            tienda_id = g['tienda_producto__tienda_id']
+            categoria_id = g['tienda_producto__producto__categoria_id']
+            por_tienda[tienda_id] += g['cantidad']
+            por_categoria[categoria_id] += g['cantidad']
+            nombres_tienda[tienda_id] = g['tienda_producto__tienda__nombre']
+            nombres_categoria[categoria_id] = g['tienda_producto__producto__categoria__nombre']
+        
+        tienda_favorita = por_tienda.most_common(1)[0] if por_tienda else (None, 0)
+        categoria_favorita = por_categoria.most_common(1)[0] if por_categoria else (None, 0)
         
         return EstadisticasFavoritosType(
             total=total,
-            recientes_7_dias=recientes,
-            tienda_favorita=tienda_favorita_nombre,
-            tienda_favorita_cantidad=tienda_favorita_cantidad,
-            categoria_favorita=categoria_favorita_nombre,
-            categoria_favorita_cantidad=categoria_favorita_cantidad,
-            precio_promedio=float(precios['promedio']) if precios['promedio'] else 0.0,
-            precio_minimo=float(precios['minimo']) if precios['minimo'] else 0.0,
-            precio_maximo=float(precios['maximo']) if precios['maximo'] else 0.0
+            recientes_7_dias=sum(g['recientes'] for g in grupos),
+            tienda_favorita=nombres_tienda.get(tienda_favorita[0]),
+            tienda_favorita_cantidad=tienda_favorita[1],
+            categoria_favorita=nombres_categoria.get(categoria_favorita[0]),
+            categoria_favorita_cantidad=categoria_favorita[1],
+            precio_promedio=float(sum(g['suma_precios'] for g in grupos) / total) if total else 0.0,
+            precio_minimo=float(min(g['minimo'] for g in grupos)) if grupos else 0.0,
+            precio_maximo=float(max(g['maximo'] for g in grupos)) if grupos else 0.0
         )
\ No newline at end of file
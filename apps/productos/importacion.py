@@ -0,0 +1,210 @@
+"""
+Importación masiva de productos de una tienda (mutación `importarProductos`
+y `manage.py importar_productos`).
+
+El archivo se lee fila a fila (CSV o JSON Lines; un arreglo JSON se
+decodifica completo) con las columnas:
+
+    nombre, descripcion, categoria, talla, precio, stock
+
+`categoria` y `talla` aceptan el id o el nombre, resueltos contra mapas
+cargados una vez por importación. Cada fila se valida por separado: las
+inválidas se reportan con su número y no detienen el resto. Las válidas
+se escriben por lotes de IMPORTACION_LOTE con bulk_create (Producto y
+luego TiendaProducto), todos en una misma transacción: si el archivo deja
+de poder leerse a mitad de camino (p. ej. bytes que no son UTF-8 o un CSV
+mal formado) no queda importada ninguna fila.
+
+Las filas cuyo (nombre, talla) ya existe en la tienda, o se repite en el
+mismo archivo, se reportan como error: reimportar el mismo archivo no
+duplica productos.
+"""
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.categorias.models import Categoria
+from apps.tiendas.dashboard import invalidar_dashboard
+from core.models import Estado
+from .models import Producto, TiendaProducto, Talla
+
+COLUMNAS_OBLIGATORIAS = ['nombre', 'precio']
+STOCK_MAXIMO = 2 ** 31 - 1  # Rango de la columna integer
+FORMATOS = ['csv', 'json', 'jsonl']
+
+
+class ErrorFila(Exception):
+    pass
+
+
+def leer_filas(archivo, formato):
+    """Genera diccionarios desde `archivo` (binario) en `formato` ('csv', 'json' o 'jsonl')."""
+    texto = io.TextIOWrapper(archivo, encoding='utf-8-sig', newline='')
+    try:
+        if formato == 'csv':
+            lector = csv.DictReader(texto)
+            faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in (lector.fieldnames or [])]
+            if faltantes:
+                raise ValueError(f"Faltan columnas: {', '.join(faltantes)}")
+            yield from lector
+        elif formato == 'jsonl':
+            for linea in texto:
+                if linea.strip():
+                    try:
+                        yield json.loads(linea)
+                    except ValueError:
+                        # Se reporta como error de esa fila
+                        yield ErrorFila("la línea no es un JSON válido")
+        elif formato == 'json':
+            datos = json.load(texto)
+            if not isinstance(datos, list):
+                raise ValueError("El JSON debe ser un arreglo de productos")
+            yield from datos
+        else:
+            raise ValueError(f"Formato no soportado. Opciones: {', '.join(FORMATOS)}")
+    finally:
+        # El archivo pertenece al llamador
+        texto.detach()
+
+
+def formato_de(nombre_archivo):
+    extension = nombre_archivo.rsplit('.', 1)[-1].lower() if '.' in nombre_archivo else ''
+    return extension if extension in FORMATOS else 'csv'
+
+
+def _mapa(queryset):
+    """{id: id} más {nombre en minúsculas: id, o None si el nombre es ambiguo}."""
+    mapa = {}
+    nombres = {}
+    for pk, nombre in queryset.values_list('id', 'nombre'):
+        mapa[str(pk)] = pk
+        clave = nombre.strip().lower()
+        nombres[clave] = None if clave in nombres else pk
+    return {**nombres, **mapa}
+
+
+def _resolver(mapa, valor, campo):
+    if valor in (None, ''):
+        return None
+    clave = str(valor).strip().lower()
+    if clave not in mapa:
+        raise ErrorFila(f"{campo} '{valor}' no existe")
+    if mapa[clave] is None:
+        raise ErrorFila(f"{campo} '{valor}' es ambigua, usar el id")
+    return mapa[clave]
+
+
+class Importacion:
+    """Estado de una importación: mapas de búsqueda, lote pendiente y resultado."""
+
+    def __init__(self, tienda):
+        self.tienda = tienda
+        self.categorias = _mapa(Categoria.objects.filter(fecha_eliminacion__isnull=True))
+        self.tallas = _mapa(Talla.objects.filter(fecha_eliminacion__isnull=True))
+        self.estado_id = Estado.get_activo().id
+        self.existentes = {
+            (nombre.strip().lower(), talla_id)
+            for nombre, talla_id in TiendaProducto.objects.filter(
+                tienda=tienda, fecha_eliminacion__isnull=True
+            ).values_list('producto__nombre', 'talla_id')
+        }
+        self.lote = []
+        self.creados = 0
+        self.errores = []  # [(numero_fila, mensaje)]
+
+    def validar(self, fila):
+        if not isinstance(fila, dict):
+            raise ErrorFila("La fila debe ser un objeto con las columnas del producto")
+
+        nombre = str(fila.get('nombre') or '').strip()
+        if not nombre:
+            raise ErrorFila("nombre es obligatorio")
+        if len(nombre) > Producto._meta.get_field('nombre').max_length:
+            raise ErrorFila("nombre es demasiado largo")
+
+        if fila.get('precio') in (None, ''):
+            raise ErrorFila("precio es obligatorio")
+        try:
+            precio = Decimal(str(fila['precio']).strip())
+        except InvalidOperation:
+            raise ErrorFila(f"precio '{fila.get('precio')}' no es un número")
+        if not precio.is_finite() or precio < 0 or precio >= 10 ** 8:
+            raise ErrorFila("precio fuera de rango")
+
+        stock = fila.get('stock')
+        if stock in (None, ''):
+            stock = 1  # Igual que crearProducto
+        else:
+            try:
+                stock = int(str(stock).strip())
+            except ValueError:
+                raise ErrorFila(f"stock '{fila.get('stock')}' no es un entero")
+            if stock < 0:
+                raise ErrorFila("stock no puede ser negativo")
+            if stock > STOCK_MAXIMO:
+                raise ErrorFila("stock fuera de rango")
+
+        categoria_id = _resolver(self.categorias, fila.get('categoria'), 'categoria')
+        talla_id = _resolver(self.tallas, fila.get('talla'), 'talla')
+
+        clave = (nombre.lower(), talla_id)
+        if clave in self.existentes:
+            raise ErrorFila("el producto ya existe en la tienda con esa talla")
+        self.existentes.add(clave)
+
+        descripcion = str(fila.get('descripcion') or '').strip() or None
+        return (
+            Producto(nombre=nombre, descripcion=descripcion, categoria_id=categoria_id, estado_id=self.estado_id),
+            TiendaProducto(
+                tienda=self.tienda, talla_id=talla_id, descripcion=descripcion,
+                precio=precio, stock=stock, estado_id=self.estado_id
+            )
+        )
+
+    def agregar(self, numero, fila):
+        try:
+            if isinstance(fila, ErrorFila):
+                raise fila
+            self.lote.append(self.validar(fila))
+        except ErrorFila as e:
+            self.errores.append((numero, str(e)))
+            return
+        if len(self.lote) >= settings.IMPORTACION_LOTE:
+            self.guardar()
+
+    def guardar(self):
+        if not self.lote:
+            return
+        productos = Producto.objects.bulk_create([producto for producto, _ in self.lote])
+        for producto, (_, tp) in zip(productos, self.lote):
+            tp.producto = producto
+        TiendaProducto.objects.bulk_create([tp for _, tp in self.lote])
+        self.creados += len(self.lote)
+        self.lote = []
+
+
+def importar(tienda, filas, max_filas=None):
+    """
+    Importa `filas` (iterable de diccionarios, p. ej. `leer_filas`) en
+    `tienda`. Retorna (creados, errores) con errores [(numero_fila, mensaje)];
+    la fila 1 es la primera de datos.
+
+    Las excepciones al leer `filas` (ValueError, csv.Error) revierten la
+    importación completa y se propagan al llamador.
+    """
+    importacion = Importacion(tienda)
+    with transaction.atomic():
+        for numero, fila in enumerate(filas, start=1):
+            if max_filas and numero > max_filas:
+                importacion.errores.append((numero, f"se superó el máximo de {max_filas} filas; el resto no se importó"))
+                break
+            importacion.agregar(numero, fila)
+        importacion.guardar()
+
+    if importacion.creados:
+        invalidar_dashboard(tienda.id)
+    return importacion.creados, importacion.errores
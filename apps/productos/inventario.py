@@ -0,0 +1,86 @@
+"""
+Actualización masiva de precio y stock (mutación `actualizarStockPrecioMasivo`).
+
+Pensada para vendedores que sincronizan el inventario desde una planilla o
+un punto de venta: la propiedad de todos los productos se verifica con una
+consulta y los cambios se aplican con un único UPDATE ... FROM (VALUES ...),
+sin importar cuántos productos traiga la petición.
+
+El estado del producto sigue al nuevo stock, como al reservar y liberar
+(apps/ventas/reservas.py): dejarlo en 0 lo marca "reservado" si tiene ventas
+pendientes o "vendido" si no, y reponer stock de un producto vendido o
+reservado lo vuelve "disponible". Otros estados (p. ej. inactivo) no cambian.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.tiendas.dashboard import invalidar_dashboard
+from core.models import Estado
+from .models import TiendaProducto
+
+
+def productos_ajenos(ids, usuario):
+    """Ids de `ids` que no existen o no son de una tienda de `usuario`, con una consulta."""
+    propios = set(TiendaProducto.objects.filter(
+        pk__in=ids,
+        fecha_eliminacion__isnull=True,
+        tienda__propietario=usuario
+    ).values_list('pk', flat=True))
+    return [pk for pk in ids if pk not in propios]
+
+
+def actualizar_precio_stock(cambios):
+    """
+    Aplica `cambios` [(tienda_producto_id, precio, stock)] en una sentencia;
+    precio o stock None conserva el valor actual. Retorna los ids de tienda
+    afectados (para invalidar sus dashboards).
+    """
+    if not cambios:
+        return []
+
+    # Los tipos explícitos permiten NULL en VALUES y comparan con las columnas sin conversiones
+    valores = ', '.join(['(%s::bigint, %s::numeric, %s::integer)'] * len(cambios))
+    estados = dict(Estado.objects.filter(nombre__in=[
+        Estado.ACTIVO, Estado.DISPONIBLE, Estado.RESERVADO, Estado.VENDIDO, Estado.PENDIENTE
+    ]).values_list('nombre', 'id'))
+    with transaction.atomic(), connection.cursor() as cursor:
+        # El UPDATE bloquea las filas en el orden del plan (no el de VALUES); bloquearlas
+        # antes por pk evita que dos sincronizaciones simultáneas se bloqueen en cruz
+        list(
+            TiendaProducto.objects.select_for_update()
+            .filter(pk__in=[cambio[0] for cambio in cambios])
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        # En el CASE, tp.stock y tp.estado_id son los valores previos a la actualización
+        cursor.execute(
+            f"""
+            UPDATE tienda_producto AS tp SET
+                precio = COALESCE(v.precio, tp.precio),
+                stock = COALESCE(v.stock, tp.stock),
+                estado_id = CASE
+                    WHEN COALESCE(v.stock, tp.stock) <= 0 AND tp.estado_id IN (%s, %s) THEN
+                        CASE WHEN EXISTS (
+                            SELECT 1 FROM venta_producto vp
+                            WHERE vp.tienda_producto_id = tp.id AND vp.estado_id = %s
+                        ) THEN %s ELSE %s END
+                    WHEN COALESCE(v.stock, tp.stock) > 0 AND tp.estado_id IN (%s, %s) THEN
+                        %s
+                    ELSE tp.estado_id
+                END,
+                fecha_modificacion = %s
+            FROM (VALUES {valores}) AS v (id, precio, stock)
+            WHERE tp.id = v.id AND tp.fecha_eliminacion IS NULL
+            RETURNING tp.tienda_id
+            """,
+            [
+                estados[Estado.ACTIVO], estados[Estado.DISPONIBLE], estados[Estado.PENDIENTE],
+                estados[Estado.RESERVADO], estados[Estado.VENDIDO],
+                estados[Estado.RESERVADO], estados[Estado.VENDIDO], estados[Estado.DISPONIBLE],
+                timezone.now(),
+                *[valor for cambio in cambios for valor in cambio]
+            ]
+        )
+        tienda_ids = {fila[0] for fila in cursor.fetchall()}
+        invalidar_dashboard(*tienda_ids)
+    return list(tienda_ids)
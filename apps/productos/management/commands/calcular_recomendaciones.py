@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.productos.recomendaciones import calcular
+
+
+class Command(BaseCommand):
+    help = "Recalcula los productos relacionados por co-ocurrencia en favoritos y compras"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vecinos', type=int, default=settings.RECOMENDACIONES_VECINOS,
+                            help="Productos relacionados guardados por producto")
+        parser.add_argument('--min-coincidencias', type=int, default=settings.RECOMENDACIONES_MIN_COINCIDENCIAS,
+                            help="Usuarios en común mínimos para relacionar dos productos")
+        parser.add_argument('--lote', type=int, default=512, help="Productos por bloque de la multiplicación")
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        total = calcular(
+            vecinos=options['vecinos'],
+            min_coincidencias=options['min_coincidencias'],
+            lote=options['lote']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} producto(s) con recomendaciones en {time.perf_counter() - inicio:.1f} s"
+        ))
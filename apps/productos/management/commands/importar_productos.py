@@ -0,0 +1,39 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.productos.importacion import FORMATOS, formato_de, importar, leer_filas
+from apps.tiendas.models import Tienda
+
+
+class Command(BaseCommand):
+    help = "Importa productos a una tienda desde un archivo CSV, JSON o JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('tienda_id', type=int)
+        parser.add_argument('ruta', help="Archivo con columnas nombre, descripcion, categoria, talla, precio, stock")
+        parser.add_argument('--formato', choices=FORMATOS, help="Por defecto según la extensión del archivo")
+
+    def handle(self, *args, **options):
+        try:
+            tienda = Tienda.objects.get(pk=options['tienda_id'], fecha_eliminacion__isnull=True)
+        except Tienda.DoesNotExist:
+            raise CommandError("Tienda no encontrada")
+
+        formato = options['formato'] or formato_de(options['ruta'])
+        inicio = time.perf_counter()
+        try:
+            with open(options['ruta'], 'rb') as archivo:
+                creados, errores = importar(tienda, leer_filas(archivo, formato))
+        except OSError as e:
+            raise CommandError(f"No se pudo abrir el archivo: {e}")
+        except (ValueError, csv.Error) as e:
+            raise CommandError(f"No se pudo leer el archivo: {e}")
+
+        for fila, mensaje in errores:
+            self.stdout.write(self.style.WARNING(f"Fila {fila}: {mensaje}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{creados} producto(s) importado(s), {len(errores)} fila(s) con errores "
+            f"en {time.perf_counter() - inicio:.1f} s"
+        ))
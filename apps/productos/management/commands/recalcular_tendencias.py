@@ -0,0 +1,22 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.productos.tendencias import recalcular
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los puntajes de tendencia desde favoritos, ventas y vistas recientes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=5000, help="Productos por lote")
+        parser.add_argument('--dias', type=int, default=settings.TENDENCIA_VENTANA_DIAS,
+                            help="Días de eventos considerados")
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        total = recalcular(lote=options['lote'], ventana_dias=options['dias'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} producto(s) con puntaje de tendencia en {time.perf_counter() - inicio:.1f} s"
+        ))
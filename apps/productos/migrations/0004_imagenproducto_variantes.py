@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2025-12-01 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0003_alter_imagenproducto_archivo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagenproducto',
+            name='variantes',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2025-12-08 10:05
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def calcular_contadores(apps, schema_editor):
+    TiendaProducto = apps.get_model('productos', 'TiendaProducto')
+    Favoritos = apps.get_model('favoritos', 'Favoritos')
+    VentaProducto = apps.get_model('ventas', 'VentaProducto')
+
+    favoritos = (
+        Favoritos.objects
+        .filter(tienda_producto=OuterRef('pk'), fecha_eliminacion__isnull=True)
+        .values('tienda_producto')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    vendidos = (
+        VentaProducto.objects
+        .filter(tienda_producto=OuterRef('pk'), venta__estado__nombre='completado')
+        .values('tienda_producto')
+        .annotate(total=Sum('cantidad'))
+        .values('total')
+    )
+    TiendaProducto.objects.update(
+        favoritos_count=Coalesce(Subquery(favoritos, output_field=IntegerField()), 0),
+        ventas_count=Coalesce(Subquery(vendidos, output_field=IntegerField()), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favoritos', '0001_initial'),
+        ('productos', '0004_imagenproducto_variantes'),
+        ('ventas', '0004_ventadiariatienda_ventadiariaproducto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tiendaproducto',
+            name='favoritos_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='tiendaproducto',
+            name='ventas_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='tiendaproducto',
+            index=models.Index(fields=['favoritos_count', 'ventas_count'], name='tienda_prod_favorit_c83756_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tiendaproducto',
+            index=models.Index(fields=['tienda', 'favoritos_count', 'ventas_count'], name='tienda_prod_tienda__3db91c_idx'),
+        ),
+        migrations.RunPython(calcular_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2025-12-09 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0005_tiendaproducto_contadores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VistaDiariaProducto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('vistas', models.PositiveIntegerField(default=0)),
+                ('tienda_producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vistas_diarias', to='productos.tiendaproducto')),
+            ],
+            options={
+                'verbose_name': 'Vista Diaria de Producto',
+                'verbose_name_plural': 'Vistas Diarias de Producto',
+                'db_table': 'vista_diaria_producto',
+                'unique_together': {('tienda_producto', 'fecha')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TendenciaProducto',
+            fields=[
+                ('tienda_producto', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='tendencia', serialize=False, to='productos.tiendaproducto')),
+                ('puntaje', models.FloatField()),
+                ('fecha_modificacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Tendencia de Producto',
+                'verbose_name_plural': 'Tendencias de Producto',
+                'db_table': 'tendencia_producto',
+                'indexes': [models.Index(fields=['puntaje'], name='tendencia_p_puntaje_3c0e8b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2025-12-10 16:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0006_vistadiariaproducto_tendenciaproducto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecomendacionProducto',
+            fields=[
+                ('tienda_producto', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recomendacion', serialize=False, to='productos.tiendaproducto')),
+                ('relacionados', models.JSONField(default=list)),
+                ('similitudes', models.JSONField(default=list)),
+                ('fecha_modificacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Recomendación de Producto',
+                'verbose_name_plural': 'Recomendaciones de Producto',
+                'db_table': 'recomendacion_producto',
+            },
+        ),
+    ]
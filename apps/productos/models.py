@@ -60,6 +60,9 @@ class TiendaProducto(models.Model):
     descripcion = models.TextField(blank=True, null=True)
     precio = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     stock = models.IntegerField(default=0)
+    # Contadores desnormalizados: apps/favoritos/contadores.py y apps/ventas/reservas.py
+    favoritos_count = models.PositiveIntegerField(default=0)
+    ventas_count = models.PositiveIntegerField(default=0)  # Unidades vendidas (ventas completadas)
     estado = models.ForeignKey(Estado, on_delete=models.PROTECT, related_name='tienda_productos')
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_eliminacion = models.DateTimeField(blank=True, null=True)
@@ -73,6 +76,8 @@ class TiendaProducto(models.Model):
         indexes = [
             models.Index(fields=['tienda', 'producto']),
             models.Index(fields=['producto']),
+            models.Index(fields=['favoritos_count', 'ventas_count']),
+            models.Index(fields=['tienda', 'favoritos_count', 'ventas_count']),
         ]
     
     def __str__(self):
@@ -80,6 +85,66 @@ class TiendaProducto(models.Model):
         return f"{self.producto.nombre} en {self.tienda.nombre}{talla_info}"
 
 
+class VistaDiariaProducto(models.Model):
+    """Vistas de un producto por día (apps/productos/tendencias.py)."""
+    tienda_producto = models.ForeignKey(TiendaProducto, on_delete=models.CASCADE, related_name='vistas_diarias')
+    fecha = models.DateField()
+    vistas = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'vista_diaria_producto'
+        verbose_name = 'Vista Diaria de Producto'
+        verbose_name_plural = 'Vistas Diarias de Producto'
+        unique_together = [['tienda_producto', 'fecha']]
+
+    def __str__(self):
+        return f"{self.tienda_producto_id} {self.fecha}: {self.vistas}"
+
+
+class TendenciaProducto(models.Model):
+    """Puntaje de tendencia con decaimiento temporal (ver apps/productos/tendencias.py)."""
+    tienda_producto = models.OneToOneField(
+        TiendaProducto,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='tendencia'
+    )
+    puntaje = models.FloatField()  # Logaritmo de los aportes llevados a tendencias.EPOCA
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'tendencia_producto'
+        verbose_name = 'Tendencia de Producto'
+        verbose_name_plural = 'Tendencias de Producto'
+        indexes = [
+            models.Index(fields=['puntaje']),
+        ]
+
+    def __str__(self):
+        return f"{self.tienda_producto_id}: {self.puntaje:.3f}"
+
+
+class RecomendacionProducto(models.Model):
+    """Productos más similares por co-ocurrencia (ver apps/productos/recomendaciones.py)."""
+    tienda_producto = models.OneToOneField(
+        TiendaProducto,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='recomendacion'
+    )
+    relacionados = models.JSONField(default=list)  # Ids de TiendaProducto, del más al menos similar
+    similitudes = models.JSONField(default=list)  # Similitud coseno de cada relacionado
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'recomendacion_producto'
+        verbose_name = 'Recomendación de Producto'
+        verbose_name_plural = 'Recomendaciones de Producto'
+
+    def __str__(self):
+        return f"{self.tienda_producto_id}: {self.relacionados}"
+
+
 class ImagenProducto(models.Model):
     nombre = models.CharField(max_length=200)
     descripcion = models.TextField(blank=True, null=True)
@@ -89,6 +154,7 @@ class ImagenProducto(models.Model):
         related_name='imagenes'
     )
     archivo = models.URLField(max_length=500, blank=True, null=True)
+    variantes = models.JSONField(blank=True, null=True)  # {nombre_variante: url}
     estado = models.ForeignKey(Estado, on_delete=models.PROTECT, related_name='imagenes_producto')
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_eliminacion = models.DateTimeField(blank=True, null=True)
@@ -3,16 +3,23 @@ from graphql import GraphQLError
 from core.graphql_scalars import Upload
 from apps.usuarios.models import Auditoria, AuditoriaUsuario
 from apps.usuarios.usuariosType import AuditoriaType
-from apps.usuarios.utils import requiere_autenticacion
+from apps.usuarios.utils import requiere_autenticacion, payload_desde_contexto
 from apps.tiendas.models import Tienda
 from .models import Producto, TiendaProducto, ImagenProducto, Talla
+from . import tendencias
+from .importacion import FORMATOS, STOCK_MAXIMO, formato_de, importar, leer_filas
+from .inventario import actualizar_precio_stock, productos_ajenos
 from apps.categorias.models import Categoria
 from core.models import Estado
 from .productosType import TiendaProductoType, ImagenProductoType, TallaType, ProductoType, ImagenProductoType
 from django.utils import timezone
-import cloudinary.uploader
+from core.archivos import subir_en_segundo_plano
+from core.imagenes import validar_imagen
+from apps.tiendas.dashboard import invalidar_dashboard
 from graphene_django.types import DjangoObjectType
 from decimal import Decimal
+import csv
+from django.conf import settings
 
 class DecimalScalar(graphene.Scalar):
     """Scalar para Decimal"""
@@ -60,6 +67,9 @@ class CrearProducto(graphene.Mutation):
         if tienda.propietario != usuario:
             raise GraphQLError("No puedes agregar productos a esta tienda")
 
+        # Validar imágenes antes de crear nada
+        for img in input.imagenes or []:
+            validar_imagen(img)
         
         # Crear producto base si no existe
         producto = Producto.objects.create(
@@ -79,20 +89,17 @@ class CrearProducto(graphene.Mutation):
             stock=stock_value,
             estado=Estado.get_activo()
         )
+        invalidar_dashboard(tienda.id)
 
-        # Subir imágenes
+        # Subir imágenes (el worker completa `archivo` al terminar la subida)
         if input.imagenes:
             for img in input.imagenes:
-                resultado = cloudinary.uploader.upload(
-                    img,
-                    folder="productos/"
-                )
-                ImagenProducto.objects.create(
+                imagen = ImagenProducto.objects.create(
                     producto=tp,
-                    archivo=resultado['secure_url'],
                     nombre=f"{producto.nombre}-{tp.id}",
                     estado=Estado.get_activo()
                 )
+                subir_en_segundo_plano(imagen, 'archivo', img, "productos/", campo_variantes='variantes')
         
         # Auditoría para usuarios normales
         if kwargs['user_type'] == 'usuario':
@@ -174,6 +181,7 @@ class EditarProducto(graphene.Mutation):
         if input.stock is not None:
             tp.stock = input.stock
         tp.save()
+        invalidar_dashboard(tp.tienda_id)
 
         return EditarProducto(
             producto_tienda=tp,
@@ -205,17 +213,10 @@ class EliminarProducto(graphene.Mutation):
         # Soft delete
         tp.fecha_eliminacion = timezone.now()
         tp.save()
+        invalidar_dashboard(tp.tienda_id)
 
         # Soft delete imágenes
         tp.imagenes.update(fecha_eliminacion=timezone.now())
-        if kwargs['user_type'] in ['moderador', 'superadmin']:
-            Auditoria.registrar(
-                usuario=usuario,
-                accion="eliminar_producto",
-                descripcion=f"{usuario.capitalize()} {usuario.email} eliminó producto '{tp.producto.nombre}'",
-                usuario_tipo=usuario
-            )
-        
         if kwargs['user_type'] in ['moderador', 'superadmin']:
             Auditoria.registrar(
                 usuario=usuario,
@@ -257,17 +258,14 @@ class SubirImagenProducto(graphene.Mutation):
         if tp.tienda.propietario != usuario and not (usuario.es_admin or usuario.es_moderador):
             raise GraphQLError("No autorizado")
 
-        resultado = cloudinary.uploader.upload(
-            imagen,
-            folder="productos/"
-        )
+        validar_imagen(imagen)
 
         img = ImagenProducto.objects.create(
             producto=tp,
-            archivo=resultado['secure_url'],
             nombre=f"prod-{tp.id}",
             estado=Estado.get_activo()
         )
+        subir_en_segundo_plano(img, 'archivo', imagen, "productos/", campo_variantes='variantes')
 
         return SubirImagenProducto(
             imagen_obj=img,
@@ -331,20 +329,20 @@ class EditarImagenProducto(graphene.Mutation):
         if img.producto.tienda.propietario != usuario and not (usuario.es_admin or usuario.es_moderador):
             raise GraphQLError("No autorizado")
 
+        if input.archivo:
+            validar_imagen(input.archivo)
+
         if input.nombre:
             img.nombre = input.nombre
         if input.descripcion:
             img.descripcion = input.descripcion
-        if input.archivo:
-            resultado = cloudinary.uploader.upload(
-                input.archivo,
-                folder="productos/"
-            )
-            img.archivo = resultado['secure_url']
-        
 
         img.save()
 
+        # La nueva URL se asigna cuando el worker termina la subida
+        if input.archivo:
+            subir_en_segundo_plano(img, 'archivo', input.archivo, "productos/", campo_variantes='variantes')
+
         return EditarImagenProducto(
             imagen=img,
             mensaje="Imagen actualizada correctamente"
@@ -373,6 +371,7 @@ class ActualizarEstadoProducto(graphene.Mutation):
 
         tp.estado_id = estado_id
         tp.save()
+        invalidar_dashboard(tp.tienda_id)
 
         return ActualizarEstadoProducto(mensaje="Estado actualizado")
     
@@ -404,12 +403,148 @@ class ActualizarStockPrecio(graphene.Mutation):
             tp.stock = stock
 
         tp.save()
+        invalidar_dashboard(tp.tienda_id)
 
         return ActualizarStockPrecio(
             producto_tienda=tp,
             mensaje="Stock/Precio actualizados"
         )
 
+# Actualización masiva de stock y precio (sincronización desde planilla o POS)
+class CambioStockPrecioInput(graphene.InputObjectType):
+    tienda_producto_id = graphene.ID(required=True)
+    precio = DecimalScalar()
+    stock = graphene.Int()
+
+
+class ActualizarStockPrecioMasivo(graphene.Mutation):
+    class Arguments:
+        cambios = graphene.List(graphene.NonNull(CambioStockPrecioInput), required=True)
+
+    actualizados = graphene.Int()
+    productos = graphene.List(TiendaProductoType)
+    mensaje = graphene.String()
+
+    @requiere_autenticacion(user_types=['usuario'])
+    def mutate(self, info, cambios, **kwargs):
+        usuario = kwargs["current_user"]
+
+        if not cambios:
+            raise GraphQLError("Debes enviar al menos un cambio")
+        if len(cambios) > settings.ACTUALIZACION_MASIVA_MAX:
+            raise GraphQLError(f"Máximo {settings.ACTUALIZACION_MASIVA_MAX} productos por petición")
+
+        filas = []
+        for cambio in cambios:
+            try:
+                tienda_producto_id = int(cambio.tienda_producto_id)
+            except ValueError:
+                tienda_producto_id = None
+            # Fuera del rango de la columna bigint tampoco puede existir
+            if tienda_producto_id is None or not 0 < tienda_producto_id < 2 ** 63:
+                raise GraphQLError(f"Producto no encontrado: {cambio.tienda_producto_id}")
+            if cambio.precio is None and cambio.stock is None:
+                raise GraphQLError(f"El producto {cambio.tienda_producto_id} no tiene cambios")
+            if cambio.precio is not None and (not cambio.precio.is_finite() or not 0 <= cambio.precio < 10 ** 8):
+                raise GraphQLError(f"Precio inválido para el producto {cambio.tienda_producto_id}")
+            if cambio.stock is not None and not 0 <= cambio.stock <= STOCK_MAXIMO:
+                raise GraphQLError(f"Stock inválido para el producto {cambio.tienda_producto_id}")
+            filas.append((tienda_producto_id, cambio.precio, cambio.stock))
+
+        ids = [fila[0] for fila in filas]
+        if len(set(ids)) != len(ids):
+            raise GraphQLError("Un producto aparece más de una vez")
+
+        # Todo o nada: si algún producto no es del vendedor no se aplica ningún cambio
+        ajenos = productos_ajenos(ids, usuario)
+        if ajenos:
+            raise GraphQLError(f"Productos no encontrados o no autorizados: {', '.join(map(str, ajenos))}")
+
+        actualizar_precio_stock(filas)
+
+        return ActualizarStockPrecioMasivo(
+            actualizados=len(filas),
+            productos=TiendaProducto.objects.filter(pk__in=ids),
+            mensaje=f"{len(filas)} producto(s) actualizado(s)"
+        )
+
+# Importación masiva de productos desde un archivo CSV o JSON (apps/productos/importacion.py)
+class ErrorImportacionType(graphene.ObjectType):
+    fila = graphene.Int()
+    mensaje = graphene.String()
+
+
+class ImportarProductos(graphene.Mutation):
+    class Arguments:
+        tienda_id = graphene.ID(required=True)
+        archivo = Upload(required=True)
+        formato = graphene.String(description="csv, json o jsonl; por defecto según la extensión del archivo")
+
+    creados = graphene.Int()
+    errores = graphene.List(ErrorImportacionType)
+    mensaje = graphene.String()
+
+    @requiere_autenticacion(user_types=['usuario'])
+    def mutate(self, info, tienda_id, archivo, formato=None, **kwargs):
+        usuario = kwargs["current_user"]
+
+        try:
+            tienda = Tienda.objects.get(pk=tienda_id, fecha_eliminacion__isnull=True)
+        except Tienda.DoesNotExist:
+            raise GraphQLError("Tienda no encontrada")
+
+        if tienda.propietario_id != usuario.id:
+            raise GraphQLError("No puedes agregar productos a esta tienda")
+
+        formato = (formato or formato_de(archivo.name)).lower()
+        if formato not in FORMATOS:
+            raise GraphQLError(f"Formato no soportado. Opciones: {', '.join(FORMATOS)}")
+
+        try:
+            creados, errores = importar(
+                tienda, leer_filas(archivo.file, formato), max_filas=settings.IMPORTACION_MAX_FILAS
+            )
+        except (ValueError, csv.Error) as e:
+            raise GraphQLError(f"No se pudo leer el archivo: {e}")
+
+        if creados:
+            AuditoriaUsuario.registrar(
+                usuario=usuario,
+                accion="importar_productos",
+                descripcion=f"El usuario {usuario.email} importó {creados} productos en la tienda '{tienda.nombre}'"
+            )
+
+        return ImportarProductos(
+            creados=creados,
+            errores=[ErrorImportacionType(fila=fila, mensaje=mensaje) for fila, mensaje in errores],
+            mensaje=f"{creados} producto(s) importado(s), {len(errores)} fila(s) con errores"
+        )
+
+# Mutacion pública: la página de un producto registra la vista para las tendencias
+class RegistrarVistaProducto(graphene.Mutation):
+    class Arguments:
+        tienda_producto_id = graphene.ID(required=True)
+
+    ok = graphene.Boolean()
+
+    def mutate(self, info, tienda_producto_id):
+        if not str(tienda_producto_id).isdigit():
+            raise GraphQLError("Producto no encontrado")
+        tienda_producto_id = int(tienda_producto_id)
+        if not TiendaProducto.objects.filter(pk=tienda_producto_id, fecha_eliminacion__isnull=True).exists():
+            raise GraphQLError("Producto no encontrado")
+
+        # Visitante: tipo e id del token (sin consultar la base) o la IP; usuarios y
+        # moderadores tienen ids independientes
+        payload = payload_desde_contexto(info)
+        if payload:
+            visitante = f"{payload.get('user_type')}:{payload.get('user_id')}"
+        else:
+            visitante = info.context.META.get('REMOTE_ADDR', '')
+
+        tendencias.registrar_vista(tienda_producto_id, visitante)
+        return RegistrarVistaProducto(ok=True)
+
 # ============= MUTACIONES DE TALLAS =============
 # (Solo moderadores pueden gestionar tallas globales)
 
@@ -624,6 +759,9 @@ class ProductosMutaciones(graphene.ObjectType):
     editar_imagen_producto = EditarImagenProducto.Field()
     actualizar_estado_producto = ActualizarEstadoProducto.Field()
     actualizar_stock_precio = ActualizarStockPrecio.Field()
+    actualizar_stock_precio_masivo = ActualizarStockPrecioMasivo.Field()
+    importar_productos = ImportarProductos.Field()
+    registrar_vista_producto = RegistrarVistaProducto.Field()
     
     # Tallas
     crear_talla = CrearTalla.Field()
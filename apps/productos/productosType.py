@@ -19,11 +19,17 @@ class TiendaProductoType(DjangoObjectType):
     talla = graphene.Field(lambda: TallaType)
     imagenes = graphene.List(lambda: ImagenProductoType)
     imagenes_urls = graphene.List(graphene.String)
+    es_favorito = graphene.Boolean(description="Si el producto está en favoritos del usuario autenticado (false sin sesión)")
 
     class Meta:
         model = TiendaProducto
         fields = "__all__"
 
+    def resolve_es_favorito(self, info):
+        # Una consulta por petición para todo el listado (apps/favoritos/consultas.py)
+        from apps.favoritos.consultas import ids_favoritos
+        return self.pk in ids_favoritos(info)
+
     def resolve_imagenes_urls(self, info):
         return [img.archivo for img in self.imagenes.all() if img.archivo]
 
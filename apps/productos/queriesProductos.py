@@ -1,20 +1,74 @@
 import graphene
+from django.conf import settings
 from graphql import GraphQLError
 from .productosType import ProductoType, TiendaProductoType, TallaType
-from .models import Producto, TiendaProducto, Talla
+from .models import Producto, TiendaProducto, Talla, RecomendacionProducto
 from apps.usuarios.utils import requiere_autenticacion
 
+# Órdenes disponibles en los listados de productos de tienda
+ORDENES_TIENDA_PRODUCTO = {
+    'populares': ('-favoritos_count', '-ventas_count', '-id'),
+    'mas_vendidos': ('-ventas_count', '-favoritos_count', '-id'),
+    'recientes': ('-fecha_creacion', '-id'),
+}
+
+
+def ordenar_tienda_productos(queryset, ordenar):
+    if not ordenar:
+        return queryset
+    if ordenar not in ORDENES_TIENDA_PRODUCTO:
+        raise GraphQLError(f"Orden no válido. Opciones: {', '.join(ORDENES_TIENDA_PRODUCTO)}")
+    return queryset.order_by(*ORDENES_TIENDA_PRODUCTO[ordenar])
+
+
+def productos_visibles():
+    """Productos de tienda activos, de productos y tiendas activas (listados públicos)."""
+    return TiendaProducto.objects.filter(
+        fecha_eliminacion__isnull=True,
+        estado__nombre='activo',
+        producto__estado__nombre='activo',
+        tienda__estado__nombre='activo'
+    )
+
+
+def ids_categoria_y_subcategorias(categoria_id):
+    from apps.categorias.models import Categoria
+
+    try:
+        categoria = Categoria.objects.get(pk=categoria_id, fecha_eliminacion__isnull=True)
+    except Categoria.DoesNotExist:
+        raise GraphQLError("Categoría no encontrada")
+
+    # IDs de categoría + subcategorías activas
+    ids_categorias = [categoria.id]
+    ids_categorias.extend(list(
+        categoria.subcategorias.filter(fecha_eliminacion__isnull=True).values_list("id", flat=True)
+    ))
+    return ids_categorias
+
+
 class ProductosPublicosQuery(graphene.ObjectType):
     todos_productos = graphene.List(ProductoType, limit=graphene.Int(default_value=20), offset=graphene.Int(default_value=0))
     producto_por_id = graphene.Field(ProductoType, id=graphene.ID(required=True))
-    productos_de_tienda = graphene.List(TiendaProductoType, tienda_id=graphene.ID(required=True))
+    productos_de_tienda = graphene.List(TiendaProductoType, tienda_id=graphene.ID(required=True), ordenar=graphene.String())
     buscar_productos = graphene.List(ProductoType, nombre=graphene.String(required=True), limit=graphene.Int(default_value=20), offset=graphene.Int(default_value=0))
     tallas = graphene.List(TallaType)
 
     # ⭐ NUEVA QUERY
     productos_por_categoria = graphene.List(
         TiendaProductoType,
-        categoria_id=graphene.ID(required=True)
+        categoria_id=graphene.ID(required=True),
+        ordenar=graphene.String(description="populares, mas_vendidos o recientes")
+    )
+    productos_relacionados = graphene.List(
+        TiendaProductoType,
+        tienda_producto_id=graphene.ID(required=True),
+        limite=graphene.Int(default_value=10)
+    )
+    productos_tendencia = graphene.List(
+        TiendaProductoType,
+        categoria_id=graphene.ID(),
+        limite=graphene.Int(default_value=20)
     )
 
     def resolve_todos_productos(self, info, limit=20, offset=0):
@@ -26,11 +80,11 @@ class ProductosPublicosQuery(graphene.ObjectType):
         except Producto.DoesNotExist:
             raise GraphQLError("Producto no encontrado")
 
-    def resolve_productos_de_tienda(self, info, tienda_id):
-        return TiendaProducto.objects.filter(
+    def resolve_productos_de_tienda(self, info, tienda_id, ordenar=None):
+        return ordenar_tienda_productos(TiendaProducto.objects.filter(
             tienda_id=tienda_id,
             fecha_eliminacion__isnull=True
-        )
+        ), ordenar)
 
     def resolve_buscar_productos(self, info, nombre, limit=20, offset=0):
         return Producto.objects.filter(
@@ -42,28 +96,39 @@ class ProductosPublicosQuery(graphene.ObjectType):
         return Talla.objects.filter(fecha_eliminacion__isnull=True)
 
     # ⭐ RESOLVER NUEVO CON SUBCATEGORÍAS
-    def resolve_productos_por_categoria(self, info, categoria_id):
-        from apps.categorias.models import Categoria
-
-        try:
-            categoria = Categoria.objects.get(pk=categoria_id, fecha_eliminacion__isnull=True)
-        except Categoria.DoesNotExist:
-            raise GraphQLError("Categoría no encontrada")
-
-        # IDs de categoría + subcategorías activas
-        ids_categorias = [categoria.id]
-        ids_categorias.extend(list(
-            categoria.subcategorias.filter(fecha_eliminacion__isnull=True).values_list("id", flat=True)
-        ))
-
-        return TiendaProducto.objects.filter(
-            producto__categoria_id__in=ids_categorias,
-            fecha_eliminacion__isnull=True,
-            estado__nombre='activo',
-            producto__estado__nombre='activo',
-            tienda__estado__nombre='activo'
+    def resolve_productos_por_categoria(self, info, categoria_id, ordenar=None):
+        queryset = productos_visibles().filter(
+            producto__categoria_id__in=ids_categoria_y_subcategorias(categoria_id)
         ).select_related('producto', 'tienda', 'talla').prefetch_related('imagenes')
 
+        return ordenar_tienda_productos(queryset, ordenar)
+
+    def resolve_productos_relacionados(self, info, tienda_producto_id, limite=10):
+        ids = RecomendacionProducto.objects.filter(
+            pk=tienda_producto_id
+        ).values_list('relacionados', flat=True).first()
+        if not ids:
+            return []
+        ids = ids[:max(1, min(limite, settings.RECOMENDACIONES_VECINOS))]
+
+        productos = productos_visibles().filter(pk__in=ids).select_related(
+            'producto', 'tienda', 'talla'
+        ).prefetch_related('imagenes').in_bulk()
+        # Conserva el orden por similitud; los que dejaron de estar visibles se omiten
+        return [productos[tp_id] for tp_id in ids if tp_id in productos]
+
+    def resolve_productos_tendencia(self, info, categoria_id=None, limite=20):
+        limite = max(1, min(limite, settings.PAGINACION_MAXIMO))
+
+        # tendencia__isnull=False hace INNER JOIN: el orden recorre el índice de puntaje
+        queryset = productos_visibles().filter(tendencia__isnull=False)
+        if categoria_id:
+            queryset = queryset.filter(producto__categoria_id__in=ids_categoria_y_subcategorias(categoria_id))
+
+        return queryset.select_related('producto', 'tienda', 'talla').prefetch_related(
+            'imagenes'
+        ).order_by('-tendencia__puntaje')[:limite]
+
 
 
 # Query Privada para vendedores autenticados
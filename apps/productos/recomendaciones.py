@@ -0,0 +1,143 @@
+"""
+Recomendaciones "a quienes les gustó esto también les gustó" (query
+`productosRelacionados`).
+
+`manage.py calcular_recomendaciones` arma una matriz dispersa usuarios ×
+productos con los favoritos activos y las compras completadas (1 si el
+usuario interactuó con el producto), calcula la similitud coseno entre
+productos a partir de las coincidencias:
+
+    similitud(i, j) = usuarios(i ∩ j) / sqrt(usuarios(i) · usuarios(j))
+
+y guarda los RECOMENDACIONES_VECINOS más similares de cada producto en
+RecomendacionProducto. La query lee una fila por clave primaria (sin
+cargar NumPy ni SciPy en el proceso web).
+
+La matriz producto × producto no se materializa completa: se multiplica
+por bloques de filas (Xᵀ[bloque] · X) y de cada bloque se queda solo el
+top-K, así la memoria depende del tamaño del bloque y no del catálogo.
+"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from apps.favoritos.models import Favoritos
+from apps.ventas.models import VentaProducto
+from core.models import Estado
+from .models import RecomendacionProducto
+
+
+def _interacciones():
+    """Pares (usuario_id, tienda_producto_id) de favoritos activos y compras completadas."""
+    favoritos = Favoritos.objects.filter(
+        fecha_eliminacion__isnull=True,
+        tienda_producto__fecha_eliminacion__isnull=True
+    ).values_list('usuario_id', 'tienda_producto_id')
+    compras = VentaProducto.objects.filter(
+        venta__estado__nombre=Estado.COMPLETADO,
+        venta__fecha_eliminacion__isnull=True,
+        tienda_producto__fecha_eliminacion__isnull=True
+    ).values_list('venta__usuario_id', 'tienda_producto_id')
+
+    pares = np.array(list(favoritos.iterator()) + list(compras.iterator()), dtype=np.int64)
+    return pares.reshape(-1, 2)
+
+
+def matriz_interacciones(pares):
+    """
+    Matriz CSR binaria usuarios × productos a partir de `pares`. Retorna
+    (matriz, ids de producto por columna).
+    """
+    usuarios, filas = np.unique(pares[:, 0], return_inverse=True)
+    productos, columnas = np.unique(pares[:, 1], return_inverse=True)
+
+    matriz = sparse.csr_matrix(
+        (np.ones(len(pares), dtype=np.float32), (filas, columnas)),
+        shape=(len(usuarios), len(productos))
+    )
+    # Favorito y compra del mismo producto (o varias compras) cuentan una vez
+    matriz.data[:] = 1
+    return matriz, productos
+
+
+def vecinos_por_bloque(matriz, vecinos, min_coincidencias, lote):
+    """
+    Genera, por bloques de `lote` productos, tuplas (columna, columnas
+    vecinas, similitudes) con hasta `vecinos` productos ordenados por
+    similitud descendente. Solo considera pares con al menos
+    `min_coincidencias` usuarios en común.
+    """
+    por_producto = matriz.T.tocsr()
+    usuarios_por_producto = np.asarray(matriz.sum(axis=0)).ravel()
+    normas = np.sqrt(usuarios_por_producto)
+
+    for inicio in range(0, matriz.shape[1], lote):
+        fin = min(inicio + lote, matriz.shape[1])
+        coincidencias = (por_producto[inicio:fin] @ matriz).tocsr()
+        coincidencias.sort_indices()
+
+        # Similitud coseno sobre los valores no nulos, vectorizada para todo el bloque
+        filas = np.repeat(np.arange(inicio, fin), np.diff(coincidencias.indptr))
+        columnas = coincidencias.indices
+        similitudes = coincidencias.data / (normas[filas] * normas[columnas])
+        descartar = (columnas == filas) | (coincidencias.data < min_coincidencias)
+        similitudes[descartar] = 0
+
+        for i in range(fin - inicio):
+            desde, hasta = coincidencias.indptr[i], coincidencias.indptr[i + 1]
+            fila = similitudes[desde:hasta]
+            candidatos = np.flatnonzero(fila)
+            if len(candidatos) > vecinos:
+                candidatos = candidatos[np.argpartition(-fila[candidatos], vecinos - 1)[:vecinos]]
+            orden = candidatos[np.argsort(-fila[candidatos], kind='stable')]
+            yield inicio + i, columnas[desde:hasta][orden], fila[orden]
+
+
+def calcular(vecinos=None, min_coincidencias=None, lote=512):
+    """
+    Recalcula todas las recomendaciones. Cada bloque se guarda con un
+    upsert, así la query sigue respondiendo con los datos anteriores
+    mientras corre; al final se eliminan las filas que no se actualizaron.
+    Retorna cuántos productos quedaron con recomendaciones.
+    """
+    vecinos = vecinos or settings.RECOMENDACIONES_VECINOS
+    min_coincidencias = min_coincidencias or settings.RECOMENDACIONES_MIN_COINCIDENCIAS
+    inicio = timezone.now()
+    total = 0
+
+    pares = _interacciones()
+    if len(pares):
+        matriz, productos = matriz_interacciones(pares)
+
+        filas = []
+        for columna, columnas_vecinas, similitudes in vecinos_por_bloque(matriz, vecinos, min_coincidencias, lote):
+            if not len(columnas_vecinas):
+                continue
+            filas.append(RecomendacionProducto(
+                tienda_producto_id=int(productos[columna]),
+                relacionados=[int(tp_id) for tp_id in productos[columnas_vecinas]],
+                similitudes=[round(float(s), 4) for s in similitudes],
+                fecha_modificacion=timezone.now()
+            ))
+            if len(filas) >= lote:
+                total += _guardar(filas)
+                filas = []
+        total += _guardar(filas)
+
+    RecomendacionProducto.objects.filter(fecha_modificacion__lt=inicio).delete()
+    return total
+
+
+def _guardar(filas):
+    if filas:
+        with transaction.atomic():
+            RecomendacionProducto.objects.bulk_create(
+                filas,
+                update_conflicts=True,
+                unique_fields=['tienda_producto'],
+                update_fields=['relacionados', 'similitudes', 'fecha_modificacion']
+            )
+    return len(filas)
+
@@ -0,0 +1,17 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.cola import tarea
+from . import tendencias
+
+
+@tarea('sumar_tendencia')
+def sumar_tendencia(eventos, fecha):
+    tendencias.sumar(eventos, parse_datetime(fecha))
+
+
+@tarea('registrar_vista')
+def registrar_vista(tienda_producto_id, fecha):
+    fecha = parse_datetime(fecha)
+    tendencias.contar_vistas({tienda_producto_id: 1}, timezone.localdate(fecha))
+    tendencias.sumar([[tienda_producto_id, tendencias.VISTA, 1]], fecha)
@@ -0,0 +1,260 @@
+"""
+Puntaje de tendencia de los productos (query `productosTendencia`).
+
+Cada favorito, unidad vendida y vista suma su peso (TENDENCIA_PESOS) al
+puntaje del producto, y ese aporte pierde la mitad de su valor cada
+TENDENCIA_VIDA_MEDIA_HORAS. Para no reescribir todos los puntajes a medida
+que pasa el tiempo, TendenciaProducto.puntaje guarda el logaritmo de la
+suma de los aportes llevados a una fecha fija (EPOCA):
+
+    puntaje = ln( Σ peso · e^(λ · (t - EPOCA)) ),   λ = ln 2 / vida media
+
+Ordenar por `puntaje` da el mismo orden que el puntaje decaído a cualquier
+fecha, así que el top-N recorre el índice de la columna; `puntaje_actual`
+convierte el valor guardado al de hoy. Sumar eventos es un INSERT ...
+ON CONFLICT que combina los logaritmos en SQL y lo ejecuta la cola
+(tareas 'sumar_tendencia' y 'registrar_vista'), nunca la petición.
+
+Los favoritos eliminados no restan y los aportes viejos solo decaen:
+`manage.py recalcular_tendencias` reconstruye los puntajes desde los
+favoritos activos y los resúmenes diarios de ventas y vistas de la ventana
+TENDENCIA_VENTANA_DIAS, por lotes de productos vectorizados con NumPy.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.favoritos.models import Favoritos
+from apps.ventas.models import VentaDiariaProducto
+from core.cola import encolar
+from core.models import Tarea
+from .models import TiendaProducto, TendenciaProducto, VistaDiariaProducto
+
+EPOCA = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+FAVORITO = 'favorito'
+VENTA = 'venta'
+VISTA = 'vista'
+
+
+def _lambda():
+    return math.log(2) / settings.TENDENCIA_VIDA_MEDIA_HORAS
+
+
+def _horas(fecha):
+    return (fecha - EPOCA).total_seconds() / 3600
+
+
+def _horas_dia(dia):
+    # Los resúmenes diarios se ubican al mediodía del día
+    return (dia - EPOCA.date()).days * 24 + 12
+
+
+def puntaje_actual(puntaje, ahora=None):
+    """Valor decaído a `ahora` de un TendenciaProducto.puntaje."""
+    return math.exp(puntaje - _lambda() * _horas(ahora or timezone.now()))
+
+
+def registrar(eventos, fecha=None):
+    """
+    Encola la suma de `eventos` [(tienda_producto_id, tipo, cantidad)] al
+    puntaje, con tipo FAVORITO, VENTA o VISTA. Se llama dentro de la
+    transacción que produce el evento: si se revierte, la tarea tampoco queda.
+    """
+    eventos = [[tp_id, tipo, cantidad] for tp_id, tipo, cantidad in eventos if cantidad > 0]
+    if eventos:
+        encolar(
+            'sumar_tendencia',
+            prioridad=Tarea.PRIORIDAD_BAJA,
+            eventos=eventos,
+            fecha=fecha or timezone.now()
+        )
+
+
+def registrar_vista(tienda_producto_id, visitante):
+    """
+    Encola una vista del producto. Las vistas repetidas del mismo
+    `visitante` (usuario o IP) dentro de TENDENCIA_VISTA_SEGUNDOS no cuentan.
+    """
+    clave = f"tendencia_vista:{tienda_producto_id}:{visitante}"
+    if cache.add(clave, 1, settings.TENDENCIA_VISTA_SEGUNDOS):
+        encolar(
+            'registrar_vista',
+            prioridad=Tarea.PRIORIDAD_BAJA,
+            tienda_producto_id=tienda_producto_id,
+            fecha=timezone.now()
+        )
+
+
+def registrar_favorito(tienda_producto_id, usuario_id):
+    """
+    Encola el aporte de un favorito. Quitar y volver a agregar el mismo
+    favorito dentro de TENDENCIA_VENTANA_DIAS no suma de nuevo (las bajas
+    no restan, así que cada reactivación inflaría el puntaje).
+    """
+    clave = f"tendencia_favorito:{tienda_producto_id}:{usuario_id}"
+    if cache.add(clave, 1, settings.TENDENCIA_VENTANA_DIAS * 86400):
+        registrar([(tienda_producto_id, FAVORITO, 1)])
+
+
+def sumar(eventos, fecha):
+    """Suma `eventos` (ver `registrar`) ocurridos en `fecha` a los puntajes, en una sentencia."""
+    pesos = defaultdict(float)
+    for tp_id, tipo, cantidad in eventos:
+        pesos[int(tp_id)] += settings.TENDENCIA_PESOS[tipo] * cantidad
+
+    filas = sorted(
+        (tp_id, math.log(peso) + _lambda() * _horas(fecha))
+        for tp_id, peso in pesos.items() if peso > 0
+    )
+    if not filas:
+        return
+
+    valores = ', '.join(['(%s, %s)'] * len(filas))
+    with connection.cursor() as cursor:
+        # logaddexp(a, b) = max(a, b) + ln(1 + e^-|a - b|); LEAST evita el underflow de EXP.
+        # El ORDER BY fija el orden en que se insertan (y bloquean) las filas en conflicto,
+        # así dos tareas 'sumar_tendencia' con productos en común no se bloquean en cruz.
+        cursor.execute(
+            f"""
+            INSERT INTO tendencia_producto (tienda_producto_id, puntaje, fecha_modificacion)
+            SELECT v.tienda_producto_id, v.puntaje, %s
+            FROM (VALUES {valores}) AS v (tienda_producto_id, puntaje)
+            JOIN tienda_producto tp ON tp.id = v.tienda_producto_id
+            ORDER BY v.tienda_producto_id
+            ON CONFLICT (tienda_producto_id) DO UPDATE SET
+                puntaje = GREATEST(tendencia_producto.puntaje, EXCLUDED.puntaje)
+                    + LN(1 + EXP(-LEAST(ABS(tendencia_producto.puntaje - EXCLUDED.puntaje), 700))),
+                fecha_modificacion = EXCLUDED.fecha_modificacion
+            """,
+            [timezone.now(), *[valor for fila in filas for valor in fila]]
+        )
+
+
+def contar_vistas(vistas, dia):
+    """Suma `vistas` {tienda_producto_id: n} al resumen de vistas de `dia`."""
+    if not vistas:
+        return
+    valores = ', '.join(['(%s, %s)'] * len(vistas))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO vista_diaria_producto (tienda_producto_id, fecha, vistas)
+            SELECT v.tienda_producto_id, %s, v.vistas
+            FROM (VALUES {valores}) AS v (tienda_producto_id, vistas)
+            JOIN tienda_producto tp ON tp.id = v.tienda_producto_id
+            ON CONFLICT (tienda_producto_id, fecha) DO UPDATE SET
+                vistas = vista_diaria_producto.vistas + EXCLUDED.vistas
+            """,
+            [dia, *[valor for fila in sorted(vistas.items()) for valor in fila]]
+        )
+
+
+def calcular_puntajes(tienda_producto_ids, eventos_ids, eventos_horas, eventos_pesos):
+    """
+    Puntajes (ver módulo) de `tienda_producto_ids` (arreglo ordenado) a
+    partir de eventos en arreglos paralelos. Retorna (ids, puntajes) de los
+    productos con al menos un evento.
+
+    El log-sum-exp por producto se resta el máximo del grupo antes de
+    exponenciar, así no hay overflow aunque el aporte crezca con el tiempo.
+    """
+    posiciones = np.searchsorted(tienda_producto_ids, eventos_ids)
+    aportes = np.log(eventos_pesos) + _lambda() * eventos_horas
+
+    maximos = np.full(len(tienda_producto_ids), -np.inf)
+    np.maximum.at(maximos, posiciones, aportes)
+    sumas = np.bincount(
+        posiciones,
+        weights=np.exp(aportes - maximos[posiciones]),
+        minlength=len(tienda_producto_ids)
+    )
+
+    con_eventos = sumas > 0
+    return tienda_producto_ids[con_eventos], maximos[con_eventos] + np.log(sumas[con_eventos])
+
+
+def _eventos_lote(ids, desde):
+    """Eventos de la ventana para los productos `ids` como arreglos (ids, horas, pesos)."""
+    pesos = settings.TENDENCIA_PESOS
+    # fecha_modificacion: alta o última reactivación del favorito (apps/favoritos/contadores.py)
+    favoritos = list(
+        Favoritos.objects.filter(
+            tienda_producto_id__in=ids, fecha_eliminacion__isnull=True, fecha_modificacion__gte=desde
+        ).values_list('tienda_producto_id', 'fecha_modificacion')
+    )
+    ventas = list(
+        VentaDiariaProducto.objects.filter(tienda_producto_id__in=ids, fecha__gte=desde.date())
+        .values_list('tienda_producto_id', 'fecha', 'unidades')
+    )
+    vistas = list(
+        VistaDiariaProducto.objects.filter(tienda_producto_id__in=ids, fecha__gte=desde.date())
+        .values_list('tienda_producto_id', 'fecha', 'vistas')
+    )
+
+    eventos_ids = np.fromiter(
+        (f[0] for f in favoritos), dtype=np.int64, count=len(favoritos)
+    )
+    eventos_horas = np.fromiter(
+        (_horas(f[1]) for f in favoritos), dtype=np.float64, count=len(favoritos)
+    )
+    eventos_pesos = np.full(len(favoritos), float(pesos[FAVORITO]))
+
+    for filas, tipo in ((ventas, VENTA), (vistas, VISTA)):
+        eventos_ids = np.concatenate([
+            eventos_ids, np.fromiter((f[0] for f in filas), dtype=np.int64, count=len(filas))
+        ])
+        eventos_horas = np.concatenate([
+            eventos_horas, np.fromiter((_horas_dia(f[1]) for f in filas), dtype=np.float64, count=len(filas))
+        ])
+        eventos_pesos = np.concatenate([
+            eventos_pesos, pesos[tipo] * np.fromiter((f[2] for f in filas), dtype=np.float64, count=len(filas))
+        ])
+
+    positivos = eventos_pesos > 0
+    return eventos_ids[positivos], eventos_horas[positivos], eventos_pesos[positivos]
+
+
+def recalcular(lote=5000, ventana_dias=None, ahora=None):
+    """
+    Reconstruye los puntajes de todos los productos con los eventos de los
+    últimos `ventana_dias`, de a `lote` productos por transacción. Retorna
+    cuántos productos quedaron con puntaje.
+
+    Las tareas 'sumar_tendencia' que corran a la vez pueden contar un
+    evento dos veces en el lote que se está reconstruyendo; conviene
+    ejecutarlo con la cola detenida o aceptar esa diferencia hasta el
+    siguiente recálculo.
+    """
+    ventana_dias = ventana_dias or settings.TENDENCIA_VENTANA_DIAS
+    desde = (ahora or timezone.now()) - timedelta(days=ventana_dias)
+    total = 0
+
+    # Productos eliminados no aparecen en el ranking
+    TendenciaProducto.objects.filter(tienda_producto__fecha_eliminacion__isnull=False).delete()
+
+    activos = TiendaProducto.objects.filter(fecha_eliminacion__isnull=True).order_by('pk')
+    ultimo = 0
+    while True:
+        ids = list(activos.filter(pk__gt=ultimo).values_list('pk', flat=True)[:lote])
+        if not ids:
+            break
+        ultimo = ids[-1]
+
+        con_puntaje, puntajes = calcular_puntajes(np.array(ids, dtype=np.int64), *_eventos_lote(ids, desde))
+
+        with transaction.atomic():
+            TendenciaProducto.objects.filter(tienda_producto_id__in=ids).delete()
+            TendenciaProducto.objects.bulk_create([
+                TendenciaProducto(tienda_producto_id=int(tp_id), puntaje=float(puntaje))
+                for tp_id, puntaje in zip(con_puntaje, puntajes)
+            ], batch_size=1000)
+        total += len(con_puntaje)
+
+    return total
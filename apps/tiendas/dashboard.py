@@ -0,0 +1,128 @@
+"""
+Dashboard del vendedor (query `dashboardTienda`).
+
+Los totales salen de una sola sentencia: subconsultas escalares con
+agregación condicional sobre ventas, resúmenes diarios
+(apps/ventas/resumen.py), productos y favoritos. Las listas de stock bajo y
+productos más vendidos son dos consultas acotadas por LIMIT.
+
+El resultado se guarda en la caché de Django por tienda. Cada tienda tiene
+una versión en caché que forma parte de la clave; `invalidar_dashboard`
+la renueva al confirmar la transacción de una venta o un cambio de producto,
+con lo que las entradas anteriores dejan de usarse. Los favoritos no
+invalidan: se actualizan al vencer DASHBOARD_CACHE_SEGUNDOS.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.favoritos.models import Favoritos
+from apps.productos.models import TiendaProducto
+from apps.ventas.models import Venta, VentaDiariaTienda, VentaDiariaProducto
+from core.models import Estado
+from .models import Tienda
+
+
+def _clave_version(tienda_id):
+    return f"dashboard_tienda:{tienda_id}:version"
+
+
+def _version(tienda_id):
+    version = cache.get(_clave_version(tienda_id))
+    if version is None:
+        cache.add(_clave_version(tienda_id), time.time_ns(), None)
+        version = cache.get(_clave_version(tienda_id))
+    return version
+
+
+def invalidar_dashboard(*tienda_ids):
+    """Descarta los dashboards cacheados de las tiendas al confirmar la transacción actual."""
+    def invalidar():
+        for tienda_id in set(tienda_ids):
+            cache.set(_clave_version(tienda_id), time.time_ns(), None)
+    transaction.on_commit(invalidar)
+
+
+def _escalar(queryset, expresion, agrupar='tienda', vacio=0, output_field=IntegerField()):
+    """Agregado de `queryset` (filtrado por OuterRef('pk') de la tienda) como subconsulta escalar."""
+    return Coalesce(
+        Subquery(queryset.order_by().values(agrupar).annotate(valor=expresion).values('valor')[:1]),
+        Value(vacio),
+        output_field=output_field
+    )
+
+
+def calcular_dashboard(tienda_id, desde, hasta, umbral_stock, limite):
+    decimal = DecimalField(max_digits=14, decimal_places=2)
+    pendiente = Q(estado__nombre=Estado.PENDIENTE)
+
+    ventas = Venta.objects.filter(tienda=OuterRef('pk'), fecha_eliminacion__isnull=True)
+    resumen = VentaDiariaTienda.objects.filter(tienda=OuterRef('pk'), fecha__range=(desde, hasta))
+    productos = TiendaProducto.objects.filter(tienda=OuterRef('pk'), fecha_eliminacion__isnull=True)
+    favoritos = Favoritos.objects.filter(
+        tienda_producto__tienda=OuterRef('pk'),
+        tienda_producto__fecha_eliminacion__isnull=True,
+        fecha_eliminacion__isnull=True
+    )
+
+    totales = Tienda.objects.filter(pk=tienda_id).annotate(
+        pendientes=_escalar(ventas, Count('id', filter=pendiente)),
+        monto_pendiente=_escalar(ventas, Sum('total', filter=pendiente), output_field=decimal),
+        ventas_completadas=_escalar(resumen, Sum('ventas')),
+        unidades_vendidas=_escalar(resumen, Sum('unidades')),
+        ingresos=_escalar(resumen, Sum('ingresos'), output_field=decimal),
+        productos=_escalar(productos, Count('id')),
+        sin_stock=_escalar(productos, Count('id', filter=Q(stock__lte=0))),
+        stock_bajo=_escalar(productos, Count('id', filter=Q(stock__gt=0, stock__lte=umbral_stock))),
+        favoritos=_escalar(favoritos, Count('id'), agrupar='tienda_producto__tienda'),
+    ).values(
+        'pendientes', 'monto_pendiente', 'ventas_completadas', 'unidades_vendidas', 'ingresos',
+        'productos', 'sin_stock', 'stock_bajo', 'favoritos'
+    ).get()
+
+    productos_stock_bajo = list(
+        TiendaProducto.objects.filter(
+            tienda_id=tienda_id, fecha_eliminacion__isnull=True, stock__lte=umbral_stock
+        ).order_by('stock', 'id').values('id', 'producto__nombre', 'stock')[:limite]
+    )
+
+    mas_vendidos = list(
+        VentaDiariaProducto.objects.filter(tienda_id=tienda_id, fecha__range=(desde, hasta))
+        .values('tienda_producto_id', 'tienda_producto__producto__nombre')
+        .annotate(unidades=Sum('unidades'), ingresos=Sum('ingresos'))
+        .order_by('-unidades', 'tienda_producto_id')[:limite]
+    )
+
+    return {
+        **totales,
+        'monto_pendiente': float(totales['monto_pendiente']),
+        'ingresos': float(totales['ingresos']),
+        'productos_stock_bajo': [
+            {'tienda_producto_id': p['id'], 'nombre': p['producto__nombre'], 'stock': p['stock']}
+            for p in productos_stock_bajo
+        ],
+        'mas_vendidos': [
+            {
+                'tienda_producto_id': p['tienda_producto_id'],
+                'nombre': p['tienda_producto__producto__nombre'],
+                'unidades': p['unidades'],
+                'ingresos': float(p['ingresos']),
+            }
+            for p in mas_vendidos
+        ],
+    }
+
+
+def obtener_dashboard(tienda_id, desde, hasta, umbral_stock=None, limite=5):
+    umbral_stock = settings.DASHBOARD_STOCK_BAJO if umbral_stock is None else umbral_stock
+    clave = f"dashboard_tienda:{tienda_id}:{_version(tienda_id)}:{desde}:{hasta}:{umbral_stock}:{limite}"
+
+    datos = cache.get(clave)
+    if datos is None:
+        datos = calcular_dashboard(tienda_id, desde, hasta, umbral_stock, limite)
+        cache.set(clave, datos, settings.DASHBOARD_CACHE_SEGUNDOS)
+    return datos
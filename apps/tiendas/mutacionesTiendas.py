@@ -1,5 +1,4 @@
 import graphene
-import cloudinary.uploader
 from graphql import GraphQLError
 from django.utils import timezone
 from .models import Tienda
@@ -8,6 +7,7 @@ from apps.usuarios.utils import requiere_autenticacion
 from apps.usuarios.models import Usuario, Auditoria, AuditoriaUsuario
 from core.models import Estado
 from core.graphql_scalars import Upload
+from core.archivos import subir_en_segundo_plano
 
 
 # ============================================
@@ -62,20 +62,6 @@ class CrearTienda(graphene.Mutation):
             estado=Estado.get_activo()
         )
 
-        # --- SUBIR A CLOUDINARY SI HAY ARCHIVOS ---
-        if foto_perfil:
-            res = cloudinary.uploader.upload(
-                foto_perfil,
-                folder="tiendas/foto_perfil/"
-            )
-            tienda.foto_perfil = res["secure_url"]
-
-        if codigo_qr:
-            res = cloudinary.uploader.upload(
-                codigo_qr,
-                folder="tiendas/codigo_qr/"
-            )
-            tienda.codigo_qr = res["secure_url"]
         # Auditoría para usuarios normales
         if kwargs['user_type'] == 'usuario':
             AuditoriaUsuario.registrar(
@@ -87,6 +73,13 @@ class CrearTienda(graphene.Mutation):
 
         tienda.save()
 
+        # --- SUBIR A CLOUDINARY SI HAY ARCHIVOS (en segundo plano) ---
+        if foto_perfil:
+            subir_en_segundo_plano(tienda, 'foto_perfil', foto_perfil, "tiendas/foto_perfil/")
+
+        if codigo_qr:
+            subir_en_segundo_plano(tienda, 'codigo_qr', codigo_qr, "tiendas/codigo_qr/")
+
         # Convertir en vendedor
         if not usuario.is_seller:
             usuario.is_seller = True
@@ -148,22 +141,14 @@ class EditarTienda(graphene.Mutation):
             if value is not None:
                 setattr(tienda, field, value)
 
-        # SUBIR NUEVAS IMÁGENES
+        tienda.save()
+
+        # SUBIR NUEVAS IMÁGENES (en segundo plano)
         if foto_perfil:
-            res = cloudinary.uploader.upload(
-                foto_perfil,
-                folder="tiendas/foto_perfil/"
-            )
-            tienda.foto_perfil = res["secure_url"]
+            subir_en_segundo_plano(tienda, 'foto_perfil', foto_perfil, "tiendas/foto_perfil/")
 
         if codigo_qr:
-            res = cloudinary.uploader.upload(
-                codigo_qr,
-                folder="tiendas/codigo_qr/"
-            )
-            tienda.codigo_qr = res["secure_url"]
-
-        tienda.save()
+            subir_en_segundo_plano(tienda, 'codigo_qr', codigo_qr, "tiendas/codigo_qr/")
 
         return EditarTienda(tienda=tienda, mensaje="Tienda actualizada exitosamente")
 
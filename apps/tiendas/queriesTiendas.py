@@ -1,9 +1,13 @@
+from datetime import timedelta
+
 import graphene
 from graphql import GraphQLError
+from django.utils import timezone
 from graphene_django.types import DjangoObjectType
 
 from .models import Tienda
-from .tiendasType import TiendaType
+from .tiendasType import TiendaType, DashboardTiendaType
+from .dashboard import obtener_dashboard
 from apps.usuarios.utils import requiere_autenticacion
 
 
@@ -44,6 +48,14 @@ class QueryTiendasPrivadas(graphene.ObjectType):
     mis_tiendas = graphene.List(TiendaType)
     mi_tienda = graphene.Field(TiendaType, id=graphene.ID(required=True))
     tiendas_admin = graphene.List(TiendaType)
+    dashboard_tienda = graphene.Field(
+        DashboardTiendaType,
+        tienda_id=graphene.ID(required=True),
+        desde=graphene.Date(),
+        hasta=graphene.Date(),
+        umbral_stock=graphene.Int(),
+        description="Resumen de ventas y productos de la tienda (por defecto los últimos 30 días)"
+    )
 
     @requiere_autenticacion(user_types=['usuario'])
     def resolve_mis_tiendas(self, info, **kwargs):
@@ -67,6 +79,23 @@ class QueryTiendasPrivadas(graphene.ObjectType):
     def resolve_tiendas_admin(self, info, **kwargs):
         return Tienda.objects.filter(fecha_eliminacion__isnull=True)
 
+    @requiere_autenticacion(user_types=['usuario'])
+    def resolve_dashboard_tienda(self, info, tienda_id, desde=None, hasta=None, umbral_stock=None, **kwargs):
+        usuario = kwargs["current_user"]
+
+        try:
+            tienda_id = int(tienda_id)
+        except ValueError:
+            raise GraphQLError("Tienda no encontrada")
+
+        if not Tienda.objects.filter(pk=tienda_id, propietario=usuario, fecha_eliminacion__isnull=True).exists():
+            raise GraphQLError("Tienda no encontrada")
+
+        hasta = hasta or timezone.localdate()
+        desde = desde or hasta - timedelta(days=30)
+
+        return DashboardTiendaType(**obtener_dashboard(tienda_id, desde, hasta, umbral_stock))
+
 class TiendasQueries(
     QueryTiendasPublicas,
     QueryTiendasPrivadas,
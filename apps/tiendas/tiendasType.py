@@ -7,3 +7,28 @@ class TiendaType(DjangoObjectType):
         model = Tienda
         fields = "__all__"
         description = "Representa una tienda gestionada por un usuario."
+
+class ProductoStockBajoType(graphene.ObjectType):
+    tienda_producto_id = graphene.ID()
+    nombre = graphene.String()
+    stock = graphene.Int()
+
+class ProductoMasVendidoType(graphene.ObjectType):
+    tienda_producto_id = graphene.ID()
+    nombre = graphene.String()
+    unidades = graphene.Int()
+    ingresos = graphene.Float()
+
+class DashboardTiendaType(graphene.ObjectType):
+    """Resumen del vendedor para una tienda (ver apps/tiendas/dashboard.py)"""
+    pendientes = graphene.Int(description="Ventas pendientes de confirmar")
+    monto_pendiente = graphene.Float(description="Total de las ventas pendientes")
+    ventas_completadas = graphene.Int(description="Ventas confirmadas en el rango")
+    unidades_vendidas = graphene.Int(description="Unidades vendidas en el rango")
+    ingresos = graphene.Float(description="Ingresos de ventas confirmadas en el rango")
+    productos = graphene.Int(description="Productos publicados")
+    sin_stock = graphene.Int()
+    stock_bajo = graphene.Int(description="Productos con stock entre 1 y el umbral")
+    favoritos = graphene.Int(description="Veces que los productos de la tienda están en favoritos")
+    productos_stock_bajo = graphene.List(ProductoStockBajoType)
+    mas_vendidos = graphene.List(ProductoMasVendidoType)
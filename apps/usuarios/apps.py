@@ -1,6 +1,16 @@
+import atexit
+
 from django.apps import AppConfig
+from django.core.signals import request_finished
 
 
 class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.usuarios'
+
+    def ready(self):
+        from .auditoria import buffer_auditoria
+
+        # Vacía la auditoría pendiente al terminar cada petición y al salir
+        request_finished.connect(buffer_auditoria.vaciar, dispatch_uid='vaciar_auditoria')
+        atexit.register(buffer_auditoria.vaciar)
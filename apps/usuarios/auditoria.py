@@ -0,0 +1,89 @@
+"""
+Escritura en lote de los registros de auditoría.
+
+`Auditoria.registrar` y `AuditoriaUsuario.registrar` no insertan de
+inmediato: agregan el registro al buffer del proceso, que se vacía con
+bulk_create al llegar a AUDITORIA_BUFFER_MAX registros, cuando el más
+antiguo supera AUDITORIA_BUFFER_SEGUNDOS, al terminar cada petición
+(después de enviar la respuesta) y al salir del proceso.
+
+Si el bulk_create de un lote falla, sus registros se guardan uno a uno
+para no perder los demás por una fila inválida; los que fallan por un
+error de conexión vuelven al buffer para el siguiente vaciado.
+
+Con AUDITORIA_MODO = 'sincrono' cada registro se guarda en el acto.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+
+logger = logging.getLogger(__name__)
+
+
+class BufferAuditoria:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._registros = []
+        self._desde = None
+
+    def agregar(self, registro):
+        if getattr(settings, 'AUDITORIA_MODO', 'buffer') == 'sincrono':
+            registro.save()
+            return
+
+        with self._lock:
+            if not self._registros:
+                self._desde = time.monotonic()
+            self._registros.append(registro)
+            lleno = (
+                len(self._registros) >= settings.AUDITORIA_BUFFER_MAX or
+                time.monotonic() - self._desde >= settings.AUDITORIA_BUFFER_SEGUNDOS
+            )
+
+        if lleno:
+            self.vaciar()
+
+    def vaciar(self, **kwargs):
+        # **kwargs: también se usa como receptor de la señal request_finished
+        with self._lock:
+            registros, self._registros = self._registros, []
+        if not registros:
+            return
+
+        por_modelo = {}
+        for registro in registros:
+            por_modelo.setdefault(type(registro), []).append(registro)
+
+        reintentar = []
+        for modelo, lote in por_modelo.items():
+            try:
+                modelo.objects.bulk_create(lote, batch_size=500)
+            except Exception:
+                logger.exception("Falló el lote de %s registros de %s; se guardan uno a uno", len(lote), modelo.__name__)
+                reintentar.extend(self._guardar_uno_a_uno(lote))
+
+        if reintentar:
+            with self._lock:
+                if not self._registros:
+                    self._desde = time.monotonic()
+                self._registros[:0] = reintentar
+
+    def _guardar_uno_a_uno(self, lote):
+        """Guarda cada registro de `lote`; retorna los que fallaron por un error de conexión."""
+        pendientes = []
+        for registro in lote:
+            try:
+                registro.save()
+            except (OperationalError, InterfaceError):
+                pendientes.append(registro)
+            except Exception:
+                logger.exception("Se descartó un registro de auditoría inválido: %s", registro.__dict__)
+        if pendientes:
+            logger.warning("%s registros de auditoría vuelven al buffer", len(pendientes))
+        return pendientes
+
+
+buffer_auditoria = BufferAuditoria()
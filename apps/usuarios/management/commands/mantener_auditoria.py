@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.usuarios.particiones import (
+    TABLAS_AUDITORIA, asegurar_particiones, archivar_anteriores, inicio_mes, sumar_meses
+)
+
+
+class Command(BaseCommand):
+    help = "Crea las particiones mensuales de auditoría y archiva las que superan la retención"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meses-adelante', type=int, default=settings.AUDITORIA_MESES_ADELANTE,
+                            help="Meses futuros con partición ya creada")
+        parser.add_argument('--retener-meses', type=int, default=settings.AUDITORIA_RETENCION_MESES,
+                            help="Meses que se conservan en la base de datos (incluye el actual)")
+        parser.add_argument('--directorio', default=settings.AUDITORIA_ARCHIVO_DIRECTORIO,
+                            help="Destino de los .csv.gz archivados")
+        parser.add_argument('--sin-archivar', action='store_true', help="Solo crea particiones")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("El particionado de auditoría requiere PostgreSQL")
+
+        mes_actual = inicio_mes(date.today())
+        hasta = sumar_meses(mes_actual, options['meses_adelante'])
+        limite = sumar_meses(mes_actual, -(options['retener_meses'] - 1))
+
+        for tabla in TABLAS_AUDITORIA:
+            for mes in asegurar_particiones(tabla, hasta):
+                self.stdout.write(f"{tabla}: partición {mes:%Y-%m} creada")
+
+            if options['sin_archivar']:
+                continue
+
+            for ruta in archivar_anteriores(tabla, limite, options['directorio']):
+                self.stdout.write(self.style.SUCCESS(f"{tabla}: archivada en {ruta}"))
@@ -0,0 +1,140 @@
+# Convierte auditoria y auditoria_usuario en tablas particionadas por mes
+# sobre `fecha` (solo PostgreSQL). Ver apps/usuarios/particiones.py.
+
+from datetime import date
+
+from django.db import migrations
+
+TABLAS = {
+    'auditoria': {
+        'columnas': """
+            usuario_tipo varchar(20) NULL,
+            usuario_id integer NULL,
+            usuario_email varchar(255) NULL,
+            accion varchar(200) NOT NULL,
+            descripcion text NOT NULL,
+            fecha timestamp with time zone NOT NULL
+        """,
+        'nombres': 'id, usuario_tipo, usuario_id, usuario_email, accion, descripcion, fecha',
+        'indices': {
+            'auditoria_usuario_f1deb7_idx': '(usuario_tipo, usuario_id)',
+            'auditoria_fecha_b71d64_idx': '(fecha)',
+        },
+    },
+    'auditoria_usuario': {
+        'columnas': """
+            usuario_id integer NULL,
+            usuario_email varchar(255) NULL,
+            es_vendedor boolean NOT NULL,
+            accion varchar(200) NOT NULL,
+            descripcion text NOT NULL,
+            fecha timestamp with time zone NOT NULL
+        """,
+        'nombres': 'id, usuario_id, usuario_email, es_vendedor, accion, descripcion, fecha',
+        'indices': {
+            'auditoria_u_usuario_1dd093_idx': '(usuario_id)',
+            'auditoria_u_fecha_19ebbf_idx': '(fecha)',
+        },
+    },
+}
+
+MESES_ADELANTE = 3
+
+
+def _sumar_meses(mes, cantidad):
+    indice = mes.year * 12 + (mes.month - 1) + cantidad
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def particionar(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for tabla, definicion in TABLAS.items():
+            anterior = f"{tabla}_sin_particion"
+            secuencia = f"{tabla}_particionada_id_seq"
+
+            cursor.execute(f'ALTER TABLE "{tabla}" RENAME TO "{anterior}"')
+            cursor.execute(f'ALTER TABLE "{anterior}" RENAME CONSTRAINT "{tabla}_pkey" TO "{anterior}_pkey"')
+            for indice in definicion['indices']:
+                cursor.execute(f'DROP INDEX IF EXISTS "{indice}"')
+
+            cursor.execute(f'CREATE SEQUENCE "{secuencia}"')
+            cursor.execute(f"""
+                CREATE TABLE "{tabla}" (
+                    id bigint NOT NULL DEFAULT nextval('{secuencia}'),
+                    {definicion['columnas']},
+                    PRIMARY KEY (id, fecha)
+                ) PARTITION BY RANGE (fecha)
+            """)
+            cursor.execute(f'ALTER SEQUENCE "{secuencia}" OWNED BY "{tabla}".id')
+            cursor.execute(f'CREATE TABLE "{tabla}_default" PARTITION OF "{tabla}" DEFAULT')
+
+            # Una partición por cada mes con datos y los próximos meses
+            cursor.execute(f'SELECT MIN(fecha) FROM "{anterior}"')
+            minima = cursor.fetchone()[0]
+            mes_actual = date.today().replace(day=1)
+            mes = date(minima.year, minima.month, 1) if minima else mes_actual
+            ultimo = _sumar_meses(mes_actual, MESES_ADELANTE)
+            while mes <= ultimo:
+                siguiente = _sumar_meses(mes, 1)
+                cursor.execute(
+                    f'CREATE TABLE "{tabla}_p{mes.year:04d}_{mes.month:02d}" PARTITION OF "{tabla}" '
+                    f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{siguiente.isoformat()}')"
+                )
+                mes = siguiente
+
+            cursor.execute(
+                f'INSERT INTO "{tabla}" ({definicion["nombres"]}) '
+                f'SELECT {definicion["nombres"]} FROM "{anterior}"'
+            )
+            cursor.execute(f"""SELECT setval('{secuencia}', COALESCE((SELECT MAX(id) FROM "{tabla}"), 0) + 1, false)""")
+            cursor.execute(f'DROP TABLE "{anterior}"')
+
+            for indice, columnas in definicion['indices'].items():
+                cursor.execute(f'CREATE INDEX "{indice}" ON "{tabla}" {columnas}')
+
+
+def desparticionar(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for tabla, definicion in TABLAS.items():
+            particionada = f"{tabla}_particionada"
+
+            for indice in definicion['indices']:
+                cursor.execute(f'DROP INDEX IF EXISTS "{indice}"')
+            cursor.execute(f'ALTER TABLE "{tabla}" RENAME TO "{particionada}"')
+            cursor.execute(f'ALTER TABLE "{particionada}" RENAME CONSTRAINT "{tabla}_pkey" TO "{particionada}_pkey"')
+
+            cursor.execute(f"""
+                CREATE TABLE "{tabla}" (
+                    id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                    {definicion['columnas']}
+                )
+            """)
+            cursor.execute(
+                f'INSERT INTO "{tabla}" ({definicion["nombres"]}) '
+                f'SELECT {definicion["nombres"]} FROM "{particionada}"'
+            )
+            cursor.execute(
+                f"""SELECT setval(pg_get_serial_sequence('"{tabla}"', 'id'), """
+                f"""COALESCE((SELECT MAX(id) FROM "{tabla}"), 0) + 1, false)"""
+            )
+            cursor.execute(f'DROP TABLE "{particionada}" CASCADE')
+
+            for indice, columnas in definicion['indices'].items():
+                cursor.execute(f'CREATE INDEX "{indice}" ON "{tabla}" {columnas}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0006_alter_auditoria_fecha_alter_auditoriausuario_fecha'),
+    ]
+
+    operations = [
+        migrations.RunPython(particionar, desparticionar),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2025-12-04 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0007_particionar_auditoria'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditoria',
+            name='auditoria_usuario_f1deb7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='auditoriausuario',
+            name='auditoria_u_usuario_1dd093_idx',
+        ),
+        migrations.AddIndex(
+            model_name='auditoria',
+            index=models.Index(fields=['usuario_tipo', 'usuario_id', 'fecha'], name='auditoria_usuario_184387_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditoria',
+            index=models.Index(fields=['accion', 'fecha'], name='auditoria_accion_1059e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditoriausuario',
+            index=models.Index(fields=['usuario_id', 'fecha'], name='auditoria_u_usuario_7888e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditoriausuario',
+            index=models.Index(fields=['accion', 'fecha'], name='auditoria_u_accion_94bf3d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditoriausuario',
+            index=models.Index(fields=['es_vendedor', 'fecha'], name='auditoria_u_es_vend_83d750_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2025-12-05 10:12
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def calcular_no_leidas(apps, schema_editor):
+    Usuario = apps.get_model('usuarios', 'Usuario')
+    Notificacion = apps.get_model('usuarios', 'Notificacion')
+
+    no_leidas = (
+        Notificacion.objects
+        .filter(usuario=OuterRef('pk'), leida=False)
+        .values('usuario')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Usuario.objects.update(
+        notificaciones_no_leidas=Coalesce(Subquery(no_leidas, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0008_indices_paginacion_auditoria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='notificaciones_no_leidas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(fields=['usuario', 'leida', 'fecha_creacion'], name='notificacio_usuario_b97822_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacion',
+            index=models.Index(fields=['usuario', 'fecha_creacion'], name='notificacio_usuario_dc3d02_idx'),
+        ),
+        migrations.RunPython(calcular_no_leidas, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.hashers import make_password, check_password
+from django.utils import timezone
 from core.models import Estado
+from .auditoria import buffer_auditoria
 
 class Usuario(models.Model):
     email = models.EmailField(max_length=255, unique=True)
@@ -15,6 +17,7 @@ class Usuario(models.Model):
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_eliminacion = models.DateTimeField(blank=True, null=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
+    notificaciones_no_leidas = models.PositiveIntegerField(default=0)  # Mantenido por apps/usuarios/notificaciones.py
     
     class Meta:
         db_table = 'usuario'
@@ -93,7 +96,7 @@ class Auditoria(models.Model):
 
     accion = models.CharField(max_length=200)
     descripcion = models.TextField()
-    fecha = models.DateTimeField(auto_now_add=True)
+    fecha = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = 'auditoria'
@@ -101,7 +104,8 @@ class Auditoria(models.Model):
         verbose_name = 'Auditoría'
         verbose_name_plural = 'Auditorías'
         indexes = [
-            models.Index(fields=['usuario_tipo', 'usuario_id']),
+            models.Index(fields=['usuario_tipo', 'usuario_id', 'fecha']),
+            models.Index(fields=['accion', 'fecha']),
             models.Index(fields=['fecha']),
         ]
 
@@ -121,13 +125,14 @@ class Auditoria(models.Model):
             class_name = usuario.__class__.__name__.lower()
             usuario_tipo = 'superadmin' if class_name == 'superadministrador' else class_name
         
-        Auditoria.objects.create(
+        # Se inserta en lote (apps/usuarios/auditoria.py)
+        buffer_auditoria.agregar(Auditoria(
             usuario_tipo=usuario_tipo,
             usuario_id=usuario.id if usuario else None,
             usuario_email=usuario.email if usuario and hasattr(usuario, "email") else None,
             accion=accion,
             descripcion=descripcion
-        )
+        ))
 
     def __str__(self):
         return f"[{self.usuario_tipo}] {self.accion} - {self.fecha}"
@@ -139,7 +144,7 @@ class AuditoriaUsuario(models.Model):
 
     accion = models.CharField(max_length=200)
     descripcion = models.TextField()
-    fecha = models.DateTimeField(auto_now_add=True)
+    fecha = models.DateTimeField(default=timezone.now)
 
     class Meta:
         db_table = 'auditoria_usuario'
@@ -147,7 +152,9 @@ class AuditoriaUsuario(models.Model):
         verbose_name = 'Auditoría de Usuario'
         verbose_name_plural = 'Auditorías de Usuarios'
         indexes = [
-            models.Index(fields=['usuario_id']),
+            models.Index(fields=['usuario_id', 'fecha']),
+            models.Index(fields=['accion', 'fecha']),
+            models.Index(fields=['es_vendedor', 'fecha']),
             models.Index(fields=['fecha']),
         ]
 
@@ -160,13 +167,13 @@ class AuditoriaUsuario(models.Model):
             accion: Acción realizada
             descripcion: Detalle de la acción
         """
-        AuditoriaUsuario.objects.create(
+        buffer_auditoria.agregar(AuditoriaUsuario(
             usuario_id=usuario.id if usuario else None,
             usuario_email=usuario.email if usuario else None,
             es_vendedor=usuario.is_seller if usuario else False,
             accion=accion,
             descripcion=descripcion
-        )
+        ))
 
     def __str__(self):
         return f"[Usuario {'Vendedor' if self.es_vendedor else 'Normal'}] {self.accion} - {self.fecha}"
@@ -191,6 +198,10 @@ class Notificacion(models.Model):
     class Meta:
         db_table = 'notificacion'
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['usuario', 'leida', 'fecha_creacion']),
+            models.Index(fields=['usuario', 'fecha_creacion']),
+        ]
     
     def __str__(self):
         return f"{self.tipo} - {self.usuario.username}"
\ No newline at end of file
@@ -6,6 +6,7 @@ from django.utils import timezone
 from .models import Usuario, Moderador, SuperAdministrador, Notificacion, Auditoria
 from .usuariosType import UsuarioType, ModeradorType, SuperAdministradorType, NotificacionType, AuditoriaType
 from .utils import crear_token, requiere_autenticacion
+from .notificaciones import marcar_leidas, eliminar_notificaciones, filtros_masivos
 from core.models import Estado
 
 # ============= INPUT TYPES =============
@@ -413,13 +414,55 @@ class MarcarNotificacionLeida(graphene.Mutation):
     def mutate(self, info, notificacion_id, **kwargs):
         usuario = kwargs['current_user']
         
-        try:
-            notif = Notificacion.objects.get(pk=notificacion_id, usuario=usuario)
-            notif.leida = True
-            notif.save()
-            return MarcarNotificacionLeida(ok=True)
-        except Notificacion.DoesNotExist:
-            raise GraphQLError("Notificación no encontrada")
+        if not marcar_leidas(usuario.id, pk=notificacion_id):
+            # Ya leída (no cambia el contador) o inexistente
+            if not Notificacion.objects.filter(pk=notificacion_id, usuario=usuario).exists():
+                raise GraphQLError("Notificación no encontrada")
+        return MarcarNotificacionLeida(ok=True)
+
+class MarcarNotificacionesLeidas(graphene.Mutation):
+    """Marca varias notificaciones en una sola sentencia; sin criterios marca todas (ids vacío no marca ninguna)"""
+    class Arguments:
+        ids = graphene.List(graphene.ID)
+        tipo = graphene.String()
+        antes_de = graphene.DateTime()
+    
+    ok = graphene.Boolean()
+    cantidad = graphene.Int()
+    no_leidas = graphene.Int()
+    
+    @requiere_autenticacion(user_types=['usuario'])
+    def mutate(self, info, ids=None, tipo=None, antes_de=None, **kwargs):
+        usuario = kwargs['current_user']
+        
+        cantidad = marcar_leidas(usuario.id, **filtros_masivos(ids, tipo, antes_de))
+        usuario.refresh_from_db(fields=['notificaciones_no_leidas'])
+        
+        return MarcarNotificacionesLeidas(ok=True, cantidad=cantidad, no_leidas=usuario.notificaciones_no_leidas)
+
+class EliminarNotificaciones(graphene.Mutation):
+    """Elimina notificaciones por ids, por tipo y/o anteriores a una fecha"""
+    class Arguments:
+        ids = graphene.List(graphene.ID)
+        tipo = graphene.String()
+        antes_de = graphene.DateTime()
+    
+    ok = graphene.Boolean()
+    cantidad = graphene.Int()
+    no_leidas = graphene.Int()
+    
+    @requiere_autenticacion(user_types=['usuario'])
+    def mutate(self, info, ids=None, tipo=None, antes_de=None, **kwargs):
+        usuario = kwargs['current_user']
+        filtros = filtros_masivos(ids, tipo, antes_de)
+        
+        if not filtros:
+            raise GraphQLError("Indica ids, tipo o antesDe")
+        
+        cantidad = eliminar_notificaciones(usuario.id, **filtros)
+        usuario.refresh_from_db(fields=['notificaciones_no_leidas'])
+        
+        return EliminarNotificaciones(ok=True, cantidad=cantidad, no_leidas=usuario.notificaciones_no_leidas)
         
 # ============= MUTATION CLASS =============
 class UsuariosMutaciones(graphene.ObjectType):
@@ -435,4 +478,6 @@ class UsuariosMutaciones(graphene.ObjectType):
     editar_usuario = EditarUsuario.Field()
     eliminar_usuario = EliminarUsuario.Field()
     marcar_notificacion_leida = MarcarNotificacionLeida.Field()
+    marcar_notificaciones_leidas = MarcarNotificacionesLeidas.Field()
+    eliminar_notificaciones = EliminarNotificaciones.Field()
     cambiar_estado_moderador = CambiarEstadoModerador.Field()
\ No newline at end of file
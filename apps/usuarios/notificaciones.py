@@ -0,0 +1,102 @@
+"""
+Escritura de notificaciones con el contador de no leídas.
+
+Usuario.notificaciones_no_leidas se mantiene en la misma transacción que
+cada alta o cambio de `leida`, así el badge de la app es una lectura del
+usuario autenticado sin contar filas. Todo cambio a Notificacion.leida
+debe pasar por estas funciones.
+
+Cada notificación creada se publica además en el canal del usuario para
+la suscripción `notificacionNueva` (apps/usuarios/suscripcionesUsuarios.py).
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from core.eventos import publicar
+
+from .models import Usuario, Notificacion
+
+
+def canal_notificaciones(usuario_id):
+    return f"notificaciones:{usuario_id}"
+
+
+def _sumar_no_leidas(usuario_id, cantidad):
+    if cantidad:
+        Usuario.objects.filter(pk=usuario_id).update(
+            notificaciones_no_leidas=Greatest(F('notificaciones_no_leidas') + cantidad, 0)
+        )
+
+
+def crear_notificacion(usuario_id, tipo, titulo, mensaje, venta_relacionada_id=None):
+    with transaction.atomic():
+        notificacion = Notificacion.objects.create(
+            usuario_id=usuario_id,
+            tipo=tipo,
+            titulo=titulo,
+            mensaje=mensaje,
+            venta_relacionada_id=venta_relacionada_id
+        )
+        _sumar_no_leidas(usuario_id, 1)
+        
+        no_leidas = Usuario.objects.filter(pk=usuario_id).values_list('notificaciones_no_leidas', flat=True).first()
+        publicar(canal_notificaciones(usuario_id), {
+            'id': notificacion.id,
+            'tipo': tipo,
+            'titulo': titulo,
+            'mensaje': mensaje,
+            'venta_relacionada_id': venta_relacionada_id,
+            'fecha_creacion': notificacion.fecha_creacion,
+            'no_leidas': no_leidas,
+        })
+    return notificacion
+
+
+def marcar_leidas(usuario_id, **filtros):
+    """
+    Marca como leídas las notificaciones no leídas del usuario que cumplan
+    `filtros` (por ejemplo pk=..., pk__in=[...]). Retorna cuántas cambiaron.
+    """
+    with transaction.atomic():
+        cantidad = Notificacion.objects.filter(
+            usuario_id=usuario_id, leida=False, **filtros
+        ).update(leida=True)
+        _sumar_no_leidas(usuario_id, -cantidad)
+    return cantidad
+
+
+def eliminar_notificaciones(usuario_id, **filtros):
+    """
+    Elimina las notificaciones del usuario que cumplan `filtros`. Primero se
+    marcan como leídas (ajustando el contador) y luego se borran solo las
+    leídas, así una notificación creada entre ambas sentencias no se borra
+    sin descontarse. Retorna cuántas se eliminaron.
+    """
+    with transaction.atomic():
+        marcar_leidas(usuario_id, **filtros)
+        cantidad, _ = Notificacion.objects.filter(
+            usuario_id=usuario_id, leida=True, **filtros
+        ).delete()
+    return cantidad
+
+
+def filtros_masivos(ids=None, tipo=None, antes_de=None):
+    """
+    Filtros de las mutaciones masivas; los criterios indicados se combinan.
+    `ids=[]` es un criterio que no selecciona ninguna notificación (no "todas").
+    """
+    filtros = {}
+    if ids is not None:
+        filtros['pk__in'] = ids
+    if tipo:
+        filtros['tipo'] = tipo
+    if antes_de:
+        filtros['fecha_creacion__lt'] = antes_de
+    return filtros
+
+
+def recalcular_no_leidas(usuario_id):
+    """Recalcula el contador desde la tabla (p. ej. tras borrados en cascada)."""
+    total = Notificacion.objects.filter(usuario_id=usuario_id, leida=False).count()
+    Usuario.objects.filter(pk=usuario_id).update(notificaciones_no_leidas=total)
+    return total
@@ -0,0 +1,139 @@
+"""
+Particionado mensual de las tablas de auditoría (solo PostgreSQL).
+
+`auditoria` y `auditoria_usuario` están particionadas por rango sobre
+`fecha`, con una partición por mes (`<tabla>_pAAAA_MM`) y una partición
+DEFAULT para filas fuera de los meses creados.
+
+El comando `manage.py mantener_auditoria` crea las particiones de los
+próximos meses y archiva (COPY a .csv.gz) y elimina las que superan la
+retención configurada.
+"""
+import gzip
+import os
+import re
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+TABLAS_AUDITORIA = ['auditoria', 'auditoria_usuario']
+
+
+def filtrar_ventana(queryset, desde=None, hasta=None):
+    """
+    Acota un queryset de auditoría a [desde, hasta). Sin `desde` se usan los
+    últimos AUDITORIA_VENTANA_DIAS, así las consultas nunca leen todas las
+    particiones.
+    """
+    if desde is None:
+        desde = (hasta or timezone.now()) - timedelta(days=settings.AUDITORIA_VENTANA_DIAS)
+    queryset = queryset.filter(fecha__gte=desde)
+    if hasta is not None:
+        queryset = queryset.filter(fecha__lt=hasta)
+    return queryset
+
+
+def inicio_mes(fecha):
+    return date(fecha.year, fecha.month, 1)
+
+
+def sumar_meses(mes, cantidad):
+    indice = mes.year * 12 + (mes.month - 1) + cantidad
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nombre_particion(tabla, mes):
+    return f"{tabla}_p{mes.year:04d}_{mes.month:02d}"
+
+
+def particiones(tabla):
+    """Meses (date del día 1) con partición propia, en orden."""
+    patron = re.compile(rf"^{tabla}_p(\d{{4}})_(\d{{2}})$")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT hija.relname
+            FROM pg_inherits
+            JOIN pg_class padre ON padre.oid = pg_inherits.inhparent
+            JOIN pg_class hija ON hija.oid = pg_inherits.inhrelid
+            WHERE padre.relname = %s
+            """,
+            [tabla]
+        )
+        nombres = [fila[0] for fila in cursor.fetchall()]
+
+    meses = []
+    for nombre in nombres:
+        coincide = patron.match(nombre)
+        if coincide:
+            meses.append(date(int(coincide.group(1)), int(coincide.group(2)), 1))
+    return sorted(meses)
+
+
+def crear_particion(tabla, mes):
+    """
+    Crea la partición de `mes`. Si la partición DEFAULT ya tiene filas de ese
+    rango, se mueven a la nueva partición antes de adjuntarla.
+    """
+    nombre = nombre_particion(tabla, mes)
+    desde, hasta = mes.isoformat(), sumar_meses(mes, 1).isoformat()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{nombre}" (LIKE "{tabla}" INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH movidas AS (DELETE FROM "{tabla}_default" WHERE fecha >= %s AND fecha < %s RETURNING *) '
+            f'INSERT INTO "{nombre}" SELECT * FROM movidas',
+            [desde, hasta]
+        )
+        cursor.execute(
+            f'ALTER TABLE "{tabla}" ATTACH PARTITION "{nombre}" FOR VALUES FROM (%s) TO (%s)',
+            [desde, hasta]
+        )
+
+
+def asegurar_particiones(tabla, hasta_mes):
+    """Crea las particiones que falten desde el mes actual hasta `hasta_mes` inclusive."""
+    existentes = set(particiones(tabla))
+    mes = inicio_mes(date.today())
+    creadas = []
+
+    while mes <= hasta_mes:
+        if mes not in existentes:
+            crear_particion(tabla, mes)
+            creadas.append(mes)
+        mes = sumar_meses(mes, 1)
+    return creadas
+
+
+def archivar_particion(tabla, mes, directorio):
+    """Separa la partición de `mes`, la exporta a <directorio>/<particion>.csv.gz y la elimina."""
+    nombre = nombre_particion(tabla, mes)
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f"{nombre}.csv.gz")
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{tabla}" DETACH PARTITION "{nombre}"')
+
+        sql = f'COPY "{nombre}" TO STDOUT WITH (FORMAT csv, HEADER true)'
+        with gzip.open(ruta, 'wb') as destino:
+            crudo = cursor.cursor
+            if hasattr(crudo, 'copy'):  # psycopg 3
+                with crudo.copy(sql) as copia:
+                    for bloque in copia:
+                        destino.write(bloque)
+            else:  # psycopg2
+                crudo.copy_expert(sql, destino)
+
+        cursor.execute(f'DROP TABLE "{nombre}"')
+    return ruta
+
+
+def archivar_anteriores(tabla, antes_de, directorio):
+    """Archiva todas las particiones de meses anteriores a `antes_de`."""
+    return [
+        archivar_particion(tabla, mes, directorio)
+        for mes in particiones(tabla)
+        if mes < antes_de
+    ]
@@ -1,10 +1,18 @@
 # apps/usuarios/queries.py
+from datetime import timedelta
+
 import graphene
 from graphql import GraphQLError
+from django.db.models import Count, Q
+from django.utils import timezone
 from .usuariosType import UsuarioType, ModeradorType, SuperAdministradorType, AuditoriaType, NotificacionType, EstadisticasModeradoresType, AuditoriaUsuarioType
+from .usuariosType import AuditoriaPaginaType, AuditoriaUsuarioPaginaType, NotificacionPaginaType
 from .models import Usuario, Moderador, SuperAdministrador, Auditoria, Notificacion, AuditoriaUsuario
 from .utils import requiere_autenticacion
+from .particiones import filtrar_ventana
 from core.models import Estado
+from core.paginacion import paginar
+from core.estadisticas import snapshot
 
 class UsuariosQueries(graphene.ObjectType):
     # ============= QUERIES PÚBLICAS (sin autenticación) =============
@@ -40,6 +48,7 @@ class UsuariosQueries(graphene.ObjectType):
     # ============= QUERIES AUTENTICADAS - SUPERADMIN =============
     todos_moderadores = graphene.List(
         ModeradorType,
+        solo_activos=graphene.Boolean(default_value=True),
         description="Lista todos los moderadores (requiere superadmin)"
     )
     moderador_por_id = graphene.Field(
@@ -60,11 +69,51 @@ class UsuariosQueries(graphene.ObjectType):
         'apps.usuarios.usuariosType.EstadisticasModeradoresType',
         description="Obtiene estadísticas generales de moderadores")
     # ============ AUDITORÍA (SUPERADMIN) =============
-    auditoria = graphene.List(AuditoriaType)
-    auditoria_usuarios = graphene.List(AuditoriaUsuarioType)
+    auditoria = graphene.List(
+        AuditoriaType,
+        desde=graphene.DateTime(),
+        hasta=graphene.DateTime(),
+        description="Auditoría de moderadores entre `desde` y `hasta` (por defecto los últimos días configurados)"
+    )
+    auditoria_usuarios = graphene.List(
+        AuditoriaUsuarioType,
+        desde=graphene.DateTime(),
+        hasta=graphene.DateTime(),
+        description="Auditoría de usuarios entre `desde` y `hasta` (por defecto los últimos días configurados)"
+    )
+    auditoria_paginada = graphene.Field(
+        AuditoriaPaginaType,
+        cursor=graphene.String(),
+        limite=graphene.Int(),
+        usuario_tipo=graphene.String(default_value='moderador'),
+        usuario_id=graphene.ID(),
+        accion=graphene.String(),
+        desde=graphene.DateTime(),
+        hasta=graphene.DateTime(),
+        description="Auditoría de moderadores/superadmin paginada por cursor, con filtros"
+    )
+    auditoria_usuarios_paginada = graphene.Field(
+        AuditoriaUsuarioPaginaType,
+        cursor=graphene.String(),
+        limite=graphene.Int(),
+        usuario_id=graphene.ID(),
+        es_vendedor=graphene.Boolean(),
+        accion=graphene.String(),
+        desde=graphene.DateTime(),
+        hasta=graphene.DateTime(),
+        description="Auditoría de usuarios paginada por cursor, con filtros"
+    )
     
     # ============ NOTIFICACIONES =============
     mis_notificaciones = graphene.List(NotificacionType, solo_no_leidas=graphene.Boolean(default_value=False))
+    mis_notificaciones_paginadas = graphene.Field(
+        NotificacionPaginaType,
+        cursor=graphene.String(),
+        limite=graphene.Int(),
+        solo_no_leidas=graphene.Boolean(default_value=False),
+        description="Notificaciones del usuario paginadas por cursor, más recientes primero"
+    )
+    notificaciones_no_leidas = graphene.Int(description="Contador para el badge; no consulta la tabla de notificaciones")
     
     # ============================================================
     # RESOLVERS - QUERIES PÚBLICAS
@@ -164,13 +213,49 @@ class UsuariosQueries(graphene.ObjectType):
             raise GraphQLError("Moderador no encontrado")
     
     # Registro de auditoría
+    # Siempre se filtra por rango de `fecha` para que PostgreSQL solo lea
+    # las particiones mensuales de esa ventana (ver particiones.py)
     @requiere_autenticacion(user_types=['superadmin'])
-    def resolve_auditoria(self, info, **kwargs):
-        return Auditoria.objects.filter(usuario_tipo='moderador').order_by('-fecha')
+    def resolve_auditoria(self, info, desde=None, hasta=None, **kwargs):
+        return filtrar_ventana(
+            Auditoria.objects.filter(usuario_tipo='moderador'), desde, hasta
+        ).order_by('-fecha')
     
     @requiere_autenticacion(user_types=['superadmin', 'moderador'])
-    def resolve_auditoria_usuarios(self, info, **kwargs):
-        return AuditoriaUsuario.objects.all().order_by('-fecha')
+    def resolve_auditoria_usuarios(self, info, desde=None, hasta=None, **kwargs):
+        return filtrar_ventana(AuditoriaUsuario.objects.all(), desde, hasta).order_by('-fecha')
+    
+    # Cada combinación de filtros tiene un índice (..., fecha): ver Auditoria.Meta
+    @requiere_autenticacion(user_types=['superadmin'])
+    def resolve_auditoria_paginada(self, info, cursor=None, limite=None, usuario_tipo='moderador',
+                                   usuario_id=None, accion=None, desde=None, hasta=None, **kwargs):
+        queryset = Auditoria.objects.all()
+        
+        if usuario_tipo:
+            queryset = queryset.filter(usuario_tipo=usuario_tipo)
+        if usuario_id:
+            queryset = queryset.filter(usuario_id=usuario_id)
+        if accion:
+            queryset = queryset.filter(accion=accion)
+        
+        items, siguiente, tiene_mas = paginar(filtrar_ventana(queryset, desde, hasta), cursor, limite)
+        return AuditoriaPaginaType(items=items, siguiente_cursor=siguiente, tiene_mas=tiene_mas)
+    
+    @requiere_autenticacion(user_types=['superadmin', 'moderador'])
+    def resolve_auditoria_usuarios_paginada(self, info, cursor=None, limite=None, usuario_id=None,
+                                            es_vendedor=None, accion=None, desde=None, hasta=None, **kwargs):
+        queryset = AuditoriaUsuario.objects.all()
+        
+        if usuario_id:
+            queryset = queryset.filter(usuario_id=usuario_id)
+        if es_vendedor is not None:
+            queryset = queryset.filter(es_vendedor=es_vendedor)
+        if accion:
+            queryset = queryset.filter(accion=accion)
+        
+        items, siguiente, tiene_mas = paginar(filtrar_ventana(queryset, desde, hasta), cursor, limite)
+        return AuditoriaUsuarioPaginaType(items=items, siguiente_cursor=siguiente, tiene_mas=tiene_mas)
+    
     # ============================================================
     # RESOLVERS - ESTADÍSTICAS
     # ============================================================
@@ -180,69 +265,31 @@ class UsuariosQueries(graphene.ObjectType):
         """Retorna estadísticas generales de usuarios"""
         from .usuariosType import EstadisticasUsuariosType
         
-        total_usuarios = Usuario.objects.count()
-        usuarios_activos = Usuario.objects.filter(
-            fecha_eliminacion__isnull=True,
-            estado__nombre=Estado.ACTIVO
-        ).count()
-        usuarios_inactivos = Usuario.objects.filter(
-            estado__nombre=Estado.INACTIVO
-        ).count()
-        vendedores = Usuario.objects.filter(
-            is_seller=True,
-            fecha_eliminacion__isnull=True
-        ).count()
-        
-        # Usuarios registrados en los últimos 30 días
-        from django.utils import timezone
-        from datetime import timedelta
-        hace_30_dias = timezone.now() - timedelta(days=30)
-        nuevos_usuarios = Usuario.objects.filter(
-            fecha_creacion__gte=hace_30_dias
-        ).count()
+        def calcular():
+            hace_30_dias = timezone.now() - timedelta(days=30)
+            return Usuario.objects.aggregate(
+                total=Count('id'),
+                activos=Count('id', filter=Q(fecha_eliminacion__isnull=True, estado__nombre=Estado.ACTIVO)),
+                inactivos=Count('id', filter=Q(estado__nombre=Estado.INACTIVO)),
+                vendedores=Count('id', filter=Q(is_seller=True, fecha_eliminacion__isnull=True)),
+                nuevos_ultimos_30_dias=Count('id', filter=Q(fecha_creacion__gte=hace_30_dias))
+            )
         
-        return EstadisticasUsuariosType(
-            total=total_usuarios,
-            activos=usuarios_activos,
-            inactivos=usuarios_inactivos,
-            vendedores=vendedores,
-            nuevos_ultimos_30_dias=nuevos_usuarios
-        )
+        return EstadisticasUsuariosType(**snapshot('estadisticas_usuarios', calcular))
      
-    @requiere_autenticacion(user_types=['superadmin'])
-    def resolve_todos_moderadores(self, info, **kwargs):
-        """Lista todos los moderadores (solo superadmin)"""
-        return Moderador.objects.filter(
-            fecha_eliminacion__isnull=True
-        ).select_related('estado').order_by('-fecha_creacion')    
-        
     @requiere_autenticacion(user_types=['superadmin'])
     def resolve_estadisticas_moderadores(self, info, **kwargs):
         """Retorna estadísticas de moderadores"""
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        total = Moderador.objects.count()
-        activos = Moderador.objects.filter(
-            fecha_eliminacion__isnull=True,
-            estado__nombre=Estado.ACTIVO
-        ).count()
-        inactivos = Moderador.objects.filter(
-            estado__nombre=Estado.INACTIVO
-        ).count()
-        
-        # Moderadores creados en los últimos 30 días
-        hace_30_dias = timezone.now() - timedelta(days=30)
-        nuevos = Moderador.objects.filter(
-            fecha_creacion__gte=hace_30_dias
-        ).count()
+        def calcular():
+            hace_30_dias = timezone.now() - timedelta(days=30)
+            return Moderador.objects.aggregate(
+                total=Count('id'),
+                activos=Count('id', filter=Q(fecha_eliminacion__isnull=True, estado__nombre=Estado.ACTIVO)),
+                inactivos=Count('id', filter=Q(estado__nombre=Estado.INACTIVO)),
+                nuevos_ultimos_30_dias=Count('id', filter=Q(fecha_creacion__gte=hace_30_dias))
+            )
         
-        return {
-            'total': total,
-            'activos': activos,
-            'inactivos': inactivos,
-            'nuevosUltimos30Dias': nuevos
-        }
+        return snapshot('estadisticas_moderadores', calcular)
         
     # ============================================================
     # RESOLVERS - NOTIFICACIONES
@@ -255,4 +302,26 @@ class UsuariosQueries(graphene.ObjectType):
         if solo_no_leidas:
             queryset = queryset.filter(leida=False)
         
-        return queryset
\ No newline at end of file
+        return queryset
+    
+    # Índices (usuario, leida, fecha_creacion) y (usuario, fecha_creacion): ver Notificacion.Meta
+    @requiere_autenticacion(user_types=['usuario'])
+    def resolve_mis_notificaciones_paginadas(self, info, cursor=None, limite=None, solo_no_leidas=False, **kwargs):
+        usuario = kwargs['current_user']
+        queryset = Notificacion.objects.filter(usuario=usuario)
+        
+        if solo_no_leidas:
+            queryset = queryset.filter(leida=False)
+        
+        items, siguiente, tiene_mas = paginar(queryset, cursor, limite, campo='fecha_creacion')
+        return NotificacionPaginaType(
+            items=items,
+            siguiente_cursor=siguiente,
+            tiene_mas=tiene_mas,
+            no_leidas=usuario.notificaciones_no_leidas
+        )
+    
+    @requiere_autenticacion(user_types=['usuario'])
+    def resolve_notificaciones_no_leidas(self, info, **kwargs):
+        # El usuario ya viene cargado por el decorador
+        return kwargs['current_user'].notificaciones_no_leidas
\ No newline at end of file
@@ -1,9 +1,13 @@
 import graphene
 from .queriesUsuarios import UsuariosQueries
 from .mutacionesUsuario import UsuariosMutaciones
+from .suscripcionesUsuarios import UsuariosSuscripciones
 
 class Query(UsuariosQueries):
     pass
 
 class Mutation(UsuariosMutaciones):
+    pass
+
+class Subscription(UsuariosSuscripciones):
     pass
\ No newline at end of file
@@ -0,0 +1,26 @@
+import graphene
+from asgiref.sync import sync_to_async
+from graphql import GraphQLError
+from .usuariosType import NotificacionEventoType
+from .utils import obtener_usuario_desde_contexto
+from .notificaciones import canal_notificaciones
+from core.eventos import bus_eventos, asegurar_escucha
+
+
+class UsuariosSuscripciones(graphene.ObjectType):
+    notificacion_nueva = graphene.Field(
+        NotificacionEventoType,
+        description="Emite cada notificación creada para el usuario autenticado"
+    )
+    
+    async def subscribe_notificacion_nueva(root, info):
+        usuario, user_type = await sync_to_async(obtener_usuario_desde_contexto)(info)
+        
+        if not usuario:
+            raise GraphQLError("No autenticado. Token inválido o expirado.")
+        if user_type != 'usuario':
+            raise GraphQLError("Acceso denegado. Se requiere: usuario")
+        
+        asegurar_escucha()
+        async for datos in bus_eventos.suscribir(canal_notificaciones(usuario.id)):
+            yield datos
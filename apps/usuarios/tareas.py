@@ -0,0 +1,13 @@
+from core.cola import tarea
+from . import notificaciones
+
+
+@tarea('crear_notificacion')
+def crear_notificacion(usuario_id, tipo, titulo, mensaje, venta_relacionada_id=None):
+    notificaciones.crear_notificacion(
+        usuario_id=usuario_id,
+        tipo=tipo,
+        titulo=titulo,
+        mensaje=mensaje,
+        venta_relacionada_id=venta_relacionada_id
+    )
@@ -1,4 +1,5 @@
 import graphene
+from django.utils.dateparse import parse_datetime
 from graphene_django import DjangoObjectType
 from .models import Usuario, Moderador, SuperAdministrador, Auditoria, Notificacion, AuditoriaUsuario
 
@@ -46,10 +47,43 @@ class AuditoriaUsuarioType(DjangoObjectType):
         fields = "__all__"
         description = "Representa un registro de auditoría de acciones realizadas por usuarios normales o vendedores."        
         
+class AuditoriaPaginaType(graphene.ObjectType):
+    """Página de auditoría de moderadores/superadmin (paginación por cursor)"""
+    items = graphene.List(AuditoriaType)
+    siguiente_cursor = graphene.String(description="Pasar como `cursor` para obtener la página siguiente")
+    tiene_mas = graphene.Boolean()
+
+class AuditoriaUsuarioPaginaType(graphene.ObjectType):
+    """Página de auditoría de usuarios (paginación por cursor)"""
+    items = graphene.List(AuditoriaUsuarioType)
+    siguiente_cursor = graphene.String(description="Pasar como `cursor` para obtener la página siguiente")
+    tiene_mas = graphene.Boolean()
+        
 class NotificacionType(DjangoObjectType):
     class Meta:
         model = Notificacion
         fields = "__all__"
+
+class NotificacionEventoType(graphene.ObjectType):
+    """Notificación enviada por la suscripción notificacionNueva"""
+    id = graphene.ID()
+    tipo = graphene.String()
+    titulo = graphene.String()
+    mensaje = graphene.String()
+    venta_relacionada_id = graphene.ID()
+    fecha_creacion = graphene.DateTime()
+    no_leidas = graphene.Int(description="Notificaciones no leídas del usuario tras esta")
+    
+    def resolve_fecha_creacion(root, info):
+        # Los eventos llegan serializados a JSON (ver core/eventos.py)
+        return parse_datetime(root['fecha_creacion'])
+
+class NotificacionPaginaType(graphene.ObjectType):
+    """Página de notificaciones (paginación por cursor)"""
+    items = graphene.List(NotificacionType)
+    siguiente_cursor = graphene.String(description="Pasar como `cursor` para obtener la página siguiente")
+    tiene_mas = graphene.Boolean()
+    no_leidas = graphene.Int(description="Total de notificaciones no leídas del usuario")
         
 class EstadisticasModeradoresType(graphene.ObjectType):
     total = graphene.Int()
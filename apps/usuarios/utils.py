@@ -30,18 +30,21 @@ def decodificar_token(token):
     except jwt.InvalidTokenError:
         return None  # Si el token es inválido
 
-def obtener_usuario_desde_contexto(info):
-    request = info.context
-    auth_header = request.headers.get('Authorization', '')
+def payload_desde_contexto(info):
+    # Payload del token de la petición (sin consultar la base), o None
+    auth_header = info.context.headers.get('Authorization', '')
 
     if auth_header.startswith('Bearer '):
         token = auth_header.replace('Bearer ', '')
     elif auth_header.startswith('JWT '):
         token = auth_header.replace('JWT ', '')
     else:
-        return None, None
+        return None
 
-    payload = decodificar_token(token)
+    return decodificar_token(token)
+
+def obtener_usuario_desde_contexto(info):
+    payload = payload_desde_contexto(info)
     if not payload:
         return None, None
 
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.productos.models import TiendaProducto
+from apps.ventas.reservas import reservar, reservar_con_bloqueo
+
+MODOS = ['condicional', 'bloqueo', 'ingenuo']
+
+
+def reservar_ingenuo(tienda_producto_id, cantidad):
+    """Lectura-modificación-escritura como hacía ResponderVenta (pierde actualizaciones)."""
+    tp = TiendaProducto.objects.get(pk=tienda_producto_id)
+    if tp.stock < cantidad:
+        return False
+    tp.stock -= cantidad
+    tp.save(update_fields=['stock'])
+    return True
+
+
+class Command(BaseCommand):
+    help = "Compradores concurrentes reservando el mismo producto: verifica que no se sobrevenda y mide el rendimiento"
+
+    def add_arguments(self, parser):
+        parser.add_argument('tienda_producto_id', type=int, help="Producto usado en la prueba (se restaura al terminar)")
+        parser.add_argument('--compradores', type=int, default=100, help="Hilos comprando a la vez")
+        parser.add_argument('--stock', type=int, default=10, help="Stock inicial para cada modo")
+        parser.add_argument('--cantidad', type=int, default=1, help="Unidades por compra")
+        parser.add_argument('--modo', choices=MODOS, action='append',
+                            help="Modo a probar (repetible); por defecto todos")
+
+    def handle(self, *args, **options):
+        try:
+            tp = TiendaProducto.objects.get(pk=options['tienda_producto_id'])
+        except TiendaProducto.DoesNotExist:
+            raise CommandError("Producto no encontrado")
+
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING("SQLite serializa las escrituras: los resultados no representan PostgreSQL"))
+
+        original = {'stock': tp.stock, 'estado_id': tp.estado_id}
+        funciones = {'condicional': reservar, 'bloqueo': reservar_con_bloqueo, 'ingenuo': reservar_ingenuo}
+
+        try:
+            for modo in options['modo'] or MODOS:
+                TiendaProducto.objects.filter(pk=tp.pk).update(stock=options['stock'])
+                resultado = self.ejecutar(funciones[modo], tp.pk, options['compradores'], options['cantidad'])
+                self.reportar(modo, tp.pk, options['stock'], options['cantidad'], resultado)
+        finally:
+            TiendaProducto.objects.filter(pk=tp.pk).update(**original)
+
+    def ejecutar(self, funcion, tienda_producto_id, compradores, cantidad):
+        barrera = threading.Barrier(compradores)
+        exitos = []
+        errores = []
+        lock = threading.Lock()
+
+        def comprador():
+            try:
+                barrera.wait()
+                ok = funcion(tienda_producto_id, cantidad)
+                with lock:
+                    exitos.append(ok)
+            except Exception as e:
+                with lock:
+                    errores.append(e)
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=comprador) for _ in range(compradores)]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        return {
+            'reservas': sum(exitos),
+            'rechazos': len(exitos) - sum(exitos),
+            'errores': len(errores),
+            'segundos': time.perf_counter() - inicio,
+        }
+
+    def reportar(self, modo, tienda_producto_id, stock_inicial, cantidad, r):
+        stock_final = TiendaProducto.objects.get(pk=tienda_producto_id).stock
+        vendidas = r['reservas'] * cantidad
+        # Correcto: cada unidad reservada salió del stock y el stock no es negativo
+        correcto = stock_final == stock_inicial - vendidas and stock_final >= 0
+        intentos = r['reservas'] + r['rechazos'] + r['errores']
+
+        estilo = self.style.SUCCESS if correcto else self.style.ERROR
+        self.stdout.write(estilo(
+            f"{modo:<12} reservas={r['reservas']:<4} rechazos={r['rechazos']:<4} errores={r['errores']:<3} "
+            f"stock_final={stock_final:<4} esperado={stock_inicial - vendidas:<4} "
+            f"{intentos / r['segundos']:.0f} compras/s {'OK' if correcto else 'INCONSISTENTE'}"
+        ))
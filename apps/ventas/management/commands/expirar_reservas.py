@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.ventas.reservas import expirar_reservas
+from core.cola import encolar
+
+
+class Command(BaseCommand):
+    help = "Cancela las ventas pendientes que superan el tiempo de reserva y devuelve su stock"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horas', type=int, default=settings.VENTAS_RESERVA_HORAS,
+                            help="Antigüedad máxima de una venta pendiente")
+        parser.add_argument('--lote', type=int, default=100, help="Ventas canceladas por transacción")
+        parser.add_argument('--intervalo', type=float, default=300, help="Segundos entre barridos")
+        parser.add_argument('--una-vez', action='store_true', help="Hace un barrido y termina")
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                close_old_connections()
+                canceladas = expirar_reservas(horas=options['horas'], lote=options['lote'])
+
+                for venta_id, usuario_id in canceladas:
+                    encolar(
+                        'crear_notificacion',
+                        usuario_id=usuario_id,
+                        tipo='venta_rechazada',
+                        titulo='Reserva expirada',
+                        mensaje=f'Tu compra #{venta_id} se canceló porque el vendedor no la confirmó a tiempo.',
+                        venta_relacionada_id=venta_id
+                    )
+
+                if canceladas:
+                    self.stdout.write(self.style.SUCCESS(f"{len(canceladas)} venta(s) expirada(s) canceladas"))
+
+                if options['una_vez']:
+                    break
+                time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write("Barredor detenido")
@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ventas.resumen import recalcular
+
+
+def _fecha(valor):
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {valor} (usar AAAA-MM-DD)")
+
+
+class Command(BaseCommand):
+    help = "Reconstruye los resúmenes diarios de ventas desde las ventas completadas"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help="Primer día a recalcular (AAAA-MM-DD); por defecto todo el historial")
+        parser.add_argument('--hasta', help="Último día a recalcular (AAAA-MM-DD)")
+
+    def handle(self, *args, **options):
+        desde = _fecha(options['desde']) if options['desde'] else None
+        hasta = _fecha(options['hasta']) if options['hasta'] else None
+
+        tiendas, productos = recalcular(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(
+            f"Resúmenes recalculados: {tiendas} fila(s) por tienda, {productos} por producto"
+        ))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2025-12-06 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventas', '0002_venta_comprobante'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['estado', 'fecha_creacion'], name='venta_estado__02df44_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2025-12-07 09:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0004_imagenproducto_variantes'),
+        ('tiendas', '0003_alter_tienda_codigo_qr_alter_tienda_foto_perfil'),
+        ('ventas', '0003_venta_estado_fecha_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VentaDiariaTienda',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('ventas', models.PositiveIntegerField(default=0)),
+                ('unidades', models.PositiveIntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('tienda', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ventas_diarias', to='tiendas.tienda')),
+            ],
+            options={
+                'verbose_name': 'Venta Diaria por Tienda',
+                'verbose_name_plural': 'Ventas Diarias por Tienda',
+                'db_table': 'venta_diaria_tienda',
+                'unique_together': {('tienda', 'fecha')},
+            },
+        ),
+        migrations.CreateModel(
+            name='VentaDiariaProducto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField()),
+                ('unidades', models.PositiveIntegerField(default=0)),
+                ('ingresos', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('tienda', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ventas_diarias_producto', to='tiendas.tienda')),
+                ('tienda_producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ventas_diarias', to='productos.tiendaproducto')),
+            ],
+            options={
+                'verbose_name': 'Venta Diaria por Producto',
+                'verbose_name_plural': 'Ventas Diarias por Producto',
+                'db_table': 'venta_diaria_producto',
+                'indexes': [models.Index(fields=['tienda', 'fecha'], name='venta_diari_tienda__718987_idx')],
+                'unique_together': {('tienda_producto', 'fecha')},
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2025-12-12 10:30
+
+from django.db import migrations, models, transaction
+from django.db.models import F, Sum
+
+
+def reservar_pendientes(apps, schema_editor):
+    """
+    Las ventas pendientes creadas antes de la reserva de stock nunca lo
+    descontaron. Se reservan ahora, en orden de llegada y con el mismo UPDATE
+    condicional de apps/ventas/reservas.py; las que no alcanzan stock quedan
+    con stock_reservado=False para que rechazarlas o cancelarlas no devuelva
+    unidades.
+    """
+    Venta = apps.get_model('ventas', 'Venta')
+    VentaProducto = apps.get_model('ventas', 'VentaProducto')
+    TiendaProducto = apps.get_model('productos', 'TiendaProducto')
+    Estado = apps.get_model('core', 'Estado')
+
+    pendientes = Venta.objects.filter(
+        estado__nombre='pendiente', fecha_eliminacion__isnull=True
+    ).order_by('fecha_creacion', 'id').values_list('id', flat=True)
+
+    tocados = set()
+    sin_reserva = []
+    for venta_id in pendientes.iterator():
+        lineas = list(
+            VentaProducto.objects.filter(venta_id=venta_id)
+            .values('tienda_producto_id')
+            .annotate(total=Sum('cantidad'))
+            .values_list('tienda_producto_id', 'total')
+        )
+        try:
+            with transaction.atomic():
+                for tp_id, cantidad in lineas:
+                    reservado = TiendaProducto.objects.filter(
+                        pk=tp_id, fecha_eliminacion__isnull=True, stock__gte=cantidad
+                    ).update(stock=F('stock') - cantidad)
+                    if not reservado:
+                        raise ValueError(venta_id)
+        except ValueError:
+            sin_reserva.append(venta_id)
+        else:
+            tocados.update(tp_id for tp_id, _ in lineas)
+
+    Venta.objects.filter(pk__in=sin_reserva).update(stock_reservado=False)
+
+    # Mismo estado que deja `reservar`
+    estados = dict(Estado.objects.filter(nombre__in=['reservado', 'disponible']).values_list('nombre', 'id'))
+    if tocados and len(estados) == 2:
+        TiendaProducto.objects.filter(pk__in=tocados, stock=0).update(estado_id=estados['reservado'])
+        TiendaProducto.objects.filter(pk__in=tocados, stock__gt=0).update(estado_id=estados['disponible'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_crear_estados_iniciales'),
+        ('productos', '0007_recomendacionproducto'),
+        ('ventas', '0004_ventadiariatienda_ventadiariaproducto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venta',
+            name='stock_reservado',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(reservar_pendientes, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,9 @@ class Venta(models.Model):
     total = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     comprobante = models.URLField(max_length=500, blank=True, null=True)
     estado = models.ForeignKey(Estado, on_delete=models.PROTECT, related_name='ventas')
+    # False: venta pendiente anterior a las reservas cuyo stock no alcanzó a reservarse
+    # (migración 0005); cerrarla no devuelve unidades que nunca se descontaron
+    stock_reservado = models.BooleanField(default=True)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
     fecha_eliminacion = models.DateTimeField(blank=True, null=True)
     fecha_modificacion = models.DateTimeField(auto_now=True)
@@ -23,6 +26,7 @@ class Venta(models.Model):
             models.Index(fields=['usuario']),
             models.Index(fields=['tienda']),
             models.Index(fields=['fecha_creacion']),
+            models.Index(fields=['estado', 'fecha_creacion']),
         ]
     
     def __str__(self):
@@ -54,4 +58,41 @@ class VentaProducto(models.Model):
     
     def __str__(self):
         return f"{self.cantidad}x {self.tienda_producto.producto.nombre} (Venta #{self.venta.id})"
-    
\ No newline at end of file
+    
+
+class VentaDiariaTienda(models.Model):
+    """Resumen diario de ventas completadas por tienda (ver apps/ventas/resumen.py)"""
+    tienda = models.ForeignKey(Tienda, on_delete=models.CASCADE, related_name='ventas_diarias')
+    fecha = models.DateField()
+    ventas = models.PositiveIntegerField(default=0)
+    unidades = models.PositiveIntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    
+    class Meta:
+        db_table = 'venta_diaria_tienda'
+        verbose_name = 'Venta Diaria por Tienda'
+        verbose_name_plural = 'Ventas Diarias por Tienda'
+        unique_together = [['tienda', 'fecha']]
+    
+    def __str__(self):
+        return f"{self.tienda.nombre} {self.fecha}: {self.ingresos}"
+
+class VentaDiariaProducto(models.Model):
+    """Resumen diario de unidades e ingresos por producto de tienda"""
+    tienda_producto = models.ForeignKey(TiendaProducto, on_delete=models.CASCADE, related_name='ventas_diarias')
+    tienda = models.ForeignKey(Tienda, on_delete=models.CASCADE, related_name='ventas_diarias_producto')
+    fecha = models.DateField()
+    unidades = models.PositiveIntegerField(default=0)
+    ingresos = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    
+    class Meta:
+        db_table = 'venta_diaria_producto'
+        verbose_name = 'Venta Diaria por Producto'
+        verbose_name_plural = 'Ventas Diarias por Producto'
+        unique_together = [['tienda_producto', 'fecha']]
+        indexes = [
+            models.Index(fields=['tienda', 'fecha']),
+        ]
+    
+    def __str__(self):
+        return f"{self.tienda_producto} {self.fecha}: {self.unidades}"
@@ -1,13 +1,19 @@
+from collections import defaultdict
+
 import graphene
-import cloudinary.uploader
 from graphql import GraphQLError
+from django.db import transaction
 from django.utils import timezone
 from .models import Venta, VentaProducto
+from .reservas import reservar, cerrar_venta
 from apps.productos.models import TiendaProducto
-from apps.usuarios.models import Usuario, Notificacion
+from apps.usuarios.models import Usuario
 from apps.usuarios.utils import requiere_autenticacion
 from core.models import Estado
 from core.graphql_scalars import Upload
+from core.cola import encolar
+from core.archivos import subir_en_segundo_plano
+from apps.tiendas.dashboard import invalidar_dashboard
 
 # ============= CREAR VENTA CON COMPROBANTE =============
 
@@ -36,51 +42,49 @@ class CrearVenta(graphene.Mutation):
         except TiendaProducto.DoesNotExist:
             raise GraphQLError("Producto no encontrado")
         
-        # Verificar stock
-
-
-        
-        # Subir comprobante a Cloudinary
-        resultado = cloudinary.uploader.upload(
-            comprobante,
-            folder="comprobantes/"
-        )
+        if input.cantidad < 1:
+            raise GraphQLError("La cantidad debe ser mayor a 0")
         
         # Calcular total
         precio_unitario = tp.precio
         subtotal = precio_unitario * input.cantidad
         
-        # Crear venta con estado "pendiente"
-        venta = Venta.objects.create(
-            usuario=usuario,
-            tienda=tp.tienda,
-            total=subtotal,
-            comprobante=resultado['secure_url'],
-            estado=Estado.get_pendiente()
-        )
-        
-        # Crear detalle
-        VentaProducto.objects.create(
-            venta=venta,
-            tienda_producto=tp,
-            cantidad=input.cantidad,
-            precio_unitario=precio_unitario,
-            subtotal=subtotal,
-            estado=Estado.get_pendiente()
-        )
+        with transaction.atomic():
+            # Verificar y reservar stock en una sola sentencia (ver reservas.py)
+            if not reservar(tp.id, input.cantidad):
+                raise GraphQLError("Stock insuficiente")
+            invalidar_dashboard(tp.tienda_id)
+            
+            # Crear venta con estado "pendiente"
+            venta = Venta.objects.create(
+                usuario=usuario,
+                tienda=tp.tienda,
+                total=subtotal,
+                estado=Estado.get_pendiente()
+            )
+            
+            # Crear detalle
+            VentaProducto.objects.create(
+                venta=venta,
+                tienda_producto=tp,
+                cantidad=input.cantidad,
+                precio_unitario=precio_unitario,
+                subtotal=subtotal,
+                estado=Estado.get_pendiente()
+            )
+            
+            # ✅ CREAR NOTIFICACIÓN PARA EL VENDEDOR
+            encolar(
+                'crear_notificacion',
+                usuario_id=tp.tienda.propietario_id,
+                tipo='venta_pendiente',
+                titulo='Nueva venta pendiente',
+                mensaje=f'{usuario.username} ha comprado {tp.producto.nombre}. Verifica el comprobante.',
+                venta_relacionada_id=venta.id
+            )
         
-        # Cambiar estado del producto a "reservado"
-        tp.estado = Estado.get_reservado()
-        tp.save()
-        
-        # ✅ CREAR NOTIFICACIÓN PARA EL VENDEDOR
-        Notificacion.objects.create(
-            usuario=tp.tienda.propietario,
-            tipo='venta_pendiente',
-            titulo='Nueva venta pendiente',
-            mensaje=f'{usuario.username} ha comprado {tp.producto.nombre}. Verifica el comprobante.',
-            venta_relacionada=venta
-        )
+        # Subir comprobante a Cloudinary (en segundo plano)
+        subir_en_segundo_plano(venta, 'comprobante', comprobante, "comprobantes/")
         
         return CrearVenta(
             venta=venta,
@@ -88,6 +92,106 @@ class CrearVenta(graphene.Mutation):
         )
 
 
+# ============= CHECKOUT DE CARRITO =============
+
+class CrearVentaCarrito(graphene.Mutation):
+    """Compra varios productos con un solo comprobante: se crea una venta por tienda"""
+    class Arguments:
+        items = graphene.List(graphene.NonNull(CrearVentaInput), required=True)
+        comprobante = Upload(required=True)
+    
+    ventas = graphene.List('apps.ventas.ventasType.VentaType')
+    mensaje = graphene.String()
+    
+    @requiere_autenticacion(user_types=['usuario'])
+    def mutate(self, info, items, comprobante, **kwargs):
+        usuario = kwargs['current_user']
+        
+        if not items:
+            raise GraphQLError("El carrito está vacío")
+        
+        # Unificar líneas repetidas del mismo producto
+        cantidades = defaultdict(int)
+        for item in items:
+            if item.cantidad < 1:
+                raise GraphQLError("La cantidad debe ser mayor a 0")
+            try:
+                tienda_producto_id = int(item.tienda_producto_id)
+            except ValueError:
+                raise GraphQLError(f"Producto no encontrado: {item.tienda_producto_id}")
+            cantidades[tienda_producto_id] += item.cantidad
+        
+        productos = TiendaProducto.objects.filter(
+            pk__in=cantidades.keys(),
+            fecha_eliminacion__isnull=True
+        ).select_related('tienda', 'producto').in_bulk()
+        
+        faltantes = set(cantidades) - set(productos)
+        if faltantes:
+            raise GraphQLError(f"Productos no encontrados: {', '.join(map(str, sorted(faltantes)))}")
+        
+        # Agrupar por tienda
+        por_tienda = defaultdict(list)
+        for tp_id, cantidad in cantidades.items():
+            tp = productos[tp_id]
+            por_tienda[tp.tienda_id].append((tp, cantidad))
+        
+        pendiente = Estado.get_pendiente()
+        
+        with transaction.atomic():
+            # Reservar en orden de id: dos carritos con los mismos productos
+            # bloquean las filas en el mismo orden y no se interbloquean
+            for tp_id in sorted(cantidades):
+                if not reservar(tp_id, cantidades[tp_id]):
+                    raise GraphQLError(f"Stock insuficiente para {productos[tp_id].producto.nombre}")
+            invalidar_dashboard(*por_tienda)
+            
+            tiendas = list(por_tienda)
+            ventas = Venta.objects.bulk_create([
+                Venta(
+                    usuario=usuario,
+                    tienda=por_tienda[tienda_id][0][0].tienda,
+                    total=sum(tp.precio * cantidad for tp, cantidad in por_tienda[tienda_id]),
+                    estado=pendiente
+                )
+                for tienda_id in tiendas
+            ])
+            
+            VentaProducto.objects.bulk_create([
+                VentaProducto(
+                    venta=venta,
+                    tienda_producto=tp,
+                    cantidad=cantidad,
+                    precio_unitario=tp.precio,
+                    subtotal=tp.precio * cantidad,
+                    estado=pendiente
+                )
+                for venta, tienda_id in zip(ventas, tiendas)
+                for tp, cantidad in por_tienda[tienda_id]
+            ])
+            
+            # Una notificación por tienda
+            for venta, tienda_id in zip(ventas, tiendas):
+                lineas = por_tienda[tienda_id]
+                nombres = ", ".join(tp.producto.nombre for tp, _ in lineas)
+                encolar(
+                    'crear_notificacion',
+                    usuario_id=lineas[0][0].tienda.propietario_id,
+                    tipo='venta_pendiente',
+                    titulo='Nueva venta pendiente',
+                    mensaje=f'{usuario.username} ha comprado {nombres}. Verifica el comprobante.',
+                    venta_relacionada_id=venta.id
+                )
+        
+        # El mismo comprobante se sube una vez para todas las ventas
+        subir_en_segundo_plano(ventas, 'comprobante', comprobante, "comprobantes/")
+        
+        return CrearVentaCarrito(
+            ventas=ventas,
+            mensaje=f"{len(ventas)} venta(s) registrada(s). Esperando confirmación de los vendedores."
+        )
+
+
 # ============= CONFIRMAR/RECHAZAR VENTA =============
 
 class ResponderVenta(graphene.Mutation):
@@ -105,12 +209,12 @@ class ResponderVenta(graphene.Mutation):
         usuario = kwargs['current_user']
         
         try:
-            venta = Venta.objects.get(pk=venta_id)
+            venta = Venta.objects.select_related('tienda', 'estado').get(pk=venta_id)
         except Venta.DoesNotExist:
             raise GraphQLError("Venta no encontrada")
         
         # Verificar que sea el dueño de la tienda
-        if venta.tienda.propietario != usuario:
+        if venta.tienda.propietario_id != usuario.id:
             raise GraphQLError("No autorizado")
         
         # Verificar que la venta esté pendiente
@@ -119,57 +223,35 @@ class ResponderVenta(graphene.Mutation):
         
         if aceptar:
             # ✅ ACEPTAR VENTA
-            venta.estado = Estado.get_completado()
-            venta.save()
-            
-            # Actualizar stock y estado de productos
-            for detalle in venta.detalles.all():
-                tp = detalle.tienda_producto
-                tp.stock -= detalle.cantidad
-                
-                # Marcar como vendido si ya no hay stock
-                if tp.stock <= 0:
-                    tp.estado = Estado.get_vendido()
-                else:
-                    tp.estado = Estado.get_disponible()
-                
-                tp.save()
-                detalle.estado = Estado.get_completado()
-                detalle.save()
+            if not cerrar_venta(venta.id, Estado.COMPLETADO):
+                raise GraphQLError("Esta venta ya fue procesada")
             
             # Notificar al comprador
-            Notificacion.objects.create(
-                usuario=venta.usuario,
+            encolar(
+                'crear_notificacion',
+                usuario_id=venta.usuario_id,
                 tipo='venta_confirmada',
                 titulo='¡Compra confirmada!',
                 mensaje=f'Tu compra en {venta.tienda.nombre} fue confirmada.',
-                venta_relacionada=venta
+                venta_relacionada_id=venta.id
             )
             
             return ResponderVenta(ok=True, mensaje="Venta confirmada exitosamente")
         
         else:
-            # ❌ RECHAZAR VENTA
-            venta.estado = Estado.get_rechazado()
-            venta.save()
-            
-            # Liberar productos (volver a disponible)
-            for detalle in venta.detalles.all():
-                tp = detalle.tienda_producto
-                tp.estado = Estado.get_disponible()
-                tp.save()
-                
-                detalle.estado = Estado.get_rechazado()
-                detalle.save()
+            # ❌ RECHAZAR VENTA (devuelve el stock reservado)
+            if not cerrar_venta(venta.id, Estado.RECHAZADO):
+                raise GraphQLError("Esta venta ya fue procesada")
             
             # Notificar al comprador
             mensaje_rechazo = motivo_rechazo or "El vendedor no pudo verificar tu pago."
-            Notificacion.objects.create(
-                usuario=venta.usuario,
+            encolar(
+                'crear_notificacion',
+                usuario_id=venta.usuario_id,
                 tipo='venta_rechazada',
                 titulo='Compra rechazada',
                 mensaje=f'Tu compra fue rechazada. Motivo: {mensaje_rechazo}',
-                venta_relacionada=venta
+                venta_relacionada_id=venta.id
             )
             
             return ResponderVenta(ok=True, mensaje="Venta rechazada")
@@ -190,33 +272,27 @@ class CancelarVenta(graphene.Mutation):
         usuario = kwargs['current_user']
         
         try:
-            venta = Venta.objects.get(pk=venta_id)
+            venta = Venta.objects.select_related('tienda', 'estado').get(pk=venta_id)
         except Venta.DoesNotExist:
             raise GraphQLError("Venta no encontrada")
         
         # Verificar que sea el comprador
-        if venta.usuario != usuario:
+        if venta.usuario_id != usuario.id:
             raise GraphQLError("No autorizado")
         
         # Solo se puede cancelar si está pendiente
         if venta.estado.nombre != Estado.PENDIENTE:
             raise GraphQLError("No puedes cancelar esta venta")
         
-        venta.estado = Estado.get_cancelado()
-        venta.save()
-        
-        # Liberar productos
-        for detalle in venta.detalles.all():
-            tp = detalle.tienda_producto
-            tp.estado = Estado.get_disponible()
-            tp.save()
-            detalle.estado = Estado.get_cancelado()
-            detalle.save()
+        # Devuelve el stock reservado
+        if not cerrar_venta(venta.id, Estado.CANCELADO):
+            raise GraphQLError("No puedes cancelar esta venta")
         
         return CancelarVenta(ok=True, mensaje="Venta cancelada")
 
 
 class VentasMutaciones(graphene.ObjectType):
     crear_venta = CrearVenta.Field()
+    crear_venta_carrito = CrearVentaCarrito.Field()
     responder_venta = ResponderVenta.Field()
     cancelar_venta = CancelarVenta.Field()
\ No newline at end of file
@@ -1,7 +1,10 @@
+from datetime import timedelta
+
 import graphene
 from graphql import GraphQLError
-from .ventasType import VentaType
-from .models import Venta
+from django.utils import timezone
+from .ventasType import VentaType, VentaDiariaTiendaType, VentaDiariaProductoType
+from .models import Venta, VentaDiariaTienda, VentaDiariaProducto
 from apps.usuarios.utils import requiere_autenticacion
 from core.models import Estado
 
@@ -12,6 +15,21 @@ class VentasQueries(graphene.ObjectType):
         tienda_id=graphene.ID(required=True)
     )
     ventas_pendientes_tienda = graphene.List(VentaType, tienda_id=graphene.ID(required=True))
+    ventas_diarias_tienda = graphene.List(
+        VentaDiariaTiendaType,
+        tienda_id=graphene.ID(required=True),
+        desde=graphene.Date(),
+        hasta=graphene.Date(),
+        description="Ventas, unidades e ingresos por día (por defecto los últimos 30 días)"
+    )
+    ventas_diarias_productos = graphene.List(
+        VentaDiariaProductoType,
+        tienda_id=graphene.ID(required=True),
+        tienda_producto_id=graphene.ID(),
+        desde=graphene.Date(),
+        hasta=graphene.Date(),
+        description="Unidades e ingresos por producto y día (por defecto los últimos 30 días)"
+    )
     
     @requiere_autenticacion(user_types=['usuario'])
     def resolve_mis_compras(self, info, **kwargs):
@@ -40,4 +58,37 @@ class VentasQueries(graphene.ObjectType):
             tienda__propietario=usuario,
             estado__nombre=Estado.PENDIENTE,
             fecha_eliminacion__isnull=True
-        ).select_related('usuario').prefetch_related('detalles')
\ No newline at end of file
+        ).select_related('usuario').prefetch_related('detalles')
+    
+    # ============ RESÚMENES DIARIOS (apps/ventas/resumen.py) ============
+    @staticmethod
+    def _rango(desde, hasta):
+        hasta = hasta or timezone.localdate()
+        desde = desde or hasta - timedelta(days=30)
+        return desde, hasta
+    
+    @requiere_autenticacion(user_types=['usuario'])
+    def resolve_ventas_diarias_tienda(self, info, tienda_id, desde=None, hasta=None, **kwargs):
+        usuario = kwargs['current_user']
+        desde, hasta = VentasQueries._rango(desde, hasta)
+        
+        return VentaDiariaTienda.objects.filter(
+            tienda_id=tienda_id,
+            tienda__propietario=usuario,
+            fecha__range=(desde, hasta)
+        ).order_by('fecha')
+    
+    @requiere_autenticacion(user_types=['usuario'])
+    def resolve_ventas_diarias_productos(self, info, tienda_id, tienda_producto_id=None, desde=None, hasta=None, **kwargs):
+        usuario = kwargs['current_user']
+        desde, hasta = VentasQueries._rango(desde, hasta)
+        
+        queryset = VentaDiariaProducto.objects.filter(
+            tienda_id=tienda_id,
+            tienda__propietario=usuario,
+            fecha__range=(desde, hasta)
+        )
+        if tienda_producto_id:
+            queryset = queryset.filter(tienda_producto_id=tienda_producto_id)
+        
+        return queryset.select_related('tienda_producto__producto').order_by('fecha', 'tienda_producto_id')
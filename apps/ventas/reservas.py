@@ -0,0 +1,237 @@
+"""
+Reserva de stock para ventas.
+
+El stock se descuenta al crear la venta (pendiente) con un UPDATE
+condicional, `stock = stock - n WHERE stock >= n`: la base de datos
+serializa las escrituras sobre la fila y nunca vende más unidades de las
+que hay, sin leer el stock en Python. Rechazar o cancelar la venta
+devuelve las unidades; confirmarla solo actualiza el estado del producto.
+
+Las transiciones de una venta (`cerrar_venta`) usan un número fijo de
+sentencias sin importar cuántas líneas tenga: los estados se resuelven con
+subconsultas por nombre y el stock de todas las líneas se devuelve con un
+único UPDATE con CASE.
+
+Las ventas que ya estaban pendientes cuando se introdujo la reserva se
+reservaron en la migración 0005; las que no alcanzaron stock tienen
+`stock_reservado=False`: al confirmarlas se descuenta el stock en ese
+momento y al rechazarlas o cancelarlas no se devuelve nada.
+
+Las ventas pendientes que superan VENTAS_RESERVA_HORAS se cancelan con
+`manage.py expirar_reservas` para no bloquear el inventario.
+
+El benchmark `manage.py benchmark_reservas` compara este método con
+select_for_update y con la lectura-modificación-escritura original.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Exists, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.productos import tendencias
+from apps.productos.models import TiendaProducto
+from apps.tiendas.dashboard import invalidar_dashboard
+from core.models import Estado
+from .models import Venta, VentaProducto
+from .resumen import acumular
+
+
+def id_estado(nombre):
+    """Subconsulta con el id del Estado `nombre`, para usar dentro de un UPDATE."""
+    return Subquery(Estado.objects.filter(nombre=nombre).values('id')[:1])
+
+
+def reservar(tienda_producto_id, cantidad):
+    """
+    Descuenta `cantidad` del stock si alcanza. Retorna True si se reservó.
+
+    El producto queda "reservado" si la reserva agota el stock y
+    "disponible" si aún quedan unidades.
+    """
+    # En el CASE, `stock` es el valor previo a la actualización
+    return TiendaProducto.objects.filter(
+        pk=tienda_producto_id,
+        fecha_eliminacion__isnull=True,
+        stock__gte=cantidad
+    ).update(
+        stock=F('stock') - cantidad,
+        estado=Case(
+            When(stock=cantidad, then=id_estado(Estado.RESERVADO)),
+            default=id_estado(Estado.DISPONIBLE)
+        ),
+        fecha_modificacion=timezone.now()
+    ) == 1
+
+
+def reservar_con_bloqueo(tienda_producto_id, cantidad):
+    """Variante con SELECT ... FOR UPDATE (solo para comparar en el benchmark)."""
+    with transaction.atomic():
+        tp = TiendaProducto.objects.select_for_update().filter(
+            pk=tienda_producto_id, fecha_eliminacion__isnull=True
+        ).first()
+        if tp is None or tp.stock < cantidad:
+            return False
+
+        tp.stock -= cantidad
+        tp.estado = Estado.get_reservado() if tp.stock == 0 else Estado.get_disponible()
+        tp.save(update_fields=['stock', 'estado', 'fecha_modificacion'])
+        return True
+
+
+def cambiar_estado_pendiente(ventas, nombre_estado):
+    """
+    Pasa a `nombre_estado` las ventas de `ventas` (queryset) que sigan
+    pendientes y retorna cuántas cambiaron. Una venta que otra petición ya
+    procesó no cambia, así el stock no se devuelve ni se confirma dos veces.
+    """
+    return ventas.filter(estado__nombre=Estado.PENDIENTE).update(
+        estado=id_estado(nombre_estado), fecha_modificacion=timezone.now()
+    )
+
+
+def liberar(lineas):
+    """Devuelve al stock las unidades reservadas: `lineas` es {tienda_producto_id: cantidad}."""
+    if not lineas:
+        return
+    TiendaProducto.objects.filter(pk__in=lineas).update(
+        stock=F('stock') + Case(
+            *[When(pk=tp_id, then=Value(cantidad)) for tp_id, cantidad in lineas.items()],
+            default=Value(0)
+        ),
+        estado=id_estado(Estado.DISPONIBLE),
+        fecha_modificacion=timezone.now()
+    )
+
+
+def descontar(lineas):
+    """
+    Descuenta al confirmar las unidades de ventas sin reserva previa
+    ({tienda_producto_id: cantidad}); el stock no baja de 0.
+    """
+    if not lineas:
+        return
+    TiendaProducto.objects.filter(pk__in=lineas).update(
+        stock=Greatest(F('stock') - Case(
+            *[When(pk=tp_id, then=Value(cantidad)) for tp_id, cantidad in lineas.items()],
+            default=Value(0)
+        ), 0),
+        fecha_modificacion=timezone.now()
+    )
+
+
+def _lineas(detalles):
+    return dict(
+        detalles.values('tienda_producto_id')
+        .annotate(total=Sum('cantidad'))
+        .values_list('tienda_producto_id', 'total')
+    )
+
+
+def marcar_vendidos(tienda_producto_ids):
+    """
+    Tras confirmar una venta, marca como vendidos los productos sin stock
+    que ya no tienen reservas pendientes de otras ventas.
+    """
+    pendientes = VentaProducto.objects.filter(
+        tienda_producto=OuterRef('pk'),
+        estado__nombre=Estado.PENDIENTE
+    )
+    TiendaProducto.objects.filter(pk__in=tienda_producto_ids, stock__lte=0).exclude(
+        Exists(pendientes)
+    ).update(estado=id_estado(Estado.VENDIDO), fecha_modificacion=timezone.now())
+
+
+def sumar_vendidos(lineas):
+    """Suma a ventas_count las unidades de ventas recién completadas ({tienda_producto_id: cantidad})."""
+    if not lineas:
+        return
+    TiendaProducto.objects.filter(pk__in=lineas).update(
+        ventas_count=F('ventas_count') + Case(
+            *[When(pk=tp_id, then=Value(cantidad)) for tp_id, cantidad in lineas.items()],
+            default=Value(0)
+        )
+    )
+
+
+def cerrar_ventas(venta_ids, nombre_estado):
+    """
+    Confirma (COMPLETADO), rechaza o cancela las ventas pendientes de
+    `venta_ids` con sus detalles y el stock de sus productos, en una
+    transacción y con un número fijo de sentencias. Las ventas que ya no
+    están pendientes se ignoran. Retorna cuántas ventas se cerraron.
+    """
+    with transaction.atomic():
+        # Bloquear las que siguen pendientes fija el conjunto a cerrar
+        bloqueadas = list(
+            Venta.objects.select_for_update()
+            .filter(pk__in=venta_ids, estado=id_estado(Estado.PENDIENTE))
+            .values_list('id', 'tienda_id', 'stock_reservado')
+        )
+        if not bloqueadas:
+            return 0
+        ids = [venta_id for venta_id, _, _ in bloqueadas]
+        sin_reserva = [venta_id for venta_id, _, reservado in bloqueadas if not reservado]
+
+        cambiar_estado_pendiente(Venta.objects.filter(pk__in=ids), nombre_estado)
+
+        detalles = VentaProducto.objects.filter(venta_id__in=ids)
+        detalles.update(estado=id_estado(nombre_estado), fecha_modificacion=timezone.now())
+
+        lineas = _lineas(detalles)
+        lineas_sin_reserva = _lineas(detalles.filter(venta_id__in=sin_reserva)) if sin_reserva else {}
+
+        if nombre_estado == Estado.COMPLETADO:
+            # El stock de las ventas reservadas ya se descontó al reservar
+            descontar(lineas_sin_reserva)
+            marcar_vendidos(list(lineas))
+            sumar_vendidos(lineas)
+            tendencias.registrar([(tp_id, tendencias.VENTA, cantidad) for tp_id, cantidad in lineas.items()])
+            acumular(ids)
+        else:
+            liberar({
+                tp_id: cantidad - lineas_sin_reserva.get(tp_id, 0)
+                for tp_id, cantidad in lineas.items()
+                if cantidad > lineas_sin_reserva.get(tp_id, 0)
+            })
+
+        invalidar_dashboard(*[tienda_id for _, tienda_id, _ in bloqueadas])
+    return len(ids)
+
+
+def cerrar_venta(venta_id, nombre_estado):
+    """Cierra una venta (ver `cerrar_ventas`). Retorna False si ya no estaba pendiente."""
+    return cerrar_ventas([venta_id], nombre_estado) == 1
+
+
+def expirar_reservas(horas=None, lote=100):
+    """
+    Cancela las ventas pendientes creadas hace más de `horas` y devuelve su
+    stock, por lotes. Retorna la lista de ventas canceladas como
+    (id, usuario_id) para notificar a los compradores.
+
+    Usa el índice (estado, fecha_creacion) de Venta; SKIP LOCKED permite
+    correr varios barredores sin que se esperen entre sí.
+    """
+    horas = horas if horas is not None else settings.VENTAS_RESERVA_HORAS
+    limite = timezone.now() - timedelta(hours=horas)
+    canceladas = []
+
+    while True:
+        with transaction.atomic():
+            candidatas = list(
+                Venta.objects.select_for_update(skip_locked=True)
+                .filter(estado=id_estado(Estado.PENDIENTE), fecha_creacion__lt=limite)
+                .order_by('fecha_creacion')
+                .values_list('id', 'usuario_id')[:lote]
+            )
+            if not candidatas:
+                break
+            cerrar_ventas([venta_id for venta_id, _ in candidatas], Estado.CANCELADO)
+        canceladas.extend(candidatas)
+
+        if len(candidatas) < lote:
+            break
+    return canceladas
@@ -0,0 +1,114 @@
+"""
+Resúmenes diarios de ventas (VentaDiariaTienda, VentaDiariaProducto).
+
+Se actualizan en la misma transacción que completa las ventas
+(`reservas.cerrar_ventas`) con un INSERT ... ON CONFLICT que suma a la fila
+del día, así los gráficos del vendedor leen unas pocas filas por día en
+lugar de recorrer todo el historial de `venta_producto`.
+
+El día de una venta es el de su confirmación. `manage.py recalcular_resumen_ventas`
+reconstruye los resúmenes desde las ventas completadas (usando
+`fecha_modificacion` como fecha de confirmación).
+"""
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Estado
+from .models import VentaProducto, VentaDiariaTienda, VentaDiariaProducto
+
+
+def acumular(venta_ids, fecha=None):
+    """Suma las ventas `venta_ids` (recién completadas) a los resúmenes de `fecha` (hoy)."""
+    if not venta_ids:
+        return
+    fecha = fecha or timezone.localdate()
+    marcadores = ', '.join(['%s'] * len(venta_ids))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO venta_diaria_tienda (tienda_id, fecha, ventas, unidades, ingresos)
+            SELECT v.tienda_id, %s, COUNT(DISTINCT v.id), SUM(vp.cantidad), SUM(vp.subtotal)
+            FROM venta v
+            JOIN venta_producto vp ON vp.venta_id = v.id
+            WHERE v.id IN ({marcadores})
+            GROUP BY v.tienda_id
+            ON CONFLICT (tienda_id, fecha) DO UPDATE SET
+                ventas = venta_diaria_tienda.ventas + EXCLUDED.ventas,
+                unidades = venta_diaria_tienda.unidades + EXCLUDED.unidades,
+                ingresos = venta_diaria_tienda.ingresos + EXCLUDED.ingresos
+            """,
+            [fecha, *venta_ids]
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO venta_diaria_producto (tienda_producto_id, tienda_id, fecha, unidades, ingresos)
+            SELECT vp.tienda_producto_id, v.tienda_id, %s, SUM(vp.cantidad), SUM(vp.subtotal)
+            FROM venta v
+            JOIN venta_producto vp ON vp.venta_id = v.id
+            WHERE v.id IN ({marcadores})
+            GROUP BY vp.tienda_producto_id, v.tienda_id
+            ON CONFLICT (tienda_producto_id, fecha) DO UPDATE SET
+                unidades = venta_diaria_producto.unidades + EXCLUDED.unidades,
+                ingresos = venta_diaria_producto.ingresos + EXCLUDED.ingresos
+            """,
+            [fecha, *venta_ids]
+        )
+
+
+def recalcular(desde=None, hasta=None):
+    """
+    Reconstruye los resúmenes de [desde, hasta] (fechas, ambas opcionales)
+    desde las ventas completadas. Retorna (filas_tienda, filas_producto).
+    """
+    detalles = VentaProducto.objects.filter(
+        venta__estado__nombre=Estado.COMPLETADO,
+        venta__fecha_eliminacion__isnull=True
+    ).annotate(dia=TruncDate('venta__fecha_modificacion'))
+
+    filtros = {}
+    if desde:
+        filtros['fecha__gte'] = desde
+        detalles = detalles.filter(dia__gte=desde)
+    if hasta:
+        filtros['fecha__lte'] = hasta
+        detalles = detalles.filter(dia__lte=hasta)
+
+    por_tienda = detalles.values('venta__tienda_id', 'dia').annotate(
+        ventas=Count('venta_id', distinct=True),
+        unidades=Sum('cantidad'),
+        ingresos=Sum('subtotal')
+    ).order_by()
+    por_producto = detalles.values('tienda_producto_id', 'venta__tienda_id', 'dia').annotate(
+        unidades=Sum('cantidad'),
+        ingresos=Sum('subtotal')
+    ).order_by()
+
+    with transaction.atomic():
+        VentaDiariaTienda.objects.filter(**filtros).delete()
+        VentaDiariaProducto.objects.filter(**filtros).delete()
+
+        tiendas = VentaDiariaTienda.objects.bulk_create([
+            VentaDiariaTienda(
+                tienda_id=fila['venta__tienda_id'],
+                fecha=fila['dia'],
+                ventas=fila['ventas'],
+                unidades=fila['unidades'],
+                ingresos=fila['ingresos']
+            )
+            for fila in por_tienda.iterator()
+        ], batch_size=1000)
+        productos = VentaDiariaProducto.objects.bulk_create([
+            VentaDiariaProducto(
+                tienda_producto_id=fila['tienda_producto_id'],
+                tienda_id=fila['venta__tienda_id'],
+                fecha=fila['dia'],
+                unidades=fila['unidades'],
+                ingresos=fila['ingresos']
+            )
+            for fila in por_producto.iterator()
+        ], batch_size=1000)
+
+    return len(tiendas), len(productos)
@@ -1,5 +1,5 @@
 from graphene_django import DjangoObjectType
-from .models import Venta, VentaProducto
+from .models import Venta, VentaProducto, VentaDiariaTienda, VentaDiariaProducto
 
 class VentaType(DjangoObjectType):
     class Meta:
@@ -11,4 +11,16 @@ class VentaProductoType(DjangoObjectType):
     class Meta:
         model = VentaProducto
         fields = "__all__"
-        description = "Representa un producto vendido en una venta."
\ No newline at end of file
+        description = "Representa un producto vendido en una venta."
+
+class VentaDiariaTiendaType(DjangoObjectType):
+    class Meta:
+        model = VentaDiariaTienda
+        fields = ("fecha", "ventas", "unidades", "ingresos")
+        description = "Ventas completadas de una tienda en un día."
+
+class VentaDiariaProductoType(DjangoObjectType):
+    class Meta:
+        model = VentaDiariaProducto
+        fields = ("tienda_producto", "fecha", "unidades", "ingresos")
+        description = "Unidades vendidas e ingresos de un producto de tienda en un día."
@@ -0,0 +1,100 @@
+"""
+Backends de almacenamiento para los archivos subidos.
+
+El backend activo se elige en settings.ALMACENAMIENTO:
+
+    ALMACENAMIENTO = {
+        'BACKEND': 'core.almacenamiento.AlmacenamientoLocal',
+        'OPCIONES': {'latencia_ms': 300, 'variacion_ms': 100},
+    }
+
+Los backends local y en memoria permiten probar la carga de las mutaciones
+con subidas sin depender de Cloudinary; las opciones de latencia y error
+simulan el tiempo de red del proveedor real y solo las usan esos dos
+backends (Cloudinary las ignora).
+"""
+import os
+import random
+import threading
+import time
+import uuid
+from functools import lru_cache
+from io import BytesIO
+
+import cloudinary.uploader
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Almacenamiento:
+    """Interfaz común: `subir()` guarda los bytes y retorna la URL pública."""
+
+    def __init__(self, latencia_ms=0, variacion_ms=0, tasa_error=0.0):
+        self.latencia_ms = latencia_ms
+        self.variacion_ms = variacion_ms
+        self.tasa_error = tasa_error
+
+    def subir(self, datos, carpeta, extension=''):
+        raise NotImplementedError
+
+    def _simular_red(self):
+        espera = self.latencia_ms + random.uniform(-self.variacion_ms, self.variacion_ms)
+        if espera > 0:
+            time.sleep(espera / 1000)
+        if self.tasa_error and random.random() < self.tasa_error:
+            raise IOError("Error simulado del almacenamiento")
+
+    @staticmethod
+    def _nombre(extension):
+        return f"{uuid.uuid4().hex}{extension}"
+
+
+class AlmacenamientoCloudinary(Almacenamiento):
+    """Proveedor real: las opciones de simulación de red no se aplican."""
+
+    def subir(self, datos, carpeta, extension=''):
+        resultado = cloudinary.uploader.upload(BytesIO(datos), folder=carpeta)
+        return resultado['secure_url']
+
+
+class AlmacenamientoLocal(Almacenamiento):
+    """Guarda en disco bajo MEDIA_ROOT (servido por Django en DEBUG)."""
+
+    def __init__(self, directorio=None, url_base=None, **opciones):
+        super().__init__(**opciones)
+        self.directorio = directorio or os.path.join(settings.MEDIA_ROOT, 'almacenamiento')
+        self.url_base = url_base or f"{settings.MEDIA_URL}almacenamiento/"
+
+    def subir(self, datos, carpeta, extension=''):
+        self._simular_red()
+        nombre = self._nombre(extension)
+        destino = os.path.join(self.directorio, carpeta)
+        os.makedirs(destino, exist_ok=True)
+
+        with open(os.path.join(destino, nombre), 'wb') as f:
+            f.write(datos)
+        return f"{self.url_base}{carpeta}{nombre}"
+
+
+class AlmacenamientoMemoria(Almacenamiento):
+    """Mantiene los archivos en memoria del proceso; útil para benchmarks."""
+
+    def __init__(self, **opciones):
+        super().__init__(**opciones)
+        self.archivos = {}
+        self._lock = threading.Lock()
+
+    def subir(self, datos, carpeta, extension=''):
+        self._simular_red()
+        url = f"memoria://{carpeta}{self._nombre(extension)}"
+        with self._lock:
+            self.archivos[url] = datos
+        return url
+
+
+@lru_cache(maxsize=None)
+def obtener_almacenamiento():
+    """Instancia (única por proceso) del backend configurado."""
+    config = getattr(settings, 'ALMACENAMIENTO', {})
+    clase = import_string(config.get('BACKEND', 'core.almacenamiento.AlmacenamientoCloudinary'))
+    return clase(**config.get('OPCIONES', {}))
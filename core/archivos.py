@@ -0,0 +1,123 @@
+"""
+Helpers para sacar las subidas de archivos del ciclo de la petición.
+
+El archivo recibido se copia a disco (por bloques) y se encola la tarea
+`subir_archivo` o `subir_imagen`, que lo sube al backend configurado
+(core/almacenamiento.py) y actualiza el campo URL del modelo.
+
+Antes de cualquier subida se consulta ArchivoSubido (SHA-256 del contenido
+-> URL) para que el mismo archivo no se suba dos veces.
+"""
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+
+from .almacenamiento import obtener_almacenamiento
+from .cola import encolar
+from .models import Tarea, ArchivoSubido
+
+
+def perfil_imagen():
+    """Configuración del procesamiento; forma parte de la huella de imágenes sin procesar."""
+    variantes = ",".join(f"{nombre}={lado}" for nombre, lado in settings.IMAGENES_VARIANTES.items())
+    return f"{settings.IMAGENES_FORMATO}:{settings.IMAGENES_CALIDAD}:{variantes}"
+
+
+def guardar_temporal(archivo, perfil=''):
+    """
+    Deja un archivo subido en el directorio de pendientes.
+
+    Los TemporaryUploadedFile (ver core/views.py) ya están en disco y solo se
+    mueven; el resto se copia por bloques.
+
+    Returns:
+        (ruta, huella): la huella es el SHA-256 de `perfil` + contenido.
+    """
+    directorio = settings.TAREAS_DIRECTORIO
+    os.makedirs(directorio, exist_ok=True)
+
+    extension = os.path.splitext(getattr(archivo, 'name', '') or '')[1].lower()
+    ruta = os.path.join(directorio, f"{uuid.uuid4().hex}{extension}")
+
+    sha = hashlib.sha256(perfil.encode())
+
+    if hasattr(archivo, 'temporary_file_path'):
+        for bloque in archivo.chunks():
+            sha.update(bloque)
+        file_move_safe(archivo.temporary_file_path(), ruta)
+        return ruta, sha.hexdigest()
+
+    with open(ruta, 'wb') as destino:
+        for bloque in archivo.chunks():
+            sha.update(bloque)
+            destino.write(bloque)
+    return ruta, sha.hexdigest()
+
+
+def registrar_subida(huella, url, tamano=0, variantes=None):
+    # ignore_conflicts: si otro worker registró el mismo hash, gana el primero
+    ArchivoSubido.objects.bulk_create(
+        [ArchivoSubido(hash=huella, url=url, tamano=tamano, variantes=variantes)],
+        ignore_conflicts=True
+    )
+
+
+def subir_deduplicado(datos, carpeta, extension=''):
+    """Sube `datos` (bytes) salvo que el mismo contenido ya esté subido; retorna la URL."""
+    huella = hashlib.sha256(datos).hexdigest()
+
+    url = ArchivoSubido.objects.filter(hash=huella).values_list('url', flat=True).first()
+    if url:
+        return url
+
+    url = obtener_almacenamiento().subir(datos, carpeta, extension)
+    registrar_subida(huella, url, tamano=len(datos))
+    return url
+
+
+def subir_en_segundo_plano(instancia, campo, archivo, carpeta, campo_variantes=None):
+    """
+    Encola la subida de `archivo` y la asignación de su URL a `instancia.campo`.
+
+    `instancia` puede ser una lista de instancias del mismo modelo que
+    comparten el archivo (p. ej. las ventas de un carrito): se sube una vez.
+    Si se indica `campo_variantes` el archivo se trata como imagen: se procesa
+    con Pillow y se guardan las URLs de cada tamaño en ese campo (JSON).
+    Si el contenido ya fue subido antes se asigna la URL en el acto, sin
+    encolar nada. La instancia debe estar guardada: el worker la actualiza por pk.
+    """
+    instancias = instancia if isinstance(instancia, (list, tuple)) else [instancia]
+    Modelo = type(instancias[0])
+    pks = [i.pk for i in instancias]
+
+    perfil = perfil_imagen() if campo_variantes else ''
+    ruta, huella = guardar_temporal(archivo, perfil)
+
+    conocido = ArchivoSubido.objects.filter(hash=huella).first()
+    if conocido:
+        os.remove(ruta)
+        campos = {campo: conocido.url}
+        if campo_variantes:
+            campos[campo_variantes] = conocido.variantes
+        Modelo.objects.filter(pk__in=pks).update(**campos)
+        for i in instancias:
+            for nombre, valor in campos.items():
+                setattr(i, nombre, valor)
+        return
+
+    destino = {
+        'modelo': Modelo._meta.label,
+        'pk': pks if len(pks) > 1 else pks[0],
+        'campo': campo,
+        'ruta': ruta,
+        'carpeta': carpeta,
+        'huella': huella,
+    }
+
+    if campo_variantes:
+        encolar('subir_imagen', prioridad=Tarea.PRIORIDAD_ALTA, campo_variantes=campo_variantes, **destino)
+    else:
+        encolar('subir_archivo', prioridad=Tarea.PRIORIDAD_ALTA, **destino)
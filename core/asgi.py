@@ -13,4 +13,19 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+aplicacion_http = get_asgi_application()
+
+# Importar después de inicializar Django (carga el schema y los modelos)
+from .suscripciones import aplicacion_websocket  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # Suscripciones GraphQL por WebSocket en la misma ruta que la API HTTP
+    if scope['type'] == 'websocket':
+        if scope['path'].rstrip('/') == '/chichapi':
+            await aplicacion_websocket(scope, receive, send)
+        else:
+            await send({'type': 'websocket.close', 'code': 4404})
+        return
+
+    await aplicacion_http(scope, receive, send)
@@ -0,0 +1,140 @@
+"""
+Cola de tareas en segundo plano respaldada por la base de datos.
+
+Las mutaciones encolan efectos secundarios (subidas, notificaciones,
+auditoría) con `encolar()` y el comando `manage.py procesar_tareas`
+los ejecuta fuera del ciclo de la petición HTTP.
+
+Los handlers se registran con el decorador `@tarea('nombre')` en el
+módulo `tareas.py` de cada app; se descubren en `CoreConfig.ready()`.
+"""
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Tarea
+
+logger = logging.getLogger(__name__)
+
+_HANDLERS = {}
+
+
+def tarea(nombre):
+    # Decorador que registra un handler de la cola bajo un nombre
+    def decorator(func):
+        if nombre in _HANDLERS:
+            raise ValueError(f"Ya existe una tarea registrada como '{nombre}'")
+        _HANDLERS[nombre] = func
+        return func
+    return decorator
+
+
+def encolar(nombre, prioridad=Tarea.PRIORIDAD_NORMAL, retraso=0, max_intentos=None, **payload):
+    """
+    Encola una tarea para que la procese el worker.
+
+    Args:
+        nombre: Nombre con el que se registró el handler
+        prioridad: Tarea.PRIORIDAD_* (menor número = antes)
+        retraso: Segundos a esperar antes de que la tarea sea visible
+        max_intentos: Reintentos antes de marcarla como fallida
+        **payload: Argumentos (serializables a JSON) para el handler
+    """
+    if nombre not in _HANDLERS:
+        raise ValueError(f"Tarea desconocida: '{nombre}'")
+
+    # Modo desarrollo: sin worker, se ejecuta en la misma petición. El payload
+    # pasa por JSON igual que en la cola para que el handler reciba lo mismo.
+    if getattr(settings, 'TAREAS_SINCRONAS', False):
+        _HANDLERS[nombre](**json.loads(json.dumps(payload, cls=DjangoJSONEncoder)))
+        return None
+
+    return Tarea.objects.create(
+        nombre=nombre,
+        payload=payload,
+        prioridad=prioridad,
+        max_intentos=max_intentos or getattr(settings, 'TAREAS_MAX_INTENTOS', 5),
+        disponible_desde=timezone.now() + timedelta(seconds=retraso),
+    )
+
+
+def reclamar(limite=10, visibilidad=None):
+    """
+    Reserva hasta `limite` tareas visibles para este worker.
+
+    Las tareas reclamadas quedan ocultas durante `visibilidad` segundos; si el
+    worker muere sin terminarlas vuelven a ser visibles y otro las reintenta.
+    El intento se cuenta al reclamar, así una tarea que tumba al worker agota
+    sus intentos igual que una que falla: al volver a verse sin intentos
+    restantes se marca fallida en lugar de reintentarse.
+    SKIP LOCKED permite varios workers sin bloquearse entre sí.
+    """
+    visibilidad = visibilidad or getattr(settings, 'TAREAS_VISIBILIDAD_SEGUNDOS', 300)
+    ahora = timezone.now()
+
+    with transaction.atomic():
+        tareas = list(
+            Tarea.objects.select_for_update(skip_locked=True).filter(
+                estado__in=[Tarea.PENDIENTE, Tarea.EN_PROCESO],
+                disponible_desde__lte=ahora
+            ).order_by('prioridad', 'disponible_desde')[:limite]
+        )
+        # Abandonadas por un worker en su último intento
+        agotadas = [t for t in tareas if t.estado == Tarea.EN_PROCESO and t.intentos >= t.max_intentos]
+        if agotadas:
+            logger.warning("Tareas %s abandonadas sin intentos restantes", [t.pk for t in agotadas])
+            Tarea.objects.filter(pk__in=[t.pk for t in agotadas]).update(
+                estado=Tarea.FALLIDA,
+                ultimo_error="El worker no terminó la tarea antes de agotar los intentos"
+            )
+            tareas = [t for t in tareas if t not in agotadas]
+        if not tareas:
+            return []
+
+        oculta_hasta = ahora + timedelta(seconds=visibilidad)
+        Tarea.objects.filter(pk__in=[t.pk for t in tareas]).update(
+            estado=Tarea.EN_PROCESO,
+            intentos=F('intentos') + 1,
+            disponible_desde=oculta_hasta
+        )
+
+    for t in tareas:
+        t.estado = Tarea.EN_PROCESO
+        t.intentos += 1
+        t.disponible_desde = oculta_hasta
+    return tareas
+
+
+def ejecutar(t):
+    """Ejecuta una tarea reclamada; la elimina si termina o programa el reintento."""
+    handler = _HANDLERS.get(t.nombre)
+
+    try:
+        if handler is None:
+            raise LookupError(f"No hay handler registrado para '{t.nombre}'")
+        handler(**t.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Tarea %s (%s) falló en el intento %s", t.pk, t.nombre, t.intentos)
+
+        if t.intentos >= t.max_intentos:
+            Tarea.objects.filter(pk=t.pk).update(estado=Tarea.FALLIDA, ultimo_error=error)
+        else:
+            # Backoff exponencial: 2, 4, 8... segundos (con tope)
+            espera = min(2 ** t.intentos, getattr(settings, 'TAREAS_BACKOFF_MAXIMO', 600))
+            Tarea.objects.filter(pk=t.pk).update(
+                estado=Tarea.PENDIENTE,
+                ultimo_error=error,
+                disponible_desde=timezone.now() + timedelta(seconds=espera)
+            )
+        return False
+
+    Tarea.objects.filter(pk=t.pk).delete()
+    return True
@@ -0,0 +1,54 @@
+"""
+Snapshots cacheados para estadísticas globales (paneles de administración).
+
+`snapshot(clave, calcular)` guarda el resultado en la caché junto con su
+vencimiento lógico. Cuando vence, solo el proceso que obtiene el candado
+(`cache.add`) lo recalcula; el resto sigue entregando el valor anterior
+mientras tanto, así un panel que se refresca cada pocos segundos desde
+muchos navegadores no dispara la misma consulta en paralelo.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Margen de conservación del valor vencido (se sirve mientras se recalcula)
+FACTOR_RETENCION = 10
+
+
+def _recalcular(clave, calcular, segundos):
+    datos = calcular()
+    cache.set(
+        clave,
+        {'datos': datos, 'vence': time.time() + segundos},
+        segundos * FACTOR_RETENCION
+    )
+    return datos
+
+
+def snapshot(clave, calcular, segundos=None):
+    segundos = segundos or settings.ESTADISTICAS_SNAPSHOT_SEGUNDOS
+    clave = f"snapshot:{clave}"
+    candado = f"{clave}:recalculando"
+
+    entrada = cache.get(clave)
+    if entrada is not None and entrada['vence'] > time.time():
+        return entrada['datos']
+
+    if cache.add(candado, 1, settings.ESTADISTICAS_CANDADO_SEGUNDOS):
+        try:
+            return _recalcular(clave, calcular, segundos)
+        finally:
+            cache.delete(candado)
+
+    # Otro proceso está recalculando: servir el valor vencido si lo hay
+    if entrada is not None:
+        return entrada['datos']
+
+    # Primera carga: esperar brevemente al que recalcula antes de consultar por cuenta propia
+    for _ in range(10):
+        time.sleep(0.05)
+        entrada = cache.get(clave)
+        if entrada is not None:
+            return entrada['datos']
+    return calcular()
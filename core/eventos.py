@@ -0,0 +1,140 @@
+"""
+Pub/sub de eventos para las suscripciones GraphQL (core/suscripciones.py).
+
+Los eventos se publican desde código síncrono (mutaciones, worker de la
+cola) y se entregan a los suscriptores asyncio del proceso ASGI:
+
+- Con PostgreSQL, `publicar()` hace `pg_notify` en la transacción actual:
+  el evento sale solo si la transacción confirma y llega a todos los
+  procesos que escuchan el canal (varios workers ASGI, y eventos
+  generados por `manage.py procesar_tareas`).
+- Con otro motor se entrega directamente al bus del proceso al confirmar.
+
+Cada proceso ASGI abre una única conexión LISTEN (psycopg async) al recibir
+la primera suscripción y reparte los mensajes a las colas locales.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Límite de payload de NOTIFY en PostgreSQL (8000 bytes), con margen
+MAX_PAYLOAD_NOTIFY = 7500
+
+
+class BusEventos:
+    """Colas asyncio por canal; `publicar` se puede llamar desde cualquier hilo."""
+
+    def __init__(self, max_pendientes=100):
+        self.max_pendientes = max_pendientes
+        self._suscriptores = defaultdict(set)
+        self._lock = threading.Lock()
+
+    async def suscribir(self, canal):
+        cola = asyncio.Queue(maxsize=self.max_pendientes)
+        suscriptor = (asyncio.get_running_loop(), cola)
+
+        with self._lock:
+            self._suscriptores[canal].add(suscriptor)
+        try:
+            while True:
+                yield await cola.get()
+        finally:
+            with self._lock:
+                self._suscriptores[canal].discard(suscriptor)
+                if not self._suscriptores[canal]:
+                    del self._suscriptores[canal]
+
+    def publicar(self, canal, datos):
+        with self._lock:
+            suscriptores = list(self._suscriptores.get(canal, ()))
+
+        for loop, cola in suscriptores:
+            loop.call_soon_threadsafe(self._entregar, cola, datos)
+
+    @staticmethod
+    def _entregar(cola, datos):
+        # Un cliente lento pierde eventos en lugar de acumular memoria
+        if cola.full():
+            logger.warning("Suscriptor saturado, se descarta un evento")
+            return
+        cola.put_nowait(datos)
+
+
+bus_eventos = BusEventos()
+
+
+def usa_notify():
+    return 'postgresql' in settings.DATABASES['default']['ENGINE']
+
+
+def publicar(canal, datos):
+    """Publica `datos` (serializable a JSON) en `canal` al confirmar la transacción actual."""
+    mensaje = json.dumps({'canal': canal, 'datos': datos}, cls=DjangoJSONEncoder)
+
+    if not usa_notify():
+        datos = json.loads(mensaje)['datos']
+        transaction.on_commit(lambda: bus_eventos.publicar(canal, datos))
+        return
+
+    if len(mensaje.encode()) > MAX_PAYLOAD_NOTIFY:
+        logger.warning("Evento de %s descartado: supera el tamaño máximo de NOTIFY", canal)
+        return
+
+    # NOTIFY es transaccional: se entrega al confirmar y se descarta en rollback
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [settings.EVENTOS_CANAL_PG, mensaje])
+
+
+# ============= ESCUCHA LISTEN (proceso ASGI) =============
+
+_escucha = None
+
+
+def asegurar_escucha():
+    """Arranca (una vez por proceso) la tarea que reenvía NOTIFY al bus local."""
+    global _escucha
+    if not usa_notify():
+        return
+    if _escucha is None or _escucha.done():
+        _escucha = asyncio.get_running_loop().create_task(_escuchar())
+
+
+async def _escuchar():
+    import psycopg
+
+    db = settings.DATABASES['default']
+    espera = 1
+
+    while True:
+        try:
+            conexion = await psycopg.AsyncConnection.connect(
+                dbname=db['NAME'],
+                user=db['USER'],
+                password=db['PASSWORD'],
+                host=db['HOST'],
+                port=db['PORT'],
+                autocommit=True,
+            )
+            async with conexion:
+                await conexion.execute(f'LISTEN "{settings.EVENTOS_CANAL_PG}"')
+                espera = 1
+                async for aviso in conexion.notifies():
+                    try:
+                        mensaje = json.loads(aviso.payload)
+                    except ValueError:
+                        continue
+                    bus_eventos.publicar(mensaje['canal'], mensaje['datos'])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Conexión LISTEN perdida, reintentando en %ss", espera)
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, 30)
@@ -0,0 +1,94 @@
+"""
+Procesamiento de imágenes con Pillow antes de subirlas.
+
+Valida el archivo, aplica la orientación EXIF y descarta los metadatos,
+reduce la imagen a cada tamaño de IMAGENES_VARIANTES y la re-codifica
+(WebP por defecto). El trabajo de CPU corre en un pool de procesos.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from graphql import GraphQLError
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+_POOL = None
+
+
+def validar_imagen(archivo):
+    """Verifica que el archivo subido sea una imagen legible (sin decodificarla completa)."""
+    try:
+        with Image.open(archivo) as img:
+            ancho, alto = img.size
+            img.verify()
+    except (UnidentifiedImageError, OSError, SyntaxError, Image.DecompressionBombError):
+        raise GraphQLError("El archivo no es una imagen válida")
+    finally:
+        archivo.seek(0)
+
+    if ancho * alto > settings.IMAGENES_MAX_PIXELES:
+        raise GraphQLError("La imagen es demasiado grande")
+
+
+def _procesar(datos, variantes, formato, calidad, max_pixeles):
+    # Corre en un proceso del pool: no debe usar Django
+    Image.MAX_IMAGE_PIXELS = max_pixeles
+
+    with Image.open(BytesIO(datos)) as original:
+        img = ImageOps.exif_transpose(original)
+
+        if formato == 'JPEG' and img.mode in ('RGBA', 'LA', 'P'):
+            fondo = Image.new('RGB', img.size, (255, 255, 255))
+            img = img.convert('RGBA')
+            fondo.paste(img, mask=img.getchannel('A'))
+            img = fondo
+        elif img.mode not in ('RGB', 'RGBA'):
+            # has_transparency_data cubre también las paletas ('P') con transparencia
+            img = img.convert('RGBA' if img.has_transparency_data else 'RGB')
+
+        resultado = {}
+        for nombre, lado in variantes.items():
+            copia = img.copy()
+            copia.thumbnail((lado, lado), Image.Resampling.LANCZOS)
+
+            # Guardar sin pasar `exif` descarta todos los metadatos
+            buffer = BytesIO()
+            copia.save(buffer, format=formato, quality=calidad, optimize=True)
+            resultado[nombre] = buffer.getvalue()
+        return resultado
+
+
+def _obtener_pool():
+    global _POOL
+    if _POOL is None:
+        # spawn: los hijos no heredan hilos ni conexiones del servidor
+        _POOL = ProcessPoolExecutor(
+            max_workers=settings.IMAGENES_PROCESOS,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _POOL
+
+
+def procesar_imagen(datos):
+    """
+    Genera las variantes de una imagen.
+
+    Returns:
+        dict {nombre_variante: bytes} en el orden de IMAGENES_VARIANTES;
+        la primera variante es la principal.
+    """
+    futuro = _obtener_pool().submit(
+        _procesar,
+        datos,
+        settings.IMAGENES_VARIANTES,
+        settings.IMAGENES_FORMATO,
+        settings.IMAGENES_CALIDAD,
+        settings.IMAGENES_MAX_PIXELES
+    )
+    return futuro.result()
+
+
+def extension_imagen():
+    """Extensión de los archivos que genera `procesar_imagen`."""
+    return '.jpg' if settings.IMAGENES_FORMATO == 'JPEG' else f".{settings.IMAGENES_FORMATO.lower()}"
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.cola import reclamar, ejecutar
+
+
+class Command(BaseCommand):
+    help = "Worker local que procesa la cola de tareas en segundo plano"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=10, help="Tareas reclamadas por vuelta")
+        parser.add_argument('--visibilidad', type=int, default=None, help="Timeout de visibilidad en segundos")
+        parser.add_argument('--intervalo', type=float, default=1.0, help="Espera cuando la cola está vacía")
+        parser.add_argument('--una-vez', action='store_true', help="Procesa lo pendiente y termina")
+
+    def handle(self, *args, **options):
+        self.stdout.write("Worker de tareas iniciado")
+
+        try:
+            while True:
+                close_old_connections()
+                tareas = reclamar(limite=options['lote'], visibilidad=options['visibilidad'])
+
+                for t in tareas:
+                    ok = ejecutar(t)
+                    estilo = self.style.SUCCESS if ok else self.style.ERROR
+                    self.stdout.write(estilo(f"{'OK' if ok else 'ERROR'} {t.nombre} #{t.pk}"))
+
+                if not tareas:
+                    if options['una_vez']:
+                        break
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            self.stdout.write("Worker detenido")
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2025-12-02 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_tarea'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoSubido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('variantes', models.JSONField(blank=True, null=True)),
+                ('tamano', models.BigIntegerField(default=0)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archivo subido',
+                'verbose_name_plural': 'Archivos subidos',
+                'db_table': 'archivo_subido',
+            },
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
 class Estado(models.Model):
     # Estados predefinidos
     ACTIVO = 'activo'
@@ -70,4 +73,62 @@ class Estado(models.Model):
     
     @classmethod
     def get_reservado(cls):
-        return cls.objects.get(nombre=cls.RESERVADO)
\ No newline at end of file
+        return cls.objects.get(nombre=cls.RESERVADO)
+
+class Tarea(models.Model):
+    """Trabajo en segundo plano persistido en la base de datos (ver core/cola.py)."""
+    # Estados de la cola
+    PENDIENTE = 'pendiente'
+    EN_PROCESO = 'en_proceso'
+    FALLIDA = 'fallida'
+
+    ESTADO_CHOICES = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (FALLIDA, 'Fallida'),
+    ]
+
+    # Prioridades (menor número = se procesa antes)
+    PRIORIDAD_ALTA = 0
+    PRIORIDAD_NORMAL = 5
+    PRIORIDAD_BAJA = 10
+
+    nombre = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    prioridad = models.SmallIntegerField(default=PRIORIDAD_NORMAL)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default=PENDIENTE)
+    intentos = models.IntegerField(default=0)
+    max_intentos = models.IntegerField(default=5)
+    # Mientras está en proceso marca el fin del timeout de visibilidad
+    disponible_desde = models.DateTimeField(default=timezone.now)
+    ultimo_error = models.TextField(blank=True, null=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_modificacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'tarea'
+        verbose_name = 'Tarea'
+        verbose_name_plural = 'Tareas'
+        indexes = [
+            models.Index(fields=['estado', 'prioridad', 'disponible_desde']),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre} [{self.estado}] (intento {self.intentos}/{self.max_intentos})"
+
+
+class ArchivoSubido(models.Model):
+    """Índice de contenido subido: SHA-256 de los bytes -> URL almacenada."""
+    hash = models.CharField(max_length=64, unique=True)
+    url = models.URLField(max_length=500)
+    variantes = models.JSONField(blank=True, null=True)  # Solo imágenes procesadas: {nombre_variante: url}
+    tamano = models.BigIntegerField(default=0)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'archivo_subido'
+        verbose_name = 'Archivo subido'
+        verbose_name_plural = 'Archivos subidos'
+
+    def __str__(self):
+        return f"{self.hash[:12]} -> {self.url}"
@@ -0,0 +1,48 @@
+"""
+Paginación por cursor (keyset) para listas ordenadas por fecha descendente.
+
+El cursor codifica (fecha, id) de la última fila entregada; la página
+siguiente pide las filas estrictamente anteriores, así el costo no crece
+con la profundidad de la página como con OFFSET.
+"""
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from graphql import GraphQLError
+
+
+def codificar_cursor(fecha, pk):
+    return base64.urlsafe_b64encode(f"{fecha.isoformat()}|{pk}".encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    try:
+        fecha, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(fecha), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        raise GraphQLError("Cursor inválido")
+
+
+def paginar(queryset, cursor=None, limite=None, campo='fecha'):
+    """
+    Retorna (filas, siguiente_cursor, tiene_mas) ordenando por `-campo, -id`.
+
+    Requiere un índice que empiece por los filtros de igualdad y termine en
+    `campo` para que cada página sea un recorrido corto del índice.
+    """
+    limite = min(limite or settings.PAGINACION_POR_DEFECTO, settings.PAGINACION_MAXIMO)
+    limite = max(limite, 1)
+
+    queryset = queryset.order_by(f'-{campo}', '-id')
+    if cursor:
+        fecha, pk = decodificar_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{campo}__lt': fecha}) | Q(**{campo: fecha, 'id__lt': pk}))
+
+    filas = list(queryset[:limite + 1])
+    tiene_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    siguiente = codificar_cursor(getattr(filas[-1], campo), filas[-1].pk) if tiene_mas else None
+    return filas, siguiente, tiene_mas
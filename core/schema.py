@@ -1,5 +1,5 @@
 import graphene
-from apps.usuarios.schemaUsuarios import Query as UsuariosQuery, Mutation as UsuariosMutation
+from apps.usuarios.schemaUsuarios import Query as UsuariosQuery, Mutation as UsuariosMutation, Subscription as UsuariosSubscription
 from apps.categorias.schemaCategorias import Query as CategoriasQuery, Mutation as CategoriasMutation
 from apps.tiendas.schemaTiendas import Query as TiendasQuery, Mutation as TiendasMutation
 from apps.productos.schemaProductos import Query as ProductosQuery, Mutation as ProductosMutation
@@ -32,6 +32,12 @@ class Mutation(
 ):
     pass
 
-# Schema principal que une todas las consultas y mutaciones
+class Subscription(
+    UsuariosSubscription,
+    graphene.ObjectType
+):
+    pass
+
+# Schema principal que une todas las consultas, mutaciones y suscripciones
 
-schema = graphene.Schema(query=Query, mutation=Mutation)
\ No newline at end of file
+schema = graphene.Schema(query=Query, mutation=Mutation, subscription=Subscription)
\ No newline at end of file
@@ -52,6 +52,93 @@ DEBUG = True
 if DEBUG:
     os.makedirs(MEDIA_ROOT, exist_ok=True)
 
+# Cola de tareas en segundo plano (core/cola.py, worker: manage.py procesar_tareas)
+TAREAS_SINCRONAS = config('TAREAS_SINCRONAS', default=False, cast=bool)  # True = ejecutar en la petición (sin worker)
+# Fuera de MEDIA_ROOT: en DEBUG /media/ se sirve y expondría archivos sin validar
+ARCHIVOS_TEMPORALES = config('ARCHIVOS_TEMPORALES', default=os.path.join(BASE_DIR, 'archivos_temporales'))
+TAREAS_DIRECTORIO = os.path.join(ARCHIVOS_TEMPORALES, 'pendientes')  # Archivos esperando ser subidos
+TAREAS_MAX_INTENTOS = 5
+TAREAS_VISIBILIDAD_SEGUNDOS = 300
+TAREAS_BACKOFF_MAXIMO = 600
+
+# Subidas multipart (core/views.py): todo archivo se escribe por bloques a disco
+FILE_UPLOAD_TEMP_DIR = os.path.join(ARCHIVOS_TEMPORALES, 'subidas')  # Mismo disco que TAREAS_DIRECTORIO: se mueven sin copiar
+SUBIDAS_MAX_ARCHIVO = 10 * 1024 * 1024  # 10 MB por archivo
+SUBIDAS_MAX_PETICION = 40 * 1024 * 1024  # 40 MB por petición
+
+# Auditoría en lote (apps/usuarios/auditoria.py)
+AUDITORIA_MODO = config('AUDITORIA_MODO', default='buffer')  # 'buffer' o 'sincrono' (cada registro se guarda en el acto)
+AUDITORIA_BUFFER_MAX = 200  # Registros acumulados antes de vaciar
+AUDITORIA_BUFFER_SEGUNDOS = 5  # Antigüedad máxima del registro más viejo en el buffer
+
+# Particionado mensual de auditoría (solo PostgreSQL, ver manage.py mantener_auditoria)
+AUDITORIA_MESES_ADELANTE = 3  # Particiones futuras ya creadas
+AUDITORIA_RETENCION_MESES = 12  # Meses conservados en la base de datos; los anteriores se archivan
+AUDITORIA_ARCHIVO_DIRECTORIO = os.path.join(BASE_DIR, 'archivo_auditoria')  # Destino de los .csv.gz
+AUDITORIA_VENTANA_DIAS = 30  # Ventana por defecto de las queries de auditoría
+
+# Suscripciones GraphQL por WebSocket (core/suscripciones.py, requiere servidor ASGI: uvicorn core.asgi:application)
+EVENTOS_CANAL_PG = 'chicha_eventos'  # Canal LISTEN/NOTIFY compartido entre procesos
+SUSCRIPCIONES_TIEMPO_INIT = 10  # Segundos para recibir connection_init antes de cerrar
+
+# Reservas de stock (apps/ventas/reservas.py, barredor: manage.py expirar_reservas)
+VENTAS_RESERVA_HORAS = config('VENTAS_RESERVA_HORAS', default=48, cast=int)  # Ventas pendientes más antiguas se cancelan
+
+# Productos en tendencia (apps/productos/tendencias.py, reconstrucción: manage.py recalcular_tendencias)
+TENDENCIA_VIDA_MEDIA_HORAS = 72  # Cada aporte vale la mitad pasado este tiempo
+TENDENCIA_PESOS = {'favorito': 5, 'venta': 10, 'vista': 1}  # Peso por favorito, unidad vendida y vista
+TENDENCIA_VENTANA_DIAS = 30  # Eventos considerados al reconstruir
+TENDENCIA_VISTA_SEGUNDOS = 3600  # Vistas repetidas de un visitante en este lapso cuentan una vez
+
+# Productos relacionados por co-ocurrencia (apps/productos/recomendaciones.py, manage.py calcular_recomendaciones)
+RECOMENDACIONES_VECINOS = 20  # Relacionados guardados por producto
+RECOMENDACIONES_MIN_COINCIDENCIAS = 2  # Usuarios en común mínimos para relacionar dos productos
+
+# Importación y actualización masiva de productos (apps/productos/importacion.py e inventario.py)
+IMPORTACION_LOTE = 500  # Filas por bulk_create y transacción
+IMPORTACION_MAX_FILAS = 5000  # Máximo por archivo en la mutación (el comando no tiene tope)
+ACTUALIZACION_MASIVA_MAX = 1000  # Productos por llamada a actualizarStockPrecioMasivo
+
+# Caché (dashboard del vendedor, estadísticas). Con varios procesos usar un backend compartido
+# para que las invalidaciones lleguen a todos, p. ej. django.core.cache.backends.redis.RedisCache
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='chichaback'),
+    }
+}
+
+# Dashboard del vendedor (apps/tiendas/dashboard.py)
+DASHBOARD_CACHE_SEGUNDOS = 300
+DASHBOARD_STOCK_BAJO = 3  # Umbral de stock bajo por defecto
+
+# Estadísticas globales servidas desde snapshots en caché (core/estadisticas.py)
+ESTADISTICAS_SNAPSHOT_SEGUNDOS = 60  # Antigüedad máxima antes de recalcular
+ESTADISTICAS_CANDADO_SEGUNDOS = 30  # Duración máxima del candado de recálculo
+
+# Paginación por cursor (core/paginacion.py)
+PAGINACION_POR_DEFECTO = 20
+PAGINACION_MAXIMO = 100
+
+# Procesamiento de imágenes de productos antes de subirlas (core/imagenes.py)
+IMAGENES_VARIANTES = {'grande': 1600, 'mediana': 800, 'miniatura': 320}  # Lado máximo en px; la primera es la principal
+IMAGENES_FORMATO = 'WEBP'  # 'WEBP' o 'JPEG'
+IMAGENES_CALIDAD = 82
+IMAGENES_MAX_PIXELES = 40_000_000  # Rechaza imágenes más grandes (protección contra decompression bombs)
+IMAGENES_PROCESOS = 2  # Procesos del pool de Pillow
+
+# Backend de almacenamiento de archivos subidos (core/almacenamiento.py)
+# Para pruebas de carga sin Cloudinary: core.almacenamiento.AlmacenamientoLocal o AlmacenamientoMemoria
+ALMACENAMIENTO = {
+    'BACKEND': config('ALMACENAMIENTO_BACKEND', default='core.almacenamiento.AlmacenamientoCloudinary'),
+    'OPCIONES': {
+        # Simulación de red: solo en los backends local y en memoria
+        'latencia_ms': config('ALMACENAMIENTO_LATENCIA_MS', default=0, cast=int),  # Latencia simulada por subida
+        'variacion_ms': config('ALMACENAMIENTO_VARIACION_MS', default=0, cast=int),
+        'tasa_error': config('ALMACENAMIENTO_TASA_ERROR', default=0.0, cast=float),  # Fracción de subidas que fallan
+    },
+}
+
 ALLOWED_HOSTS = []
 
 
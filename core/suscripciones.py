@@ -0,0 +1,153 @@
+"""
+Suscripciones GraphQL sobre WebSocket (protocolo graphql-transport-ws).
+
+core/asgi.py envía aquí las conexiones WebSocket a /chichapi/. El token va
+en el payload de `connection_init`:
+
+    {"type": "connection_init", "payload": {"Authorization": "Bearer <token>"}}
+
+y queda disponible para los resolvers como `info.context.headers`, igual
+que en las peticiones HTTP (ver apps/usuarios/utils.py).
+"""
+import asyncio
+import json
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PROTOCOLO = 'graphql-transport-ws'
+
+
+class ContextoWebSocket:
+    """Contexto de los resolvers de suscripción, con la interfaz de `request` que usan."""
+
+    def __init__(self, scope, payload):
+        self.scope = scope
+        self.headers = {
+            'Authorization': payload.get('Authorization') or payload.get('authorization') or ''
+        }
+
+
+class ConexionGraphQL:
+    def __init__(self, scope, receive, send):
+        self.scope = scope
+        self.receive = receive
+        self.send = send
+        self.contexto = None
+        self.operaciones = {}
+
+    async def enviar(self, mensaje):
+        await self.send({'type': 'websocket.send', 'text': json.dumps(mensaje)})
+
+    async def cerrar(self, codigo, razon=''):
+        await self.send({'type': 'websocket.close', 'code': codigo, 'reason': razon})
+
+    async def atender(self):
+        evento = await self.receive()
+        if evento['type'] != 'websocket.connect':
+            return
+
+        if PROTOCOLO not in self.scope.get('subprotocols', []):
+            await self.send({'type': 'websocket.close', 'code': 4406})
+            return
+        await self.send({'type': 'websocket.accept', 'subprotocol': PROTOCOLO})
+
+        espera_init = asyncio.get_running_loop().create_task(self._limite_init())
+        try:
+            while True:
+                evento = await self.receive()
+                if evento['type'] == 'websocket.disconnect':
+                    break
+
+                try:
+                    mensaje = json.loads(evento.get('text') or '')
+                except ValueError:
+                    await self.cerrar(4400, "Mensaje inválido")
+                    break
+
+                if not await self.procesar(mensaje):
+                    break
+        finally:
+            espera_init.cancel()
+            for tarea in self.operaciones.values():
+                tarea.cancel()
+
+    async def _limite_init(self):
+        await asyncio.sleep(settings.SUSCRIPCIONES_TIEMPO_INIT)
+        if self.contexto is None:
+            await self.cerrar(4408, "Tiempo de inicialización agotado")
+
+    async def procesar(self, mensaje):
+        """Atiende un mensaje del cliente; retorna False si la conexión se cerró."""
+        tipo = mensaje.get('type')
+
+        if tipo == 'connection_init':
+            if self.contexto is not None:
+                await self.cerrar(4429, "Demasiadas solicitudes de inicialización")
+                return False
+            self.contexto = ContextoWebSocket(self.scope, mensaje.get('payload') or {})
+            await self.enviar({'type': 'connection_ack'})
+
+        elif tipo == 'ping':
+            await self.enviar({'type': 'pong'})
+
+        elif tipo == 'pong':
+            pass
+
+        elif tipo == 'subscribe':
+            if self.contexto is None:
+                await self.cerrar(4401, "No autorizado")
+                return False
+            id_operacion = mensaje.get('id')
+            if id_operacion in self.operaciones:
+                await self.cerrar(4409, f"Ya existe un suscriptor para {id_operacion}")
+                return False
+            self.operaciones[id_operacion] = asyncio.get_running_loop().create_task(
+                self.ejecutar(id_operacion, mensaje.get('payload') or {})
+            )
+
+        elif tipo == 'complete':
+            tarea = self.operaciones.pop(mensaje.get('id'), None)
+            if tarea:
+                tarea.cancel()
+
+        else:
+            await self.cerrar(4400, "Tipo de mensaje desconocido")
+            return False
+
+        return True
+
+    async def ejecutar(self, id_operacion, payload):
+        from .schema import schema
+
+        try:
+            resultado = await schema.subscribe(
+                payload.get('query') or '',
+                variable_values=payload.get('variables'),
+                operation_name=payload.get('operationName'),
+                context_value=self.contexto,
+            )
+
+            # Errores de validación o de la función subscribe_*
+            if not hasattr(resultado, '__aiter__'):
+                errores = [error.formatted for error in resultado.errors or []]
+                await self.enviar({'id': id_operacion, 'type': 'error', 'payload': errores})
+                return
+
+            async for evento in resultado:
+                await self.enviar({'id': id_operacion, 'type': 'next', 'payload': evento.formatted})
+
+            await self.enviar({'id': id_operacion, 'type': 'complete'})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error en la suscripción %s", id_operacion)
+            await self.enviar({'id': id_operacion, 'type': 'error', 'payload': [{'message': "Error interno"}]})
+        finally:
+            self.operaciones.pop(id_operacion, None)
+
+
+async def aplicacion_websocket(scope, receive, send):
+    await ConexionGraphQL(scope, receive, send).atender()
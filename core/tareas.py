@@ -0,0 +1,53 @@
+import os
+
+from django.apps import apps
+
+from .archivos import subir_deduplicado, registrar_subida
+from .cola import tarea
+from .imagenes import procesar_imagen, extension_imagen
+
+
+def _actualizar(modelo, pk, campos):
+    # `pk` es una lista cuando varias filas comparten el archivo
+    filtro = {'pk__in': pk} if isinstance(pk, list) else {'pk': pk}
+    apps.get_model(modelo).objects.filter(**filtro).update(**campos)
+
+
+@tarea('subir_archivo')
+def subir_archivo(modelo, pk, campo, ruta, carpeta, huella=None):
+    """Sube un archivo pendiente al almacenamiento y guarda la URL en el modelo."""
+    with open(ruta, 'rb') as f:
+        url = subir_deduplicado(f.read(), carpeta, os.path.splitext(ruta)[1])
+
+    _actualizar(modelo, pk, {campo: url})
+
+    os.remove(ruta)
+
+
+@tarea('subir_imagen')
+def subir_imagen(modelo, pk, campo, campo_variantes, ruta, carpeta, huella=None):
+    """
+    Procesa una imagen pendiente (core/imagenes.py), sube cada variante y
+    guarda la URL principal en `campo` y todas en `campo_variantes`.
+    """
+    with open(ruta, 'rb') as f:
+        original = f.read()
+    variantes = procesar_imagen(original)
+
+    # Cada variante se deduplica por el hash de sus bytes normalizados
+    urls = {
+        nombre: subir_deduplicado(datos, f"{carpeta}{nombre}/", extension_imagen())
+        for nombre, datos in variantes.items()
+    }
+    principal = next(iter(urls.values()))
+
+    # El original queda asociado al resultado para resolverlo sin procesar
+    if huella:
+        registrar_subida(huella, principal, tamano=len(original), variantes=urls)
+
+    _actualizar(modelo, pk, {
+        campo: principal,
+        campo_variantes: urls
+    })
+
+    os.remove(ruta)
@@ -14,15 +14,21 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path
 from graphene_django.views import GraphQLView
 from django.views.decorators.csrf import csrf_exempt
 from .schema import schema
-from graphene_file_upload.django import FileUploadGraphQLView
+from .views import SubidaGraphQLView
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('chichapi/', csrf_exempt(FileUploadGraphQLView.as_view(graphiql=True, schema=schema))),
+    path('chichapi/', csrf_exempt(SubidaGraphQLView.as_view(graphiql=True, schema=schema))),
 ]
+
+# Archivos del almacenamiento local (core.almacenamiento.AlmacenamientoLocal)
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
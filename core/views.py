@@ -0,0 +1,78 @@
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload, TemporaryFileUploadHandler
+from django.http import HttpResponse
+from graphene_django.views import HttpError
+from graphene_file_upload.django import FileUploadGraphQLView
+
+
+class LimiteSubidaHandler(FileUploadHandler):
+    """
+    Primer handler de la cadena: cuenta los bytes a medida que llegan y corta
+    la lectura del multipart en cuanto un archivo o la petición superan el
+    límite, sin esperar a recibir el cuerpo completo.
+    """
+
+    def __init__(self, request, max_archivo, max_peticion):
+        super().__init__(request)
+        self.max_archivo = max_archivo
+        self.max_peticion = max_peticion
+        self.bytes_archivo = 0
+        self.bytes_peticion = 0
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.bytes_archivo = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.bytes_archivo += len(raw_data)
+        self.bytes_peticion += len(raw_data)
+
+        if self.bytes_archivo > self.max_archivo:
+            self._rechazar(f"El archivo '{self.file_name}' supera el máximo de {self.max_archivo // (1024 * 1024)} MB")
+        if self.bytes_peticion > self.max_peticion:
+            self._rechazar(f"La petición supera el máximo de {self.max_peticion // (1024 * 1024)} MB en archivos")
+
+        return raw_data
+
+    def file_complete(self, file_size):
+        # El archivo lo construye el siguiente handler (TemporaryFileUploadHandler)
+        return None
+
+    def _rechazar(self, mensaje):
+        self.request._subida_rechazada = mensaje
+        raise StopUpload(connection_reset=True)
+
+
+class SubidaGraphQLView(FileUploadGraphQLView):
+    """
+    FileUploadGraphQLView con subidas acotadas: cada archivo se escribe por
+    bloques a un temporal en disco (nunca completo en memoria) y los
+    resolvers reciben TemporaryUploadedFile.
+    """
+
+    def parse_body(self, request):
+        if self.get_content_type(request) != 'multipart/form-data':
+            return super().parse_body(request)
+
+        # Rechazo temprano por Content-Length, antes de leer el cuerpo
+        try:
+            longitud = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            longitud = 0
+        if longitud > settings.SUBIDAS_MAX_PETICION:
+            raise HttpError(HttpResponse(status=413), "La petición es demasiado grande")
+
+        os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+        request.upload_handlers = [
+            LimiteSubidaHandler(request, settings.SUBIDAS_MAX_ARCHIVO, settings.SUBIDAS_MAX_PETICION),
+            TemporaryFileUploadHandler(request),
+        ]
+
+        datos = super().parse_body(request)
+
+        rechazo = getattr(request, '_subida_rechazada', None)
+        if rechazo:
+            raise HttpError(HttpResponse(status=413), rechazo)
+        return datos